@@ -15,23 +15,21 @@ from .src.vibe_for_comfy.constants import (
     WEB_DIRECTORY
 )
 
-# Import node classes
-from .src.vibe_for_comfy.nodes import StringListJoiner
-from .src.vibe_for_comfy.open_folders import OpenFolders
-from .src.vibe_for_comfy.open_file_explorer import OpenInFileExplorer
-from .src.vibe_for_comfy.extended_load_lora import ExtendedLoadLoRA
-from .src.vibe_for_comfy.workflow_snapshot import WorkflowSnapshot
-from .src.vibe_for_comfy.extended_ksampler import ExtendedKSampler
-from .src.vibe_for_comfy.extended_save_image import (
-    ExtendedSaveImage,
-    ImageMetadataReader,
-    SDParameterGenerator,
-    SDTypeConverter,
-)
-from .src.vibe_for_comfy.extended_load_checkpoint import ExtendedLoadCheckpoint
+# Node classes are registered as stubs that import their module (torch, PIL, comfy, ...) on first use
+from .src.vibe_for_comfy.lazy import lazy_node
 
-# Import and register routes
-from .src.vibe_for_comfy.routes import register_routes
+StringListJoiner = lazy_node("nodes", "StringListJoiner")
+OpenFolders = lazy_node("open_folders", "OpenFolders")
+OpenInFileExplorer = lazy_node("open_file_explorer", "OpenInFileExplorer")
+ExtendedLoadLoRA = lazy_node("extended_load_lora", "ExtendedLoadLoRA")
+ExtendedLoRAStack = lazy_node("extended_lora_stack", "ExtendedLoRAStack")
+WorkflowSnapshot = lazy_node("workflow_snapshot", "WorkflowSnapshot")
+ExtendedKSampler = lazy_node("extended_ksampler", "ExtendedKSampler")
+ExtendedSaveImage = lazy_node("extended_save_image", "ExtendedSaveImage")
+ImageMetadataReader = lazy_node("extended_save_image", "ImageMetadataReader")
+SDParameterGenerator = lazy_node("extended_save_image", "SDParameterGenerator")
+SDTypeConverter = lazy_node("extended_save_image", "SDTypeConverter")
+ExtendedLoadCheckpoint = lazy_node("extended_load_checkpoint", "ExtendedLoadCheckpoint")
 
 # Package exports
 __all__ = [
@@ -47,6 +45,7 @@ __all__ = [
 # NOTE: Node names should be globally unique across all ComfyUI custom nodes
 NODE_CLASS_MAPPINGS: Dict[str, Type[Any]] = {
     "ExtendedLoadLoRA": ExtendedLoadLoRA,
+    "ExtendedLoRAStack": ExtendedLoRAStack,
     "StringListJoiner": StringListJoiner,
     "OpenFolders": OpenFolders,
     "OpenInFileExplorer": OpenInFileExplorer,
@@ -62,6 +61,7 @@ NODE_CLASS_MAPPINGS: Dict[str, Type[Any]] = {
 # Human-readable display names for the nodes
 NODE_DISPLAY_NAME_MAPPINGS: Dict[str, str] = {
     "ExtendedLoadLoRA": "Extended Load LoRA",
+    "ExtendedLoRAStack": "Extended LoRA Stack",
     "ExtendedKSampler": "Extended KSampler",
     "ExtendedSaveImage": "Extended Save Image",
     "ExtendedLoadCheckpoint": "Extended Load Checkpoint",
@@ -74,6 +74,12 @@ NODE_DISPLAY_NAME_MAPPINGS: Dict[str, str] = {
     "SDTypeConverter": "SD Type Converter",
 }
 
-# Register backend routes
-register_routes()
+# Register backend routes inside a server; handlers import the caches and loaders on first request
+try:
+    from server import PromptServer  # noqa: F401
+except ImportError:
+    pass
+else:
+    from .src.vibe_for_comfy.routes import register_routes
+    register_routes()
 
@@ -11,7 +11,9 @@ app.registerExtension({
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({})
-            }).then(response => { }).catch(error => {
+            }).then(response => response.json()).then(data => {
+                if (data.job_id) console.debug(`vibe_for_comfy: refresh job ${data.job_id} started`);
+            }).catch(error => {
                 console.error('Error:', error);
             });
         });
@@ -82,6 +84,21 @@ app.registerExtension({
     },
 
     nodeCreated(node) {
+        if (node.comfyClass == "ExtendedKSampler") {
+            const onDrawForeground = node.onDrawForeground;
+            node.onDrawForeground = function (ctx) {
+                if (onDrawForeground) onDrawForeground.apply(this, arguments);
+                if (this.vibeProfileText && !this.flags.collapsed) {
+                    ctx.save();
+                    ctx.font = "11px sans-serif";
+                    ctx.fillStyle = "#8c8";
+                    ctx.textAlign = "right";
+                    ctx.fillText(this.vibeProfileText, this.size[0] - 6, -LiteGraph.NODE_TITLE_HEIGHT - 4);
+                    ctx.restore();
+                }
+            };
+        }
+
         if (node.comfyClass == "StringListJoiner") {
             if (node.widgets) {
                 node.widgets = node.widgets.filter(w => !node.inputs.some((input) => w.name === input.name));
@@ -91,10 +108,23 @@ app.registerExtension({
 });
 
 // refer. https://github.com/ltdrdata/ComfyUI-Impact-Pack/blob/Main/js/common.js
+function formatProfile(profile) {
+    const speed = profile.it_per_sec ? `${profile.it_per_sec.toFixed(2)} it/s` : '';
+    if (!profile.done) {
+        return `step ${profile.step}/${profile.total_steps}` + (speed ? ` · ${speed}` : '');
+    }
+    const phases = Object.entries(profile.phases).map(([name, seconds]) => `${name} ${seconds.toFixed(2)}s`);
+    return [speed, ...phases].filter(Boolean).join(' · ');
+}
+
 function nodeFeedbackHandler(event) {
     let nodes = app.graph._nodes_by_id;
     let node = nodes[event.detail.node_id];
-    if (node) {
+    if (node && event.detail.profile) {
+        // Sampler timing from ExtendedKSampler, drawn under the node title
+        node.vibeProfileText = formatProfile(event.detail.profile);
+        node.setDirtyCanvas(true, false);
+    } else if (node) {
         const w = node.widgets.find((w) => event.detail.widget_name === w.name);
         if (w) {
             w.value = event.detail.value;
@@ -102,4 +132,17 @@ function nodeFeedbackHandler(event) {
     }
 }
 
-api.addEventListener("vibe-for-comfy-feedback", nodeFeedbackHandler);
\ No newline at end of file
+api.addEventListener("vibe-for-comfy-feedback", nodeFeedbackHandler);
+
+function refreshDoneHandler(event) {
+    const job = event.detail;
+    if (job.status === 'error') {
+        console.error(`vibe_for_comfy: refresh job ${job.job_id} failed: ${job.error}`);
+        return;
+    }
+    const changes = job.result.changes;
+    const changed = Object.entries(changes).filter(([, diff]) => diff.added.length || diff.removed.length);
+    console.info(`vibe_for_comfy: refresh job ${job.job_id} done`, Object.fromEntries(changed));
+}
+
+api.addEventListener("vibe-for-comfy-refresh", refreshDoneHandler);
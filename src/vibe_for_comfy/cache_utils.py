@@ -0,0 +1,164 @@
+"""
+Shared helpers for the package's in-memory and on-disk caches.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import folder_paths
+
+
+def get_cache_directory(*parts: str) -> str:
+    """
+    Return (and create) a cache directory inside the ComfyUI user directory.
+
+    Args:
+        *parts: Optional sub-directory names
+
+    Returns:
+        Absolute path of the cache directory
+    """
+    path = os.path.join(folder_paths.get_user_directory(), "vibe_for_comfy", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_fingerprint(path: str) -> str:
+    """
+    Cheap identity of a file's content based on its size and modification time.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Fingerprint string that changes whenever the file is rewritten
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def load_json(path: str, default: Any) -> Any:
+    """
+    Read a JSON cache file, falling back to a default when it is missing or corrupt.
+
+    Args:
+        path: Path to the JSON file
+        default: Value returned if the file cannot be read
+
+    Returns:
+        Parsed JSON content or the default
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: str, data: Any) -> None:
+    """
+    Atomically write a JSON cache file.
+
+    Args:
+        path: Destination path
+        data: JSON-serializable content
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def evict_lru_files(directory: str, max_bytes: int, suffix: str = ".safetensors") -> None:
+    """
+    Delete the least recently used files of a cache directory until it fits a size cap.
+
+    Recency is the modification time, so readers should ``os.utime`` files they use.
+
+    Args:
+        directory: Cache directory
+        max_bytes: Maximum total size of the matching files
+        suffix: Only files with this suffix are counted and evicted
+    """
+    files = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffix):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+
+class LRUByteCache:
+    """
+    Thread-safe LRU mapping bounded by the total byte size of its values.
+
+    Sizes are supplied by the caller on insertion; least recently used entries
+    are evicted until the budget is met. A value larger than the whole budget
+    is not cached at all.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """Insert a value of the given byte size, evicting older entries as needed."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every entry whose key matches the predicate."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._total_bytes -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return entry count, byte usage and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
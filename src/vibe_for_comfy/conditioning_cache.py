@@ -0,0 +1,180 @@
+"""
+Cache of CLIP text encodings for ExtendedKSampler.
+
+Seed sweeps and sampler comparisons re-encode the same prompts with the same
+CLIP on every queue item. Conditionings are cached by the CLIP object's
+identity, its patch state and clip-skip layer plus the exact prompt text, in an
+LRU bounded by tensor memory. Conditionings of unpatched CLIPs loaded by
+ExtendedLoadCheckpoint have a stable identity (the checkpoint fingerprint) and
+can also be persisted to disk as safetensors files across restarts.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import torch
+import safetensors.torch
+
+from .cache_utils import LRUByteCache, get_cache_directory
+from .constants import CONDITIONING_CACHE_MAX_BYTES
+from .fused_lora_cache import CHECKPOINT_OPTION_KEY
+
+CONDITIONING_CACHE_MODES = ["off", "ram", "disk"]
+
+
+def conditioning_nbytes(conditioning: List[Any]) -> int:
+    """
+    Total byte size of the tensors in a conditioning.
+
+    Args:
+        conditioning: ComfyUI conditioning, a list of [tensor, options dict] pairs
+
+    Returns:
+        Number of bytes held by the tensors
+    """
+    total = 0
+    for cond, options in conditioning:
+        total += cond.numel() * cond.element_size()
+        for value in options.values():
+            if isinstance(value, torch.Tensor):
+                total += value.numel() * value.element_size()
+    return total
+
+
+def _clip_key(clip: Any, text: str) -> Optional[str]:
+    # Scheduled hooks make the encoding depend on the sampling step; don't cache those
+    if getattr(clip, "use_clip_schedule", False):
+        return None
+    patcher = getattr(clip, "patcher", None)
+    identity = [
+        id(clip.cond_stage_model),
+        str(getattr(patcher, "patches_uuid", "")),
+        getattr(clip, "layer_idx", None),
+    ]
+    return hashlib.sha256(json.dumps([identity, text]).encode("utf-8")).hexdigest()
+
+
+def _persistent_key(clip: Any, text: str) -> Optional[str]:
+    patcher = getattr(clip, "patcher", None)
+    if patcher is None or patcher.patches or getattr(clip, "use_clip_schedule", False):
+        return None
+    checkpoint = patcher.model_options.get(CHECKPOINT_OPTION_KEY)
+    if not checkpoint:
+        return None
+    identity = [checkpoint, getattr(clip, "layer_idx", None)]
+    return hashlib.sha256(json.dumps([identity, text]).encode("utf-8")).hexdigest()
+
+
+def _to_safetensors(conditioning: List[Any]) -> Optional[Dict[str, Any]]:
+    tensors: Dict[str, torch.Tensor] = {}
+    options_meta: List[Dict[str, Any]] = []
+    for index, (cond, options) in enumerate(conditioning):
+        tensors[f"{index}.cond"] = cond.contiguous()
+        meta: Dict[str, Any] = {}
+        for name, value in options.items():
+            if isinstance(value, torch.Tensor):
+                tensors[f"{index}.{name}"] = value.contiguous()
+            elif value is None or isinstance(value, (bool, int, float, str)):
+                meta[name] = value
+            else:
+                # Hooks, callables and other objects cannot be stored
+                return None
+        options_meta.append(meta)
+    return {"tensors": tensors, "metadata": {"options": json.dumps(options_meta)}}
+
+
+def _from_safetensors(tensors: Dict[str, torch.Tensor], metadata: Dict[str, str]) -> List[Any]:
+    options_meta = json.loads(metadata["options"])
+    conditioning = []
+    for index, meta in enumerate(options_meta):
+        options = dict(meta)
+        prefix = f"{index}."
+        for name, tensor in tensors.items():
+            if name.startswith(prefix) and name != f"{index}.cond":
+                options[name[len(prefix):]] = tensor
+        conditioning.append([tensors[f"{index}.cond"], options])
+    return conditioning
+
+
+class ConditioningCache:
+    """
+    LRU conditioning cache bounded by tensor memory, with optional disk persistence.
+    """
+
+    def __init__(self, max_bytes: int = CONDITIONING_CACHE_MAX_BYTES) -> None:
+        self._cache = LRUByteCache(max_bytes)
+        self.disk_hits = 0
+
+    def get(self, clip: Any, text: str, mode: str) -> Optional[List[Any]]:
+        """
+        Look up the conditioning of a prompt.
+
+        Args:
+            clip: CLIP object used for encoding
+            text: Exact prompt text
+            mode: "ram", "disk" or "off"
+
+        Returns:
+            Cached conditioning, or None on a miss
+        """
+        if mode == "off":
+            return None
+        key = _clip_key(clip, text)
+        if key is None:
+            return None
+        conditioning = self._cache.get(key)
+        if conditioning is not None or mode != "disk":
+            return conditioning
+
+        persistent_key = _persistent_key(clip, text)
+        if persistent_key is None:
+            return None
+        path = os.path.join(get_cache_directory("conditioning"), f"{persistent_key}.safetensors")
+        if not os.path.exists(path):
+            return None
+        with safetensors.safe_open(path, framework="pt") as f:
+            metadata = f.metadata()
+            tensors = {name: f.get_tensor(name) for name in f.keys()}
+        conditioning = _from_safetensors(tensors, metadata)
+        self.disk_hits += 1
+        self._cache.put(key, conditioning, conditioning_nbytes(conditioning))
+        return conditioning
+
+    def put(self, clip: Any, text: str, mode: str, conditioning: List[Any]) -> None:
+        """
+        Store the conditioning of a prompt.
+
+        Args:
+            clip: CLIP object used for encoding
+            text: Exact prompt text
+            mode: "ram", "disk" or "off"
+            conditioning: Encoded conditioning
+        """
+        if mode == "off":
+            return
+        key = _clip_key(clip, text)
+        if key is None:
+            return
+        self._cache.put(key, conditioning, conditioning_nbytes(conditioning))
+
+        if mode == "disk":
+            persistent_key = _persistent_key(clip, text)
+            serialized = _to_safetensors(conditioning) if persistent_key is not None else None
+            if serialized is None:
+                return
+            path = os.path.join(get_cache_directory("conditioning"), f"{persistent_key}.safetensors")
+            tmp_path = f"{path}.tmp"
+            safetensors.torch.save_file(serialized["tensors"], tmp_path, metadata=serialized["metadata"])
+            os.replace(tmp_path, path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return memory usage and hit/miss counters."""
+        stats = self._cache.get_stats()
+        stats["disk_hits"] = self.disk_hits
+        return stats
+
+
+# Process-wide conditioning cache
+CONDITIONING_CACHE = ConditioningCache()
@@ -29,8 +29,77 @@ FOLDER_MAP: Dict[str, str] = {
 API_ENDPOINTS = {
     "open_folder": "/vibe_for_comfy/open_folder",
     "refresh": "/vibe_for_comfy/refresh",
+    "prefetch_stats": "/vibe_for_comfy/prefetch/stats",
+    "model_info": "/vibe_for_comfy/model_info",
+    "cache_stats": "/vibe_for_comfy/cache/stats",
+    "profile": "/vibe_for_comfy/profile",
+    "grid": "/vibe_for_comfy/grid",
+    "metrics": "/vibe_for_comfy/metrics",
+    "gallery": "/vibe_for_comfy/gallery",
+    "gallery_image": "/vibe_for_comfy/gallery/image",
+    "gallery_thumbnail": "/vibe_for_comfy/gallery/thumbnail",
+    "gallery_export": "/vibe_for_comfy/gallery/export",
 }
 
+# Background prefetching of model files used by queued prompts
+PREFETCH_MAX_WORKERS = 1
+PREFETCH_MAX_FILES_PER_SCAN = 2
+PREFETCH_MIN_FREE_MEMORY = 4 * 1024 ** 3  # bytes of RAM that must stay available after warming a file
+# Warmed files remembered until a node loads them. Warmed files are skipped
+# by later scans and count as a hit when loaded. Older entries are dropped,
+# because the page cache has most likely evicted their pages by then.
+PREFETCH_WARMED_HISTORY_SIZE = 16
+
+# Byte budget of the shared LoRA state dict cache
+LORA_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Number of LoRA files ExtendedLoRAStack reads in parallel
+LORA_STACK_MAX_LOAD_WORKERS = 4
+
+# Size caps of the merged (fused) LoRA weight cache
+FUSED_LORA_RAM_MAX_BYTES = 4 * 1024 ** 3
+FUSED_LORA_DISK_MAX_BYTES = 20 * 1024 ** 3
+
+# Tensor memory budget of the CLIP conditioning cache
+CONDITIONING_CACHE_MAX_BYTES = 512 * 1024 ** 2
+
+# Upper bound on the number of seeds ExtendedKSampler samples in one batch
+MAX_SEED_LIST_SIZE = 64
+
+# Share of the VAE device's free memory used as decode budget when none is configured
+VAE_DECODE_FREE_MEMORY_FRACTION = 0.8
+
+# Smallest tile edge (in latent pixels) used by budgeted tiled VAE decoding
+VAE_DECODE_MIN_TILE = 32
+
+# Size cap of the on-disk ExtendedKSampler result cache
+RESULT_CACHE_MAX_BYTES = 10 * 1024 ** 3
+
+# Number of ExtendedKSampler run profiles kept for the profile route
+PROFILE_HISTORY_SIZE = 100
+
+# Minimum seconds between live sampler progress messages to the browser
+PROFILE_FEEDBACK_INTERVAL = 0.25
+
+# Upper bound on the number of prompts a parameter sweep may queue
+GRID_MAX_JOBS = 1000
+
+# Number of finished refresh jobs whose status stays queryable
+REFRESH_JOB_HISTORY_SIZE = 20
+
+# Output gallery: index refresh interval (seconds), page sizes and thumbnail limits
+GALLERY_REFRESH_INTERVAL = 2.0
+# Minimum seconds between forced rescans triggered by requests for paths missing from the index
+GALLERY_MISS_REFRESH_INTERVAL = 0.5
+GALLERY_PAGE_SIZE = 50
+GALLERY_MAX_PAGE_SIZE = 500
+GALLERY_THUMBNAIL_SIZE = 256
+GALLERY_THUMBNAIL_MAX_SIZE = 1024
+GALLERY_THUMBNAIL_CACHE_MAX_BYTES = 1024 ** 3
+
+# Size of the chunks a zip export is streamed in (and of its read buffer)
+ZIP_EXPORT_CHUNK_SIZE = 1024 ** 2
+
 # Frontend button configurations for OpenFolders node
 FOLDER_BUTTONS: Tuple[Dict[str, str], ...] = (
     {"label": "LoRAs", "key": "loras"},
@@ -0,0 +1,106 @@
+"""
+Execution profiles for running ExtendedKSampler on CPU-only machines.
+
+By default a node runs with ComfyUI's autograd state and the model's own
+precision. A profile can instead run encode, sample and decode:
+
+- under ``torch.inference_mode`` (no autograd bookkeeping or version counters)
+- with convolution weights and activations in ``channels_last`` layout, which
+  the oneDNN CPU kernels prefer (restored when the block exits, since the
+  model and VAE are shared with other nodes)
+- under bfloat16 autocast, on CPUs with native bf16 support (AVX512-BF16/AMX)
+- with a fixed number of intra-op threads
+
+bfloat16 trades a little precision for speed, so it is a separate profile.
+"""
+
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterator, List, Sequence
+
+import torch
+
+EXECUTION_PROFILES: Dict[str, Dict[str, bool]] = {
+    "default": {},
+    "inference": {"inference_mode": True},
+    "cpu_channels_last": {"inference_mode": True, "channels_last": True},
+    "cpu_bf16": {"inference_mode": True, "channels_last": True, "bf16_autocast": True},
+}
+
+
+def cpu_supports_bf16() -> bool:
+    """Return True if this CPU has native bfloat16 matmul support in oneDNN."""
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def apply_channels_last(module: Any) -> List[Any]:
+    """
+    Convert the 4D parameters (convolution weights) of a module to channels_last in place.
+
+    Args:
+        module: torch.nn.Module, e.g. the diffusion model or the VAE
+
+    Returns:
+        The converted parameters, to be passed to restore_layout
+    """
+    converted = []
+    for parameter in module.parameters():
+        if parameter.dim() == 4 and not parameter.is_contiguous(memory_format=torch.channels_last):
+            parameter.data = parameter.data.contiguous(memory_format=torch.channels_last)
+            converted.append(parameter)
+    return converted
+
+
+def restore_layout(parameters: Sequence[Any]) -> None:
+    """
+    Convert parameters changed by apply_channels_last back to the default contiguous layout.
+
+    The current data is converted rather than the original tensor put back, so
+    weights patched by ModelPatcher while the block ran keep their values.
+
+    Args:
+        parameters: Parameters returned by apply_channels_last
+    """
+    for parameter in parameters:
+        parameter.data = parameter.data.contiguous()
+
+
+@contextmanager
+def execution_profile(name: str, threads: int = 0, modules: Sequence[Any] = ()) -> Iterator[Dict[str, bool]]:
+    """
+    Run a block under an execution profile.
+
+    Args:
+        name: Key of EXECUTION_PROFILES
+        threads: Intra-op thread count for the block (0 keeps the current setting)
+        modules: Modules converted to channels_last for the block when the profile asks for it
+
+    Yields:
+        The profile's options, with bf16_autocast cleared when the CPU lacks bf16 support
+    """
+    options = dict(EXECUTION_PROFILES.get(name, {}))
+    if options.get("bf16_autocast") and not cpu_supports_bf16():
+        print("ExecutionProfile: CPU has no native bfloat16 support, running in the model's precision")
+        options["bf16_autocast"] = False
+
+    previous_threads = torch.get_num_threads()
+    if threads > 0:
+        torch.set_num_threads(threads)
+    converted: List[Any] = []
+    try:
+        if options.get("channels_last"):
+            for module in modules:
+                converted.extend(apply_channels_last(module))
+        with ExitStack() as stack:
+            # Entering inference_mode(False) would switch it off if ComfyUI already enabled it, so only enter when on
+            if options.get("inference_mode"):
+                stack.enter_context(torch.inference_mode())
+            if options.get("bf16_autocast"):
+                stack.enter_context(torch.autocast("cpu", dtype=torch.bfloat16))
+            yield options
+    finally:
+        restore_layout(converted)
+        if threads > 0:
+            torch.set_num_threads(previous_threads)
@@ -3,8 +3,11 @@ ExtendedKSampler node: wraps core KSampler, encodes prompts with CLIP, and decod
 
 Overview:
 - Uses ComfyUI core `CLIPTextEncode` to encode the provided `positive_prompt` and `negative_prompt` with the given `clip`.
-- Calls ComfyUI core `common_ksampler` with the encoded positive/negative conditionings.
-- Uses ComfyUI core `VAEDecode` to decode the sampled latents into an image.
+- Samples with the encoded positive/negative conditionings exactly like ComfyUI core `common_ksampler`.
+- Times encoding, every sampler step and decoding; live it/s is shown on the node and recent runs are
+  available from the `/vibe_for_comfy/profile` route.
+- Decodes the sampled latents with the VAE, in chunks or overlapping tiles that fit a memory budget.
+- Returns the sampled LATENT too, so decoding can be switched to a fast preview or skipped entirely.
 
 Inputs (all in "required"):
 - model: MODEL
@@ -19,9 +22,19 @@ Inputs (all in "required"):
 - vae: VAE (forceInput)
 - positive_prompt: STRING (forceInput)
 - negative_prompt: STRING (forceInput)
+- conditioning_cache: COMBO (optional; "ram" reuses encodings of identical prompts, "disk" also persists them)
+- batch_prompt_encoding: BOOLEAN (optional, off by default; encode both prompts in one text-encoder call when their token lengths match)
+- seeds: STRING (optional; comma separated seeds and "start-end" ranges sampled as one batch instead of `seed`)
+- vae_memory_budget_mb: INT (optional; memory allowed for VAE decoding, 0 = 80% of free device memory)
+- decode_mode: COMBO (optional; "full" VAE decode, "preview" latent-to-RGB projection, "none" for latent-only use)
+- result_cache: COMBO (optional; reuse stored latents, or latents and images, of runs with an identical recipe)
+- execution_mode: COMBO (optional; inference mode, channels_last and bfloat16 autocast profiles for CPU-only machines)
+- cpu_threads: INT (optional; intra-op thread count while the node runs, 0 = unchanged)
 
 Outputs:
 - IMAGE: Decoded image via VAE (final generated image)
+- STRING: Seed of every output image, comma separated (for ExtendedSaveImage's seed_list)
+- LATENT: Sampled latent (for upscale, refiner or hires-fix stages)
 - STRING: Positive prompt (passthrough)
 - STRING: Negative prompt (passthrough)
 - INT: Steps (passthrough)
@@ -33,19 +46,27 @@ Outputs:
 from inspect import cleandoc
 from typing import Any, Dict, Tuple
 from .constants import NODE_CATEGORY
+from .conditioning_cache import CONDITIONING_CACHE, CONDITIONING_CACHE_MODES
+from .execution_profile import EXECUTION_PROFILES, execution_profile
+from .metrics import SAMPLED_IMAGES
+from .profiling import PROFILER
+from .prompt_encoding import encode_prompt_pair
+from .result_cache import RESULT_CACHE, RESULT_CACHE_MODES, build_recipe, image_variant, recipe_key
+from .seed_batch import format_seed_list, parse_seed_list, sample_seed_batch, seed_batch_index
+from .vae_decode import decode_with_budget, preview_decode
+import torch
+import comfy.model_management
 import comfy.samplers
 
 
 try:
     # ComfyUI core nodes module
-    from nodes import common_ksampler  # type: ignore
-    from nodes import VAEDecode  # type: ignore
     from nodes import CLIPTextEncode  # type: ignore
 except Exception as import_error:  # pragma: no cover
-    common_ksampler = None  # type: ignore
-    VAEDecode = None  # type: ignore
     CLIPTextEncode = None  # type: ignore
 
+DECODE_MODES = ["full", "preview", "none"]
+
 
 class ExtendedKSampler:
     """
@@ -64,9 +85,19 @@ class ExtendedKSampler:
     - vae: VAE
     - positive_prompt: STRING (for metadata/output convenience)
     - negative_prompt: STRING (for metadata/output convenience)
+    - conditioning_cache: COMBO (off, ram or disk cache of prompt encodings)
+    - batch_prompt_encoding: BOOLEAN (encode positive and negative prompts as one batch; off by default)
+    - seeds: STRING (seed list/ranges; each seed gets its own copy of the latent in one sampler call)
+    - vae_memory_budget_mb: INT (decode budget; picks chunked or tiled decoding)
+    - decode_mode: COMBO (full, preview or none)
+    - result_cache: COMBO (off, latent or latent+image disk cache keyed by the generation recipe)
+    - execution_mode: COMBO (default, inference, cpu_channels_last or cpu_bf16)
+    - cpu_threads: INT (intra-op threads, 0 = unchanged)
 
     Outputs:
     - IMAGE: Sampled image
+    - STRING: Per-image seeds
+    - LATENT: Sampled latent
     - STRING: Positive prompt
     - STRING: Negative prompt
     - INT: Steps
@@ -96,11 +127,22 @@ class ExtendedKSampler:
                 "vae": ("VAE", {"forceInput": True}),
                 "positive_prompt": ("STRING", {"multiline": True, "forceInput": True}),
                 "negative_prompt": ("STRING", {"multiline": True, "forceInput": True}),
-            }
+            },
+            "optional": {
+                "conditioning_cache": (CONDITIONING_CACHE_MODES, {"default": "ram"}),
+                "batch_prompt_encoding": ("BOOLEAN", {"default": False}),
+                "seeds": ("STRING", {"default": "", "multiline": False}),
+                "vae_memory_budget_mb": ("INT", {"default": 0, "min": 0, "max": 1024 * 1024, "step": 64}),
+                "decode_mode": (DECODE_MODES, {"default": "full"}),
+                "result_cache": (RESULT_CACHE_MODES, {"default": "off"}),
+                "execution_mode": (list(EXECUTION_PROFILES.keys()), {"default": "default"}),
+                "cpu_threads": ("INT", {"default": 0, "min": 0, "max": 256}),
+            },
+            "hidden": {"unique_id": "UNIQUE_ID"},
         }
 
-    RETURN_TYPES: Tuple[str, ...] = ("IMAGE",)
-    RETURN_NAMES: Tuple[str, ...] = ("image",)
+    RETURN_TYPES: Tuple[str, ...] = ("IMAGE", "STRING", "LATENT")
+    RETURN_NAMES: Tuple[str, ...] = ("image", "seeds", "latent")
     DESCRIPTION: str = cleandoc(__doc__)
     FUNCTION: str = "run"
     CATEGORY: str = NODE_CATEGORY
@@ -119,42 +161,158 @@ class ExtendedKSampler:
         vae: Any,
         positive_prompt: str,
         negative_prompt: str,
-    ) -> Tuple[Any]:
-        if common_ksampler is None or VAEDecode is None or CLIPTextEncode is None:
+        conditioning_cache: str = "ram",
+        batch_prompt_encoding: bool = False,
+        seeds: str = "",
+        vae_memory_budget_mb: int = 0,
+        decode_mode: str = "full",
+        result_cache: str = "off",
+        execution_mode: str = "default",
+        cpu_threads: int = 0,
+        unique_id: Any = None,
+    ) -> Tuple[Any, str, Any]:
+        if CLIPTextEncode is None:
             raise RuntimeError("ComfyUI core nodes module is not available: required imports failed")
 
-        # Encode prompts using CLIP (unwrap to first element which is CONDITIONING)
-        text_encoder = CLIPTextEncode()
-        positive_cond_out = text_encoder.encode(clip, positive_prompt)
-        negative_cond_out = text_encoder.encode(clip, negative_prompt)
-
-        positive_cond = positive_cond_out[0] if isinstance(positive_cond_out, (list, tuple)) else positive_cond_out
-        negative_cond = negative_cond_out[0] if isinstance(negative_cond_out, (list, tuple)) else negative_cond_out
-
-        ks_result = common_ksampler(
-            model=model,
-            seed=seed,
-            steps=steps,
-            cfg=cfg,
-            sampler_name=sampler_name,
-            scheduler=scheduler,
-            positive=positive_cond,
-            negative=negative_cond,
-            latent=latent,
-            denoise=denoise,
+        seed_list = parse_seed_list(seeds) or [seed]
+        profile = PROFILER.start_run(
+            unique_id, model,
+            sampler_name=sampler_name, scheduler=scheduler, steps=steps, cfg=cfg, denoise=denoise,
+            batch_size=latent["samples"].shape[0] * len(seed_list),
+            latent_shape=list(latent["samples"].shape[1:]), decode_mode=decode_mode,
+            result_cache=result_cache, execution_mode=execution_mode,
         )
 
-        # Some Comfy versions return only samples, others return (samples, latent)
-        if isinstance(ks_result, tuple):
-            samples = ks_result[0]
-        else:
-            samples = ks_result
+        # An exact recipe match skips encoding and sampling (and decoding when images were stored)
+        recipe = None
+        if result_cache != "off":
+            recipe = build_recipe(
+                model, clip, positive_prompt, negative_prompt, seed_list,
+                steps, cfg, sampler_name, scheduler, denoise, latent, execution_mode,
+            )
+        variant = image_variant(vae, decode_mode) if result_cache == "latent+image" else None
+        cached = RESULT_CACHE.get(recipe_key(recipe), variant) if recipe is not None else None
+
+        channels_last_modules = (model.model, vae.first_stage_model)
+        with execution_profile(execution_mode, cpu_threads, channels_last_modules):
+            decoded_image = None
+            if cached is not None:
+                print("ExtendedKSampler: Reusing cached result for identical recipe")
+                samples = latent.copy()
+                samples.pop("batch_index", None)
+                samples["samples"], decoded_image = cached
+                batch_index = seed_batch_index(latent, len(seed_list))
+                if batch_index is not None:
+                    samples["batch_index"] = batch_index
+            else:
+                with profile.phase("encode"):
+                    positive_cond, negative_cond = self.encode_prompts(
+                        clip, positive_prompt, negative_prompt, conditioning_cache, batch_prompt_encoding
+                    )
+
+                with profile.phase("sample"):
+                    # Mirrors common_ksampler (a single seed gives identical noise); all seeds in one sampler call
+                    samples = sample_seed_batch(
+                        model, seed_list, steps, cfg, sampler_name, scheduler,
+                        positive_cond, negative_cond, latent, denoise, profile=profile,
+                    )
+
+            if decoded_image is None:
+                with profile.phase("decode"):
+                    decoded_image = self.decode(model, vae, samples["samples"], decode_mode, vae_memory_budget_mb)
+                if recipe is not None and (cached is None or variant is not None):
+                    RESULT_CACHE.put(recipe_key(recipe), recipe, samples["samples"], decoded_image, variant)
+
+        PROFILER.finish_run(profile)
+        SAMPLED_IMAGES.inc(samples["samples"].shape[0], source="sampler" if cached is None else "result_cache")
+
+        images_per_seed = decoded_image.shape[0] // len(seed_list)
+        image_seeds = [item for item in seed_list for _ in range(images_per_seed)]
+        return (decoded_image, format_seed_list(image_seeds), samples)
+
+    @staticmethod
+    def decode(model: Any, vae: Any, samples: Any, decode_mode: str, budget_mb: int) -> Any:
+        """
+        Turn sampled latents into the IMAGE output according to the decode mode.
+
+        Args:
+            model: MODEL the latents were sampled with
+            vae: VAE object
+            samples: Latent tensor
+            decode_mode: "full", "preview" or "none"
+            budget_mb: VAE decode memory budget in MiB (0 = automatic)
+
+        Returns:
+            IMAGE tensor (a black 1x1 placeholder per latent when decode_mode is "none")
+        """
+        if decode_mode == "none":
+            return torch.zeros((samples.shape[0], 1, 1, 3), device=comfy.model_management.intermediate_device())
+
+        if decode_mode == "preview":
+            preview = preview_decode(model, samples)
+            if preview is not None:
+                return preview
+            print("ExtendedKSampler: Model has no latent RGB factors, falling back to full decode")
+
+        # Decode to image using provided VAE, chunked or tiled to fit the memory budget
+        return decode_with_budget(vae, samples, budget_mb)
+
+    @staticmethod
+    def encode_prompts(clip: Any, positive_prompt: str, negative_prompt: str, cache_mode: str, batch: bool) -> Tuple[Any, Any]:
+        """
+        Encode both prompts with CLIP, reusing cached conditionings when possible.
+
+        Args:
+            clip: CLIP object
+            positive_prompt: Positive prompt text
+            negative_prompt: Negative prompt text
+            cache_mode: "off", "ram" or "disk"
+            batch: Try to encode both prompts in a single text-encoder call
+
+        Returns:
+            Tuple of (positive CONDITIONING, negative CONDITIONING)
+        """
+        positive_cond = CONDITIONING_CACHE.get(clip, positive_prompt, cache_mode)
+        negative_cond = CONDITIONING_CACHE.get(clip, negative_prompt, cache_mode)
+
+        if batch and positive_cond is None and negative_cond is None:
+            pair = encode_prompt_pair(clip, positive_prompt, negative_prompt)
+            if pair is not None:
+                positive_cond, negative_cond = pair
+                CONDITIONING_CACHE.put(clip, positive_prompt, cache_mode, positive_cond)
+                CONDITIONING_CACHE.put(clip, negative_prompt, cache_mode, negative_cond)
+
+        # Both lookups above already missed (and were counted), so encode without looking up again
+        if positive_cond is None:
+            positive_cond = ExtendedKSampler._encode_uncached(clip, positive_prompt, cache_mode)
+        if negative_cond is None:
+            negative_cond = ExtendedKSampler._encode_uncached(clip, negative_prompt, cache_mode)
+
+        return positive_cond, negative_cond
 
-        # Decode to image using provided VAE
-        decoder = VAEDecode()
-        decoded_image_tuple = decoder.decode(vae, samples)
-        decoded_image = decoded_image_tuple[0] if isinstance(decoded_image_tuple, tuple) else decoded_image_tuple
+    @staticmethod
+    def encode_prompt(clip: Any, text: str, cache_mode: str) -> Any:
+        """
+        Encode a prompt with CLIP, reusing a cached conditioning when possible.
 
-        return (decoded_image,)
+        Args:
+            clip: CLIP object
+            text: Prompt text
+            cache_mode: "off", "ram" or "disk"
 
+        Returns:
+            CONDITIONING for the prompt
+        """
+        cached = CONDITIONING_CACHE.get(clip, text, cache_mode)
+        if cached is not None:
+            return cached
+        return ExtendedKSampler._encode_uncached(clip, text, cache_mode)
 
+    @staticmethod
+    def _encode_uncached(clip: Any, text: str, cache_mode: str) -> Any:
+        """Encode a prompt with CLIP after a cache miss and store the result."""
+        # Encode prompt using CLIP (unwrap to first element which is CONDITIONING)
+        cond_out = CLIPTextEncode().encode(clip, text)
+        cond = cond_out[0] if isinstance(cond_out, (list, tuple)) else cond_out
+        CONDITIONING_CACHE.put(clip, text, cache_mode, cond)
+        return cond
@@ -8,19 +8,33 @@ Overview:
 
 Inputs:
 - ckpt_name: STRING (checkpoint filename)
+- load_mode: COMBO ("standard" reads the whole file, "mmap" memory-maps .safetensors files
+  and materializes tensors only while each component is built)
+- output_clip: BOOLEAN (build the CLIP component; when off, the CLIP output is None)
+- output_vae: BOOLEAN (build the VAE component; when off, the VAE output is None)
 
 Outputs:
 - MODEL: Loaded model component
 - CLIP: Loaded CLIP component  
 - VAE: Loaded VAE component
 - STRING: Model description containing checkpoint name
+- STRING: Model info parsed from the safetensors header (architecture, dtype, parameters)
 """
 
+import time
 from inspect import cleandoc
 from typing import Any, Dict, Tuple
 import folder_paths
 import comfy.sd
 from .constants import NODE_CATEGORY
+from .file_catalog import FILE_CATALOG
+from .fused_lora_cache import tag_checkpoint
+from .metrics import CHECKPOINT_LOAD_SECONDS
+from .model_index import MODEL_INDEX, format_model_info
+from .prefetch import PREFETCHER
+from .safetensors_utils import checkpoint_key_filter, is_safetensors, load_safetensors_mmap
+
+LOAD_MODES = ["standard", "mmap"]
 
 
 class ExtendedLoadCheckpoint:
@@ -33,12 +47,16 @@ class ExtendedLoadCheckpoint:
 
     Inputs:
     - ckpt_name: STRING (checkpoint filename to load)
+    - load_mode: COMBO (standard or mmap)
+    - output_clip: BOOLEAN (load the text encoder; with mmap, its weights are not even read when off)
+    - output_vae: BOOLEAN (load the VAE; with mmap, its weights are not even read when off)
 
     Outputs:
     - MODEL: Loaded model component
     - CLIP: Loaded CLIP component
     - VAE: Loaded VAE component
     - STRING: Model description containing checkpoint name
+    - STRING: Model info from the safetensors header index
     """
 
     def __init__(self) -> None:
@@ -54,40 +72,89 @@ class ExtendedLoadCheckpoint:
             Dictionary containing required input field configurations
         """
         # Get list of available checkpoint files
-        checkpoints = folder_paths.get_filename_list("checkpoints")
+        checkpoints = FILE_CATALOG.get_filename_list("checkpoints")
         
         return {
             "required": {
                 "ckpt_name": (checkpoints, {"default": checkpoints[0] if checkpoints else ""}),
-            }
+            },
+            "optional": {
+                "load_mode": (LOAD_MODES, {"default": "standard"}),
+                # Widget inputs, so turning a component back on changes the cache key and reloads
+                "output_clip": ("BOOLEAN", {"default": True}),
+                "output_vae": ("BOOLEAN", {"default": True}),
+            },
         }
 
-    RETURN_TYPES: Tuple[str, str, str, str] = ("MODEL", "STRING", "CLIP", "VAE")
-    RETURN_NAMES: Tuple[str, ...] = ("model", "model_description", "clip", "vae")
+    RETURN_TYPES: Tuple[str, ...] = ("MODEL", "STRING", "CLIP", "VAE", "STRING")
+    RETURN_NAMES: Tuple[str, ...] = ("model", "model_description", "clip", "vae", "model_info")
     DESCRIPTION: str = cleandoc(__doc__)
     FUNCTION: str = "load_checkpoint"
     CATEGORY: str = NODE_CATEGORY
 
-    def load_checkpoint(self, ckpt_name: str) -> Tuple[Any, str, Any, Any]:
+    def load_checkpoint(
+        self,
+        ckpt_name: str,
+        load_mode: str = "standard",
+        output_clip: bool = True,
+        output_vae: bool = True,
+    ) -> Tuple[Any, str, Any, Any, str]:
         """
         Load a checkpoint and return model components with description.
         
         Args:
             ckpt_name: Name of the checkpoint file to load
+            load_mode: "standard" or "mmap"
+            output_clip: Load the CLIP component (None is returned otherwise)
+            output_vae: Load the VAE component (None is returned otherwise)
             
         Returns:
-            Tuple containing (model, model_description, clip, vae)
+            Tuple containing (model, model_description, clip, vae, model_info)
         """
         # Load the checkpoint using ComfyUI's standard method
         ckpt_path = folder_paths.get_full_path("checkpoints", ckpt_name)
         if ckpt_path is None:
             raise FileNotFoundError(f"Checkpoint file not found: {ckpt_name}")
-        
+
+        PREFETCHER.record_load(ckpt_path)
+
+        embedding_directory = folder_paths.get_folder_paths("embeddings")
+
         # Load checkpoint components
         # The function returns (model, clip, vae, config) - 4 values, not 3
-        model, clip, vae, config = comfy.sd.load_checkpoint_guess_config(ckpt_path, output_vae=True, output_clip=True, embedding_directory=folder_paths.get_folder_paths("embeddings"))
+        load_start = time.perf_counter()
+        if load_mode == "mmap" and is_safetensors(ckpt_path):
+            # Tensors stay views into the page cache until each component copies them in;
+            # text encoder / VAE weights of disabled components are never read
+            state_dict = load_safetensors_mmap(ckpt_path, checkpoint_key_filter(output_clip, output_vae))
+            out = comfy.sd.load_state_dict_guess_config(
+                state_dict,
+                output_vae=output_vae,
+                output_clip=output_clip,
+                embedding_directory=embedding_directory,
+            )
+            if out is None:
+                raise RuntimeError(f"Could not detect model type of: {ckpt_path}")
+            model, clip, vae = out[:3]
+            del state_dict
+        else:
+            model, clip, vae, config = comfy.sd.load_checkpoint_guess_config(
+                ckpt_path, output_vae=output_vae, output_clip=output_clip, embedding_directory=embedding_directory
+            )
+        CHECKPOINT_LOAD_SECONDS.observe(time.perf_counter() - load_start, load_mode=load_mode)
         
+        # Lets the fused LoRA, conditioning and result caches key their entries by this exact file
+        tag_checkpoint(model, ckpt_name, ckpt_path)
+        if clip is not None:
+            tag_checkpoint(clip.patcher, ckpt_name, ckpt_path)
+        if vae is not None and getattr(vae, "patcher", None) is not None:
+            tag_checkpoint(vae.patcher, ckpt_name, ckpt_path)
+
+        # Warm the files of upcoming prompts while this one samples
+        PREFETCHER.schedule()
+
         # Create model description string
         model_description = f"Checkpoint: {ckpt_name}"
+        model_info = format_model_info(MODEL_INDEX.get_info("checkpoints", ckpt_name))
         
-        return (model, model_description, clip, vae)
+        return (model, model_description, clip, vae, model_info)
@@ -11,8 +11,77 @@ import folder_paths
 from .constants import NODE_CATEGORY
 import comfy.sd
 import comfy.lora
-from nodes import LoraLoader
 import os
+from .fused_lora_cache import FUSED_CACHE_MODES, FUSED_LORA_CACHE, count_patches, record_lora
+from .cache_utils import file_fingerprint
+from .hash_cache import HASH_CACHE
+from .lora_cache import LORA_CACHE
+from .metrics import LORA_LOAD_SECONDS
+from .file_catalog import FILE_CATALOG
+from .model_index import MODEL_INDEX, format_model_info
+from .prefetch import PREFETCHER
+
+
+def build_lora_prompt(prompt: str, lora_name: str, strength_model: float, prompt_to_append: str) -> str:
+    """
+    Append a LoRA tag and its prompt to an existing prompt.
+    
+    Args:
+        prompt: Existing prompt (may be empty)
+        lora_name: Name of the applied LoRA
+        strength_model: Strength the LoRA was applied with
+        prompt_to_append: LoRA specific prompt (may be empty)
+        
+    Returns:
+        The enhanced prompt string
+    """
+    prompt_parts = []
+    
+    # Start with existing prompt if provided
+    if prompt:
+        prompt_parts.append(prompt)
+    
+    # Add LoRA name and weight to prompt as a separate line
+    prompt_parts.append("\n")
+    lora_info = f"<lora:{lora_name}:{strength_model}>"
+    prompt_parts.append(lora_info)
+
+    # Add LoRA specific prompt if provided
+    if prompt_to_append:
+        prompt_parts.append(prompt_to_append)
+    
+    prompt_parts.append("\n")
+    return "\n".join(prompt_parts) if prompt_parts else ""
+
+
+def make_lora_entry(lora_name: str, lora_path: str, strength_model: float) -> Dict[str, Any]:
+    """
+    Build a CUSTOM_LORA_LIST entry describing an applied LoRA.
+    
+    The hash is the one computed while the file was loaded (or a persisted one),
+    so downstream nodes never have to read the file again to hash it.
+    
+    Args:
+        lora_name: LoRA file name as listed by folder_paths
+        lora_path: Full path of the LoRA file
+        strength_model: Strength the LoRA was applied with
+        
+    Returns:
+        Dictionary with name, path, strength, fingerprint and sha256 hash (None if unknown)
+    """
+    return {
+        "name": lora_name,
+        "path": lora_path,
+        "strength": strength_model,
+        "fingerprint": file_fingerprint(lora_path),
+        "hash": HASH_CACHE.get(lora_path),
+    }
+
+
+def get_lora_entry_name(entry: Any) -> str:
+    """Return the LoRA name of a CUSTOM_LORA_LIST entry (structured or legacy string)."""
+    return entry["name"] if isinstance(entry, dict) else str(entry)
+
 
 class ExtendedLoadLoRA:
     """
@@ -24,8 +93,10 @@ class ExtendedLoadLoRA:
     - Append custom prompts and notes
     - Combine with existing prompts
     - Track model description with LoRA information
+    - Optionally reuse pre-merged weights for a checkpoint + LoRA combination (fused_cache)
     
-    The node outputs the modified model, enhanced prompt string, and updated model description.
+    The node outputs the modified model, enhanced prompt string, the updated LoRA list and
+    the LoRA's header info (architecture, trigger words) from the model index.
     """
     
     def __init__(self) -> None:
@@ -41,7 +112,7 @@ class ExtendedLoadLoRA:
             Dictionary containing required and optional input field configurations
         """
         # Get list of available LoRA files
-        loras: List[str] = folder_paths.get_filename_list("loras")
+        loras: List[str] = FILE_CATALOG.get_filename_list("loras")
         
         input_types = {
             "required": {
@@ -68,13 +139,14 @@ class ExtendedLoadLoRA:
                     "multiline": True
                 }),
                 "loaded_lora_names_list": ("CUSTOM_LORA_LIST", {"forceInput": True}),
+                "fused_cache": (FUSED_CACHE_MODES, {"default": "off"}),
             }
         }
 
         return input_types
 
-    RETURN_TYPES: Tuple[str, str, str, str] = ("MODEL", "STRING", "CUSTOM_LORA_LIST")
-    RETURN_NAMES: Tuple[str, str, str, str] = ("model", "prompt", "lora_list")
+    RETURN_TYPES: Tuple[str, str, str, str] = ("MODEL", "STRING", "CUSTOM_LORA_LIST", "STRING")
+    RETURN_NAMES: Tuple[str, str, str, str] = ("model", "prompt", "lora_list", "lora_info")
     DESCRIPTION: str = cleandoc(__doc__)
     FUNCTION: str = "exec"
     CATEGORY: str = NODE_CATEGORY
@@ -87,31 +159,32 @@ class ExtendedLoadLoRA:
         prompt_to_append: str, 
         notes: str,
         prompt: str = "",
-        loaded_lora_names_list: List[str] = []
-    ) -> Tuple[Any, str, str, str]:
-        
-        model_with_lora, _ = LoraLoader().load_lora(model, None, lora_name, strength_model, None)
+        loaded_lora_names_list: List[Any] = [],
+        fused_cache: str = "off"
+    ) -> Tuple[Any, str, List[Any], str]:
         
-        # Build enhanced prompt        
-        prompt_parts = []
-        
-        # Start with existing prompt if provided
-        if prompt:
-            prompt_parts.append(prompt)
+        lora_path = folder_paths.get_full_path("loras", lora_name)
+        if lora_path is None:
+            raise FileNotFoundError(f"LoRA file not found: {lora_name}")
+
+        if strength_model == 0:
+            model_with_lora = model
+        else:
+            # Served from the shared cache unless the file is new or was rewritten
+            PREFETCHER.record_load(lora_path)
+            with LORA_LOAD_SECONDS.time():
+                lora = LORA_CACHE.load(lora_path)
+                model_with_lora, _ = comfy.sd.load_lora_for_models(model, None, lora, strength_model, 0)
+                record_lora(model_with_lora, lora_name, lora_path, strength_model, count_patches(model))
+                # Swap the LoRA math for stored merged weights of this checkpoint + LoRA set
+                model_with_lora = FUSED_LORA_CACHE.get_fused_model(model_with_lora, fused_cache)
+        PREFETCHER.schedule()
         
-        # Add LoRA name and weight to prompt as a separate line
-        prompt_parts.append("\n")
-        lora_info = f"<lora:{lora_name}:{strength_model}>"
-        prompt_parts.append(lora_info)
-
-        # Add LoRA specific prompt if provided
-        if prompt_to_append:
-            prompt_parts.append(prompt_to_append)
+        enhanced_prompt = build_lora_prompt(prompt, lora_name, strength_model, prompt_to_append)
         
-        prompt_parts.append("\n")
-        enhanced_prompt = "\n".join(prompt_parts) if prompt_parts else ""
+        # Update lora list - structured entries carrying the hash computed during loading
+        new_lora_entry = make_lora_entry(lora_name, lora_path, strength_model)
         
-        # Update lora list - work with list of strings
-        new_lora_entry = f"{lora_name}"            
+        lora_header_info = format_model_info(MODEL_INDEX.get_info("loras", lora_name))
         
-        return (model_with_lora, enhanced_prompt, loaded_lora_names_list + [new_lora_entry])
+        return (model_with_lora, enhanced_prompt, loaded_lora_names_list + [new_lora_entry], lora_header_info)
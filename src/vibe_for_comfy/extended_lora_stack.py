@@ -0,0 +1,154 @@
+"""
+ExtendedLoRAStack node: applies a list of LoRAs to a model in a single patch pass.
+
+Overview:
+- Chaining N ExtendedLoadLoRA nodes clones the model N times and loads the files one after another
+- This node reads every LoRA file concurrently (through the shared LoRA cache) and registers all
+  patches on one clone of the model
+- The prompt and LoRA list outputs are identical to an equivalent ExtendedLoadLoRA chain
+
+Inputs:
+- model: MODEL
+- lora_stack: STRING, one entry per line as "lora_name | strength | prompt" (strength and prompt optional,
+  blank lines and lines starting with # are ignored)
+- prompt: STRING (optional, existing prompt to extend)
+- loaded_lora_names_list: CUSTOM_LORA_LIST (optional, LoRAs applied upstream)
+
+Outputs:
+- MODEL: Model with every LoRA patch registered
+- STRING: Combined prompt
+- CUSTOM_LORA_LIST: Upstream LoRA list extended with the stacked LoRAs
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from inspect import cleandoc
+from typing import Any, Dict, List, Tuple
+import folder_paths
+import comfy.lora
+import comfy.lora_convert
+from .constants import LORA_STACK_MAX_LOAD_WORKERS, NODE_CATEGORY
+from .extended_load_lora import build_lora_prompt, make_lora_entry
+from .fused_lora_cache import count_patches, record_lora
+from .lora_cache import LORA_CACHE
+from .prefetch import PREFETCHER
+
+
+def parse_lora_stack(lora_stack: str) -> List[Tuple[str, float, str]]:
+    """
+    Parse the lora_stack text into (lora_name, strength, prompt) entries.
+
+    Args:
+        lora_stack: Multiline text with one "lora_name | strength | prompt" entry per line
+
+    Returns:
+        List of (lora_name, strength, prompt) tuples in stack order
+
+    Raises:
+        ValueError: If a strength is not a number
+    """
+    entries = []
+    for line_number, line in enumerate(lora_stack.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = [field.strip() for field in line.split("|", 2)]
+        lora_name = fields[0]
+        try:
+            strength = float(fields[1]) if len(fields) > 1 and fields[1] else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid strength on line {line_number} of lora_stack: {fields[1]}")
+        prompt_to_append = fields[2] if len(fields) > 2 else ""
+        entries.append((lora_name, strength, prompt_to_append))
+    return entries
+
+
+class ExtendedLoRAStack:
+    """
+    ExtendedLoRAStack: applies several LoRAs to a model with a single clone.
+
+    Each line of lora_stack is "lora_name | strength | prompt". All LoRA files are
+    loaded concurrently and their patches are registered on one model clone, which
+    replaces a chain of ExtendedLoadLoRA nodes while producing the same prompt and
+    LoRA list outputs.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the ExtendedLoRAStack node."""
+        pass
+
+    @classmethod
+    def INPUT_TYPES(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Define the input types for this node.
+
+        Returns:
+            Dictionary containing required and optional input field configurations
+        """
+        return {
+            "required": {
+                "model": ("MODEL", {"forceInput": True}),
+                "lora_stack": ("STRING", {
+                    "display": "LoRA stack (lora_name | strength | prompt)",
+                    "multiline": True
+                }),
+            },
+            "optional": {
+                "prompt": ("STRING", {
+                    "forceInput": True,
+                    "multiline": True
+                }),
+                "loaded_lora_names_list": ("CUSTOM_LORA_LIST", {"forceInput": True}),
+            }
+        }
+
+    RETURN_TYPES: Tuple[str, str, str] = ("MODEL", "STRING", "CUSTOM_LORA_LIST")
+    RETURN_NAMES: Tuple[str, str, str] = ("model", "prompt", "lora_list")
+    DESCRIPTION: str = cleandoc(__doc__)
+    FUNCTION: str = "exec"
+    CATEGORY: str = NODE_CATEGORY
+
+    def exec(
+        self,
+        model: Any,
+        lora_stack: str,
+        prompt: str = "",
+        loaded_lora_names_list: List[Any] = []
+    ) -> Tuple[Any, str, List[Any]]:
+        entries = parse_lora_stack(lora_stack)
+
+        lora_paths = []
+        for lora_name, _, _ in entries:
+            lora_path = folder_paths.get_full_path("loras", lora_name)
+            if lora_path is None:
+                raise FileNotFoundError(f"LoRA file not found: {lora_name}")
+            lora_paths.append(lora_path)
+
+        # Read every file in parallel; cached LoRAs return immediately
+        active = [(name, path, strength) for path, (name, strength, _) in zip(lora_paths, entries) if strength != 0]
+        loras = []
+        if active:
+            for _, path, _ in active:
+                PREFETCHER.record_load(path)
+            with ThreadPoolExecutor(max_workers=min(LORA_STACK_MAX_LOAD_WORKERS, len(active))) as executor:
+                loras = list(executor.map(LORA_CACHE.load, [path for _, path, _ in active]))
+        PREFETCHER.schedule()
+
+        model_with_loras = model
+        if loras:
+            # One clone for the whole stack instead of one per LoRA
+            model_with_loras = model.clone()
+            key_map = comfy.lora.model_lora_keys_unet(model.model, {})
+            for lora, (lora_name, path, strength) in zip(loras, active):
+                # Same conversion as comfy.sd.load_lora_for_models (e.g. diffusers/PEFT key layouts)
+                patches = comfy.lora.load_lora(comfy.lora_convert.convert_lora(lora), key_map)
+                base_patch_count = count_patches(model_with_loras)
+                model_with_loras.add_patches(patches, strength)
+                record_lora(model_with_loras, lora_name, path, strength, base_patch_count)
+
+        enhanced_prompt = prompt
+        lora_list = list(loaded_lora_names_list)
+        for (lora_name, strength, prompt_to_append), lora_path in zip(entries, lora_paths):
+            enhanced_prompt = build_lora_prompt(enhanced_prompt, lora_name, strength, prompt_to_append)
+            lora_list.append(make_lora_entry(lora_name, lora_path, strength))
+
+        return (model_with_loras, enhanced_prompt, lora_list)
@@ -1,6 +1,7 @@
 
 from datetime import datetime
 from itertools import chain
+import time
 
 import torch
 import json
@@ -11,7 +12,6 @@ from pathlib import Path
 from PIL import Image
 from PIL.PngImagePlugin import PngInfo
 
-import hashlib
 import piexif
 import piexif.helper
 
@@ -23,12 +23,23 @@ import comfy.utils
 import folder_paths
 from typing import List
 
+from .extended_load_lora import get_lora_entry_name
+from .file_catalog import FILE_CATALOG
+from .hash_cache import HASH_CACHE
+from .lazy import LazyClassAttribute
+from .metrics import (
+    ENCODE_SECONDS,
+    METADATA_READ_SECONDS,
+    METADATA_READS,
+    SAVE_SECONDS,
+    SAVED_FILES,
+)
+from .seed_batch import parse_seed_list
+from .vae_decode import iter_decoded_chunks
+
 SUPPORTED_FORMATS = ["png", "jpg", "jpeg", "webp"]
 
 class ExtendedSaveImage:
-    model_hash_dict = {}
-    lora_hash_dict = {}
-    ti_hash_dict = {}
     ti_paths = []
     ti_names = []
     ti_stems = []
@@ -40,21 +51,20 @@ class ExtendedSaveImage:
 
     @classmethod
     def INPUT_TYPES(s):
-        for file in folder_paths.get_filename_list("embeddings"):
-            ExtendedSaveImage.ti_paths.append(file)
-            ExtendedSaveImage.ti_names.append(Path(file).name)
-            ExtendedSaveImage.ti_stems.append(Path(file).stem)
+        embeddings = FILE_CATALOG.get_filename_list("embeddings")
+        ExtendedSaveImage.ti_paths = list(embeddings)
+        ExtendedSaveImage.ti_names = [Path(file).name for file in embeddings]
+        ExtendedSaveImage.ti_stems = [Path(file).stem for file in embeddings]
         return {
-            "required": {
-                "images": ("IMAGE",),
-            },
+            "required": {},
             "optional": {
+                "images": ("IMAGE",),
                 "filename": (
                     "STRING",
                     {"default": "ComfyUI_%time_%seed_%counter", "multiline": False},
                 ),
                 "path": ("STRING", {"default": "%date/", "multiline": False}),
-                "model_name": (folder_paths.get_filename_list("checkpoints"),),
+                "model_name": (FILE_CATALOG.get_filename_list("checkpoints"),),
                 # "model_name_str": ("STRING", {"default": ""}),
                 "seed": (
                     "INT",
@@ -106,6 +116,12 @@ class ExtendedSaveImage:
                 ),
                 "save_metadata_file": ("BOOLEAN", {"default": False}),
                 "extra_info": ("STRING", {"default": "", "multiline": True}),
+                "seed_list": ("STRING", {"forceInput": True}),
+                # Alternative to images: decode the latent chunk by chunk and save as it goes.
+                # Kept last so widgets_values of existing workflows keep their positions
+                "latent": ("LATENT",),
+                "vae": ("VAE",),
+                "decode_chunk_size": ("INT", {"default": 4, "min": 1, "max": 64}),
             },
             "hidden": {"prompt": "PROMPT", "extra_pnginfo": "EXTRA_PNGINFO"},
         }
@@ -120,7 +136,7 @@ class ExtendedSaveImage:
 
     def save_images(
         self,
-        images,
+        images=None,
         filename: str = "ComfyUI_%time_%seed_%counter",
         path: str = "%date/",
         model_name: str = "",
@@ -132,7 +148,7 @@ class ExtendedSaveImage:
         sampler_name_str: str = "",
         scheduler: str = "",
         scheduler_str: str = "",
-        loaded_lora_names_list: List[str] = [],
+        loaded_lora_names_list: List = [],
         width: int = 1,
         height: int = 1,
         positive: str = "",
@@ -146,27 +162,40 @@ class ExtendedSaveImage:
         time_format: str = "%H%M%S",
         save_metadata_file: bool = False,
         extra_info: str = "",
+        seed_list: str = "",
+        latent=None,
+        vae=None,
+        decode_chunk_size: int = 4,
         prompt=None,
         extra_pnginfo=None,
     ):
-        (
-            full_output_folder,
-            filename_alt,
-            counter_alt,
-            subfolder_alt,
-            filename_prefix,
-        ) = folder_paths.get_save_image_path(
-            self.prefix_append,
-            self.output_dir,
-            images[0].shape[1],
-            images[0].shape[0],
-        )
+        if images is None and (latent is None or vae is None):
+            raise ValueError("ExtendedSaveImage: connect either images or both latent and vae")
 
+        full_output_folder = None
         results = []
         files = []
         comments = []
         file_paths = []
-        for image in images:
+        # Per-image seeds from a multi-seed ExtendedKSampler run override the single seed
+        image_seeds = parse_seed_list(seed_list) if seed_list else []
+        for image_index, img in enumerate(self.iter_pil_images(images, latent, vae, decode_chunk_size)):
+            save_start = time.perf_counter()
+            if image_index < len(image_seeds):
+                seed = image_seeds[image_index]
+            if full_output_folder is None:
+                (
+                    full_output_folder,
+                    filename_alt,
+                    counter_alt,
+                    subfolder_alt,
+                    filename_prefix,
+                ) = folder_paths.get_save_image_path(
+                    self.prefix_append,
+                    self.output_dir,
+                    img.width,
+                    img.height,
+                )
             # model_name_str, sampler_name_str, scheduler_str = None, None, None
 
             model_name_real = model_name_str if model_name_str else model_name
@@ -196,8 +225,6 @@ class ExtendedSaveImage:
             counter = self.get_counter(output_folder)
             variable_map["%counter"] = f"{counter:05}"
 
-            i = 255.0 * image.cpu().numpy()
-            img = Image.fromarray(np.clip(i, 0, 255).astype(np.uint8))
             metadata = None
 
             model_hash_str = ""
@@ -215,9 +242,15 @@ class ExtendedSaveImage:
                     hashes["model"] = model_hash
 
                 if loaded_lora_names_list:
-                    loaded_lora_names_list_unique = list(set(loaded_lora_names_list))
-                    for name in loaded_lora_names_list_unique:
-                        lora_hash = self.calculate_hash(name, "lora")
+                    # Entries are structured dicts from the LoRA nodes (or plain names from older graphs)
+                    loaded_lora_entries = {}
+                    for entry in loaded_lora_names_list:
+                        loaded_lora_entries.setdefault(get_lora_entry_name(entry), entry)
+                    for name, entry in loaded_lora_entries.items():
+                        if isinstance(entry, dict) and entry.get("hash"):
+                            lora_hash = entry["hash"][:10]
+                        else:
+                            lora_hash = self.calculate_hash(name, "lora")
                         lora_hash_dict[Path(name).stem] = lora_hash
                         hashes[f"lora:{Path(name).stem}"] = lora_hash
                     lora_hash_items = [f"{k}: {v}" for k, v in lora_hash_dict.items()]
@@ -270,6 +303,7 @@ class ExtendedSaveImage:
             file = self.get_unique_filename(stem, extension, output_folder)
             file_path = output_folder / file
 
+            encode_start = time.perf_counter()
             if extension == "png":
                 if not args.disable_metadata:
                     metadata = PngInfo()
@@ -301,6 +335,7 @@ class ExtendedSaveImage:
                         }
                     )
                     piexif.insert(metadata, str(file_path))
+            ENCODE_SECONDS.observe(time.perf_counter() - encode_start, format=extension)
 
             if save_metadata_file:
                 with open(file_path.with_suffix(".txt"), "w", encoding="utf-8") as f:
@@ -312,6 +347,8 @@ class ExtendedSaveImage:
             files.append(str(file))
             file_paths.append(str(file_path))
             comments.append(comment)
+            SAVED_FILES.inc(format=extension)
+            SAVE_SECONDS.observe(time.perf_counter() - save_start, format=extension)
 
         return {
             "ui": {"images": results},
@@ -322,35 +359,36 @@ class ExtendedSaveImage:
             ),
         }
 
+    @staticmethod
+    def iter_pil_images(images, latent, vae, decode_chunk_size):
+        if images is not None:
+            for image in images:
+                i = 255.0 * image.cpu().numpy()
+                yield Image.fromarray(np.clip(i, 0, 255).astype(np.uint8))
+            return
+
+        # Streamed mode: only one chunk of decoded float images exists at a time; it is
+        # quantized to uint8 (same clip-and-truncate as above) and then dropped
+        for chunk in iter_decoded_chunks(vae, latent["samples"], max_chunk_size=decode_chunk_size):
+            quantized = torch.clamp(chunk * 255.0, 0, 255).to(torch.uint8).cpu().numpy()
+            del chunk
+            for pixels in quantized:
+                yield Image.fromarray(pixels)
+
     @staticmethod
     def calculate_hash(name, hash_type):
         match hash_type:
             case "model":
-                hash_dict = ExtendedSaveImage.model_hash_dict
                 file_name = folder_paths.get_full_path("checkpoints", name)
             case "lora":
-                hash_dict = ExtendedSaveImage.lora_hash_dict
                 file_name = folder_paths.get_full_path("loras", name)
             case "ti":
-                hash_dict = ExtendedSaveImage.ti_hash_dict
                 file_name = folder_paths.get_full_path("embeddings", name)
             case _:
                 return ""
 
-        if hash_value := hash_dict.get(name):
-            return hash_value
-
-        hash_sha256 = hashlib.sha256()
-        blksize = 1024 * 1024
-
-        with open(file_name, "rb") as f:
-            for chunk in iter(lambda: f.read(blksize), b""):
-                hash_sha256.update(chunk)
-
-        hash_value = hash_sha256.hexdigest()[:10]
-        hash_dict[name] = hash_value
-
-        return hash_value
+        # Persisted by file fingerprint, so each model file is read at most once per version
+        return HASH_CACHE.get_or_compute(file_name)[:10]
 
     @staticmethod
     def get_counter(directory: Path):
@@ -413,19 +451,12 @@ class ImageMetadataReader:
 
     @classmethod
     def INPUT_TYPES(s):
-        for path in folder_paths.get_filename_list("checkpoints"):
-            ImageMetadataReader.ckpt_paths.append(path)
-            ImageMetadataReader.ckpt_names.append(Path(path).name)
-            ImageMetadataReader.ckpt_stems.append(Path(path).stem)
-
-        input_dir = folder_paths.get_input_directory()
-        ImageMetadataReader.files = sorted(
-            [
-                f
-                for f in os.listdir(input_dir)
-                if os.path.isfile(os.path.join(input_dir, f))
-            ]
-        )
+        checkpoints = FILE_CATALOG.get_filename_list("checkpoints")
+        ImageMetadataReader.ckpt_paths = list(checkpoints)
+        ImageMetadataReader.ckpt_names = [Path(path).name for path in checkpoints]
+        ImageMetadataReader.ckpt_stems = [Path(path).stem for path in checkpoints]
+
+        ImageMetadataReader.files = FILE_CATALOG.get_input_files()
         return {
             "required": {
                 "image": (ImageMetadataReader.files, {"image_upload": True}),
@@ -472,6 +503,10 @@ class ImageMetadataReader:
     OUTPUT_NODE = True
 
     def load_image(self, image, parameter_index):
+        with METADATA_READ_SECONDS.time():
+            return self.read_image(image, parameter_index)
+
+    def read_image(self, image, parameter_index):
         if image in ImageMetadataReader.files:
             image_path = folder_paths.get_annotated_filepath(image)
         elif image.startswith("pasted/"):
@@ -493,6 +528,7 @@ class ImageMetadataReader:
 
         with open(file_path, "rb") as f:
             image_data = ImageDataReader(f)
+            METADATA_READS.inc(status=image_data.status.name.lower())
             if image_data.status.name == "COMFYUI_ERROR":
                 output_to_terminal(ERROR_MESSAGE["complex_workflow"])
                 return self.error_output(
@@ -667,14 +703,14 @@ class SDParameterGenerator:
 
     @classmethod
     def INPUT_TYPES(s):
-        SDParameterGenerator.ckpt_list = folder_paths.get_filename_list("checkpoints")
+        SDParameterGenerator.ckpt_list = FILE_CATALOG.get_filename_list("checkpoints")
         return {
             "required": {
                 "ckpt_name": (SDParameterGenerator.ckpt_list,),
             },
             "optional": {
                 "vae_name": (
-                    ["baked VAE"] + folder_paths.get_filename_list("vae"),
+                    ["baked VAE"] + FILE_CATALOG.get_filename_list("vae"),
                     {"default": "baked VAE"},
                 ),
                 "model_version": (
@@ -682,7 +718,7 @@ class SDParameterGenerator:
                     {"default": "SDv1 512px"},
                 ),
                 "config_name": (
-                    ["none"] + folder_paths.get_filename_list("configs"),
+                    ["none"] + FILE_CATALOG.get_filename_list("configs"),
                     {"default": "none"},
                 ),
                 "seed": (
@@ -734,12 +770,18 @@ class SDParameterGenerator:
                         "max": 4096,
                     },
                 ),
+                # Components to load; parameter-only graphs can switch all three off
+                # and never touch the model file. Kept last so existing widget values keep their positions
+                "output_model": ("BOOLEAN", {"default": True}),
+                "output_clip": ("BOOLEAN", {"default": True}),
+                "output_vae": ("BOOLEAN", {"default": True}),
             },
         }
 
-    RETURN_TYPES = (
-        folder_paths.get_filename_list("checkpoints"),
-        folder_paths.get_filename_list("vae"),
+    # Built when read rather than while the class body runs, so importing the module does not scan model folders
+    RETURN_TYPES = LazyClassAttribute(lambda cls: (
+        FILE_CATALOG.get_filename_list("checkpoints"),
+        FILE_CATALOG.get_filename_list("vae"),
         "MODEL",
         "CLIP",
         "VAE",
@@ -755,7 +797,7 @@ class SDParameterGenerator:
         "INT",
         "INT",
         "STRING",
-    )
+    ))
 
     RETURN_NAMES = (
         "MODEL_NAME",
@@ -800,31 +842,24 @@ class SDParameterGenerator:
         batch_size,
         output_vae=True,
         output_clip=True,
+        output_model=True,
     ):
-        ckpt_path = folder_paths.get_full_path("checkpoints", ckpt_name)
-        if config_name != "none":
-            config_path = folder_paths.get_full_path("configs", config_name)
-            checkpoint = comfy.sd.load_checkpoint(
-                config_path,
-                ckpt_path,
-                output_vae=True,
-                output_clip=True,
-                embedding_directory=folder_paths.get_folder_paths("embeddings"),
-            )
-        else:
-            checkpoint = comfy.sd.load_checkpoint_guess_config(
-                ckpt_path,
-                output_vae=True,
-                output_clip=True,
-                embedding_directory=folder_paths.get_folder_paths("embeddings"),
-            )[:3]
+        # The switches are node inputs, so turning a component back on changes the cache key
+        checkpoint = self.load_components(
+            ckpt_name,
+            config_name,
+            need_model=output_model,
+            need_clip=output_clip,
+            need_baked_vae=output_vae and vae_name == "baked VAE",
+        )
 
         if vae_name != "baked VAE":
             vae_name_real = vae_name
-            vae_path = folder_paths.get_full_path("vae", vae_name)
-            sd = comfy.utils.load_torch_file(vae_path)
-            vae = comfy.sd.VAE(sd=sd)
-            checkpoint = (*checkpoint[:2], vae)
+            if output_vae:
+                vae_path = folder_paths.get_full_path("vae", vae_name)
+                sd = comfy.utils.load_torch_file(vae_path)
+                vae = comfy.sd.VAE(sd=sd)
+                checkpoint = (*checkpoint[:2], vae)
             vae_str = f"VAE: {vae_name}, \n"
         else:
             vae_str = ""
@@ -903,6 +938,41 @@ class SDParameterGenerator:
             ),
         }
 
+    @staticmethod
+    def load_components(ckpt_name, config_name, need_model, need_clip, need_baked_vae):
+        """
+        Load only the requested checkpoint components.
+
+        Returns:
+            Tuple of (model, clip, vae); components that were not requested are None
+        """
+        if not (need_model or need_clip or need_baked_vae):
+            return (None, None, None)
+
+        ckpt_path = folder_paths.get_full_path("checkpoints", ckpt_name)
+        if config_name != "none":
+            # Config-based loading always builds the diffusion model
+            config_path = folder_paths.get_full_path("configs", config_name)
+            return tuple(
+                comfy.sd.load_checkpoint(
+                    config_path,
+                    ckpt_path,
+                    output_vae=need_baked_vae,
+                    output_clip=need_clip,
+                    embedding_directory=folder_paths.get_folder_paths("embeddings"),
+                )[:3]
+            )
+
+        return tuple(
+            comfy.sd.load_checkpoint_guess_config(
+                ckpt_path,
+                output_vae=need_baked_vae,
+                output_clip=need_clip,
+                embedding_directory=folder_paths.get_folder_paths("embeddings"),
+                output_model=need_model,
+            )[:3]
+        )
+
     @classmethod
     def VALIDATE_INPUTS(s, aspect_ratio):
         return True
@@ -916,7 +986,7 @@ class SDTypeConverter:
             "required": {},
             "optional": {
                 "model_name": (
-                    folder_paths.get_filename_list("checkpoints"),
+                    FILE_CATALOG.get_filename_list("checkpoints"),
                     {"forceInput": True},
                 ),
                 "sampler_name": (
@@ -0,0 +1,236 @@
+"""
+Process-wide catalog of model and input file names.
+
+``folder_paths.get_filename_list`` walks every model directory on each call,
+and the nodes of this package call it several times whenever ``/object_info``
+is built. The catalog keeps the listing of each directory together with the
+directory's mtime. A refresh only stats the known directories and rescans the
+ones that changed, which stays cheap on folders with thousands of files or on
+network storage.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import folder_paths
+
+# Repeated lookups within this window reuse the last result without any stat call
+REFRESH_INTERVAL_SECONDS = 1.0
+
+# Directory names skipped while walking, matching folder_paths.recursive_search
+EXCLUDED_DIR_NAMES = {".git"}
+
+
+class _DirectoryListing:
+    """Non-recursive listing of one directory, tagged with its mtime."""
+
+    __slots__ = ("mtime_ns", "files", "subdirs")
+
+    def __init__(self, mtime_ns: int, files: List[str], subdirs: List[str]) -> None:
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.subdirs = subdirs
+
+
+def _scan_directory(path: str) -> Optional[_DirectoryListing]:
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        files: List[str] = []
+        subdirs: List[str] = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=True):
+                        if entry.name in EXCLUDED_DIR_NAMES:
+                            continue
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=True):
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return _DirectoryListing(mtime_ns, files, subdirs)
+
+
+class FileCatalog:
+    """
+    Cached, incrementally refreshed file lists for ComfyUI folders.
+    """
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL_SECONDS) -> None:
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._directories: Dict[str, _DirectoryListing] = {}
+        self._lists: Dict[str, List[str]] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._signatures: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+
+    def _refresh_tree(self, root: str) -> None:
+        """Rescan the directories below root whose mtime changed."""
+        pending = [root]
+        seen: Set[str] = set()
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+
+            listing = self._directories.get(path)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+
+            if mtime_ns is None:
+                self._directories.pop(path, None)
+                continue
+
+            if listing is None or listing.mtime_ns != mtime_ns:
+                listing = _scan_directory(path)
+                if listing is None:
+                    self._directories.pop(path, None)
+                    continue
+                self._directories[path] = listing
+            pending.extend(listing.subdirs)
+
+        # Drop directories that disappeared together with their parent
+        prefix = os.path.join(root, "")
+        for path in [p for p in self._directories if p.startswith(prefix) and p not in seen]:
+            del self._directories[path]
+
+    def _signature(self, roots: List[str]) -> Tuple[Tuple[str, int], ...]:
+        prefixes = tuple(os.path.join(root, "") for root in roots)
+        return tuple(sorted(
+            (path, listing.mtime_ns)
+            for path, listing in self._directories.items()
+            if path in roots or path.startswith(prefixes)
+        ))
+
+    def _collect(self, root: str, extensions: Set[str]) -> List[str]:
+        prefix = os.path.join(root, "")
+        names: List[str] = []
+        for path, listing in self._directories.items():
+            if path != root and not path.startswith(prefix):
+                continue
+            relative_dir = os.path.relpath(path, root)
+            for file_name in listing.files:
+                if extensions and os.path.splitext(file_name)[1].lower() not in extensions:
+                    continue
+                names.append(file_name if relative_dir == "." else os.path.join(relative_dir, file_name))
+        return names
+
+    def _is_fresh(self, key: str) -> bool:
+        checked_at = self._checked_at.get(key)
+        return checked_at is not None and key in self._lists and time.monotonic() - checked_at < self.refresh_interval
+
+    def get_filename_list(self, folder_name: str) -> List[str]:
+        """
+        Drop-in replacement for ``folder_paths.get_filename_list``.
+
+        Args:
+            folder_name: ComfyUI folder name, e.g. "checkpoints" or "loras"
+
+        Returns:
+            Sorted list of file names relative to the folder's base paths
+        """
+        with self._lock:
+            if self._is_fresh(folder_name):
+                return self._lists[folder_name]
+
+            entry = folder_paths.folder_names_and_paths.get(folder_name)
+            if entry is None:
+                return folder_paths.get_filename_list(folder_name)
+            roots = [os.path.abspath(base_path) for base_path in entry[0]]
+            extensions = {ext.lower() for ext in entry[1]}
+
+            for root in roots:
+                self._refresh_tree(root)
+
+            # Directories can be shared between folder names, so compare mtimes
+            # instead of relying on whether this call rescanned anything
+            signature = self._signature(roots)
+            if folder_name not in self._lists or self._signatures.get(folder_name) != signature:
+                names: Set[str] = set()
+                for root in roots:
+                    names.update(self._collect(root, extensions))
+                self._lists[folder_name] = sorted(names)
+                self._signatures[folder_name] = signature
+            self._checked_at[folder_name] = time.monotonic()
+            return self._lists[folder_name]
+
+    def get_input_files(self) -> List[str]:
+        """
+        List the files directly inside the ComfyUI input directory.
+
+        Returns:
+            Sorted list of file names
+        """
+        with self._lock:
+            key = "\0input"
+            if self._is_fresh(key):
+                return self._lists[key]
+
+            input_dir = os.path.abspath(folder_paths.get_input_directory())
+            listing = self._directories.get(input_dir)
+            try:
+                mtime_ns: Optional[int] = os.stat(input_dir).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+
+            if mtime_ns is None:
+                self._lists[key] = []
+            elif listing is None or listing.mtime_ns != mtime_ns or key not in self._lists:
+                listing = _scan_directory(input_dir)
+                if listing is not None:
+                    self._directories[input_dir] = listing
+                self._lists[key] = sorted(listing.files) if listing is not None else []
+            self._checked_at[key] = time.monotonic()
+            return self._lists[key]
+
+    def refresh(self, folder_names: Optional[Iterable[str]] = None) -> Dict[str, Tuple[List[str], List[str]]]:
+        """
+        Re-check folders immediately and report what changed.
+
+        Args:
+            folder_names: Folders to refresh; every cached folder when omitted
+
+        Returns:
+            Dictionary mapping folder names to (added, removed) file name lists
+        """
+        with self._lock:
+            names = list(folder_names) if folder_names is not None else [k for k in self._lists if not k.startswith("\0")]
+            diff: Dict[str, Tuple[List[str], List[str]]] = {}
+            for folder_name in names:
+                before = set(self._lists.get(folder_name, []))
+                self._checked_at.pop(folder_name, None)
+                after = set(self.get_filename_list(folder_name))
+                diff[folder_name] = (sorted(after - before), sorted(before - after))
+            return diff
+
+    def refresh_input_files(self) -> Tuple[List[str], List[str]]:
+        """
+        Re-check the input directory immediately and report what changed.
+
+        Returns:
+            Tuple of (added, removed) file names
+        """
+        with self._lock:
+            before = set(self._lists.get("\0input", []))
+            self._checked_at.pop("\0input", None)
+            after = set(self.get_input_files())
+            return sorted(after - before), sorted(before - after)
+
+    def invalidate(self) -> None:
+        """Forget every cached listing; the next lookup rescans from scratch."""
+        with self._lock:
+            self._directories.clear()
+            self._lists.clear()
+            self._checked_at.clear()
+            self._signatures.clear()
+
+
+# Process-wide catalog shared by all nodes
+FILE_CATALOG = FileCatalog()
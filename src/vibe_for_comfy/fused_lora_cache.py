@@ -0,0 +1,216 @@
+"""
+Cache of LoRA-merged model weights keyed by base checkpoint and LoRA set.
+
+Normally every LoRA patch is recomputed (low-rank products, scaling, sums)
+each time a patched model is loaded onto the device. When the same
+checkpoint + LoRA combination is reused across many prompts, the merged
+weights can instead be computed once and stored, in RAM or as a safetensors
+file on disk. A cached model carries plain "set" patches that only copy the
+stored weights in.
+
+The checkpoint and LoRA identities are recorded in the ModelPatcher's
+``model_options`` by ExtendedLoadCheckpoint and the LoRA nodes, since
+``model_options`` is carried over to every clone.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import torch
+import comfy.lora
+import comfy.utils
+import safetensors.torch
+
+from .cache_utils import LRUByteCache, evict_lru_files, file_fingerprint, get_cache_directory
+from .constants import FUSED_LORA_DISK_MAX_BYTES, FUSED_LORA_RAM_MAX_BYTES
+from .lora_cache import state_dict_nbytes
+from .safetensors_utils import load_safetensors_mmap
+
+FUSED_CACHE_MODES = ["off", "ram", "disk"]
+
+CHECKPOINT_OPTION_KEY = "vibe_checkpoint"
+LORA_SET_OPTION_KEY = "vibe_lora_set"
+# Number of patch entries accounted for by the recorded LoRAs (-1 once a foreign patch was seen)
+PATCH_COUNT_OPTION_KEY = "vibe_patch_count"
+
+
+def count_patches(model: Any) -> int:
+    """Count the patch entries of a ModelPatcher (one per patched key and applied LoRA)."""
+    return sum(len(patches) for patches in model.patches.values())
+
+
+def has_foreign_patches(model: Any) -> bool:
+    """
+    Check whether a model carries patches that were not recorded by the package's LoRA nodes.
+
+    Args:
+        model: ModelPatcher tagged by ExtendedLoadCheckpoint
+
+    Returns:
+        True if a core LoraLoader or another node added patches the recorded LoRA set doesn't describe
+    """
+    recorded = model.model_options.get(PATCH_COUNT_OPTION_KEY, 0)
+    return recorded < 0 or count_patches(model) != recorded
+
+
+def tag_checkpoint(model: Any, ckpt_name: str, ckpt_path: str) -> None:
+    """
+    Record the identity of the checkpoint a model was loaded from.
+
+    Args:
+        model: ModelPatcher returned by the checkpoint loader
+        ckpt_name: Checkpoint file name
+        ckpt_path: Full path of the checkpoint file
+    """
+    model.model_options[CHECKPOINT_OPTION_KEY] = f"{ckpt_name}:{file_fingerprint(ckpt_path)}"
+    model.model_options[PATCH_COUNT_OPTION_KEY] = count_patches(model)
+
+
+def record_lora(model: Any, lora_name: str, lora_path: str, strength: float, base_patch_count: int) -> None:
+    """
+    Append a LoRA to the set of LoRAs recorded on a patched model clone.
+
+    Args:
+        model: Patched ModelPatcher clone (its model_options are modified)
+        lora_name: LoRA file name
+        lora_path: Full path of the LoRA file
+        strength: Strength the LoRA was applied with
+        base_patch_count: count_patches() of the model right before the LoRA was applied
+    """
+    lora_set = list(model.model_options.get(LORA_SET_OPTION_KEY, []))
+    lora_set.append([f"{lora_name}:{file_fingerprint(lora_path)}", float(strength)])
+    model.model_options[LORA_SET_OPTION_KEY] = lora_set
+    # Patches added by other nodes before this LoRA make the whole recorded set incomplete
+    recorded = model.model_options.get(PATCH_COUNT_OPTION_KEY, 0)
+    model.model_options[PATCH_COUNT_OPTION_KEY] = count_patches(model) if recorded == base_patch_count else -1
+
+
+def fused_cache_key(model: Any) -> Optional[str]:
+    """
+    Compute the cache key of a patched model.
+
+    Args:
+        model: ModelPatcher with recorded checkpoint and LoRA identities
+
+    Returns:
+        Hex digest, or None if the base checkpoint is unknown or the model carries
+        patches outside the recorded LoRA set (merge_patches would bake them in)
+    """
+    checkpoint = model.model_options.get(CHECKPOINT_OPTION_KEY)
+    lora_set = model.model_options.get(LORA_SET_OPTION_KEY)
+    if not checkpoint or not lora_set or has_foreign_patches(model):
+        return None
+    recipe = {"checkpoint": checkpoint, "loras": sorted(lora_set)}
+    return hashlib.sha256(json.dumps(recipe, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _original_weight(model: Any, key: str) -> torch.Tensor:
+    # If the model is currently patched on the device, the unpatched weight lives in the backup
+    backup = getattr(model, "backup", {}).get(key)
+    if backup is not None:
+        return getattr(backup, "weight", backup)
+    return comfy.utils.get_attr(model.model, key)
+
+
+def merge_patches(model: Any) -> Dict[str, torch.Tensor]:
+    """
+    Compute the merged weight of every patched key on the CPU.
+
+    Args:
+        model: ModelPatcher whose patches should be merged
+
+    Returns:
+        Dictionary mapping weight keys to merged tensors in the original dtype
+    """
+    calculate_weight = getattr(comfy.lora, "calculate_weight", None) or model.calculate_weight
+    merged: Dict[str, torch.Tensor] = {}
+    for key, patches in model.patches.items():
+        weight = _original_weight(model, key)
+        work = weight.to(device="cpu", dtype=torch.float32, copy=True)
+        merged[key] = calculate_weight(patches, work, key).to(weight.dtype).contiguous()
+    return merged
+
+
+class FusedLoraCache:
+    """
+    RAM and size-capped on-disk store of merged LoRA weights.
+    """
+
+    def __init__(
+        self,
+        ram_max_bytes: int = FUSED_LORA_RAM_MAX_BYTES,
+        disk_max_bytes: int = FUSED_LORA_DISK_MAX_BYTES,
+    ) -> None:
+        self._ram = LRUByteCache(ram_max_bytes)
+        self.disk_max_bytes = disk_max_bytes
+        self._disk_lock = threading.Lock()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(get_cache_directory("fused_lora"), f"{key}.safetensors")
+
+    def _load_from_disk(self, key: str) -> Optional[Dict[str, torch.Tensor]]:
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        return load_safetensors_mmap(path)
+
+    def _save_to_disk(self, key: str, merged: Dict[str, torch.Tensor]) -> None:
+        size = state_dict_nbytes(merged)
+        if size > self.disk_max_bytes:
+            return
+        path = self._disk_path(key)
+        with self._disk_lock:
+            tmp_path = f"{path}.tmp"
+            safetensors.torch.save_file(merged, tmp_path)
+            os.replace(tmp_path, path)
+            evict_lru_files(os.path.dirname(path), self.disk_max_bytes)
+
+    def get_fused_model(self, model: Any, mode: str) -> Any:
+        """
+        Replace a model's LoRA patches with cached merged weights.
+
+        Args:
+            model: Patched ModelPatcher with recorded checkpoint and LoRA set
+            mode: "ram" or "disk" ("off" returns the model unchanged)
+
+        Returns:
+            A clone whose patches just set the merged weights, or the input model
+            when the combination cannot be keyed
+        """
+        if mode == "off" or not model.patches:
+            return model
+        key = fused_cache_key(model)
+        if key is None:
+            print("FusedLoraCache: Model was not loaded by ExtendedLoadCheckpoint or has patches from other nodes, skipping fused cache")
+            return model
+
+        merged: Optional[Dict[str, torch.Tensor]]
+        if mode == "disk":
+            merged = self._load_from_disk(key)
+            if merged is None:
+                merged = merge_patches(model)
+                self._save_to_disk(key, merged)
+        else:
+            merged = self._ram.get(key)
+            if merged is None:
+                merged = merge_patches(model)
+                self._ram.put(key, merged, state_dict_nbytes(merged))
+
+        fused = model.clone()
+        fused.patches = {}
+        fused.add_patches({k: ("set", (weight,)) for k, weight in merged.items()}, 1.0, 1.0)
+        # The "set" patches stand for the whole recorded LoRA set
+        fused.model_options[PATCH_COUNT_OPTION_KEY] = count_patches(fused)
+        return fused
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the RAM cache statistics."""
+        return self._ram.get_stats()
+
+
+# Process-wide fused weight cache
+FUSED_LORA_CACHE = FusedLoraCache()
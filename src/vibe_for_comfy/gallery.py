@@ -0,0 +1,302 @@
+"""
+Index and thumbnails of the images in the ComfyUI output directory.
+
+The gallery routes let headless servers be browsed remotely instead of through
+a desktop file manager. The index keeps the mtime of every output directory
+plus the mtime and size of the images in it. A refresh (at most once per
+``GALLERY_REFRESH_INTERVAL`` seconds) stats the known directories and rescans
+only the ones whose mtime changed, so a request never walks the whole tree.
+A request for an image missing from the index forces a refresh, at most once
+per ``GALLERY_MISS_REFRESH_INTERVAL`` seconds so that a burst of bad paths
+cannot keep the index rescanning.
+
+Entries are ordered newest first. A page is addressed by an opaque cursor
+holding the sort key of the last entry returned, so paging stays consistent
+while new images are being saved.
+
+Thumbnails are rendered once per image version into the cache directory and
+evicted least recently used beyond ``GALLERY_THUMBNAIL_CACHE_MAX_BYTES``.
+"""
+
+import base64
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import folder_paths
+from PIL import Image, ImageOps
+
+from .cache_utils import evict_lru_files, get_cache_directory
+from .constants import GALLERY_MISS_REFRESH_INTERVAL, GALLERY_REFRESH_INTERVAL, GALLERY_THUMBNAIL_CACHE_MAX_BYTES
+from .file_catalog import _scan_directory
+
+GALLERY_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".gif"}
+
+# (mtime_ns, size) of an indexed image
+FileStat = Tuple[int, int]
+
+
+def encode_cursor(mtime_ns: int, path: str) -> str:
+    """Encode the sort key of the last returned entry as an opaque cursor."""
+    raw = json.dumps([mtime_ns, path]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        mtime_ns, path = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(mtime_ns, int) or not isinstance(path, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return mtime_ns, path
+
+
+class GalleryIndex:
+    """
+    Incrementally refreshed, newest-first index of the output images.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = GALLERY_REFRESH_INTERVAL,
+        miss_refresh_interval: float = GALLERY_MISS_REFRESH_INTERVAL,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.miss_refresh_interval = miss_refresh_interval
+        self._lock = threading.RLock()
+        self._root: Optional[str] = None
+        self._directories: Dict[str, Any] = {}
+        self._files: Dict[str, Dict[str, FileStat]] = {}
+        self._entries: Dict[str, FileStat] = {}
+        # (-mtime_ns, path) of every entry, ascending, i.e. newest first
+        self._order: List[Tuple[int, str]] = []
+        self._checked_at: Optional[float] = None
+        self._forced_at: Optional[float] = None
+
+    def _stat_images(self, directory: str, names: List[str]) -> Dict[str, FileStat]:
+        files = {}
+        for name in names:
+            if os.path.splitext(name)[1].lower() not in GALLERY_EXTENSIONS:
+                continue
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                continue
+            files[name] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _refresh(self, force: bool = False) -> None:
+        """Rescan the output directories whose mtime changed."""
+        root = os.path.abspath(folder_paths.get_output_directory())
+        if root != self._root:
+            self._root = root
+            self._directories.clear()
+            self._files.clear()
+            self._entries = {}
+            self._order = []
+            self._checked_at = None
+        elif not force and self._checked_at is not None and time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+
+        changed = False
+        pending = [root]
+        seen: Set[str] = set()
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            listing = self._directories.get(path)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            if listing is None or listing.mtime_ns != mtime_ns:
+                listing = _scan_directory(path)
+                if listing is None:
+                    continue
+                self._directories[path] = listing
+                self._files[path] = self._stat_images(path, listing.files)
+                changed = True
+            pending.extend(listing.subdirs)
+
+        for path in [p for p in self._directories if p not in seen]:
+            del self._directories[path]
+            self._files.pop(path, None)
+            changed = True
+
+        if changed:
+            entries: Dict[str, FileStat] = {}
+            for directory, files in self._files.items():
+                relative_dir = os.path.relpath(directory, root)
+                for name, file_stat in files.items():
+                    relative = name if relative_dir == "." else os.path.join(relative_dir, name)
+                    entries[relative.replace(os.sep, "/")] = file_stat
+            self._entries = entries
+            self._order = sorted((-mtime_ns, path) for path, (mtime_ns, _) in entries.items())
+        self._checked_at = time.monotonic()
+
+    def _filter(self, subfolder: str) -> List[Tuple[int, str]]:
+        if not subfolder:
+            return self._order
+        prefix = subfolder.strip("/") + "/"
+        return [key for key in self._order if key[1].startswith(prefix)]
+
+    def get_page(self, cursor: Optional[str] = None, limit: int = 50, subfolder: str = "") -> Dict[str, Any]:
+        """
+        Return one page of output images, newest first.
+
+        Args:
+            cursor: Cursor from the previous page, or None for the first page
+            limit: Maximum number of entries
+            subfolder: Only list images below this output subfolder
+
+        Returns:
+            Dictionary with "items", "next_cursor" (None on the last page) and "total"
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        with self._lock:
+            self._refresh()
+            order = self._filter(subfolder)
+            start = 0
+            if cursor:
+                mtime_ns, path = decode_cursor(cursor)
+                start = bisect.bisect_right(order, (-mtime_ns, path))
+            page = order[start:start + max(1, limit)]
+            items = []
+            for _, path in page:
+                mtime_ns, size = self._entries[path]
+                subfolder_name, _, filename = path.rpartition("/")
+                items.append({
+                    "path": path,
+                    "subfolder": subfolder_name,
+                    "filename": filename,
+                    "size": size,
+                    "mtime": mtime_ns / 1e9,
+                })
+            has_more = start + len(page) < len(order)
+            next_cursor = encode_cursor(-page[-1][0], page[-1][1]) if page and has_more else None
+            return {"items": items, "next_cursor": next_cursor, "total": len(order)}
+
+    def get(self, path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Resolve an indexed image path.
+
+        Only paths present in the index are served, which also rules out
+        traversal outside the output directory.
+
+        Args:
+            path: Path relative to the output directory, "/" separated
+
+        Returns:
+            (full path, mtime_ns, size), or None if the image is not indexed
+        """
+        with self._lock:
+            self._refresh()
+            now = time.monotonic()
+            if path not in self._entries and (
+                self._forced_at is None or now - self._forced_at >= self.miss_refresh_interval
+            ):
+                # Saved since the last refresh
+                self._forced_at = now
+                self._refresh(force=True)
+            file_stat = self._entries.get(path)
+            if file_stat is None or self._root is None:
+                return None
+            return os.path.join(self._root, *path.split("/")), file_stat[0], file_stat[1]
+
+    def select(
+        self,
+        subfolder: str = "",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Tuple[str, str, int, int]]:
+        """
+        Return every indexed image matching a query, oldest first.
+
+        Args:
+            subfolder: Only images below this output subfolder
+            since: Only images modified at or after this Unix time
+            until: Only images modified before this Unix time
+
+        Returns:
+            List of (relative path, full path, mtime_ns, size)
+        """
+        with self._lock:
+            self._refresh(force=True)
+            if self._root is None:
+                return []
+            selected = []
+            for negative_mtime_ns, path in reversed(self._filter(subfolder)):
+                mtime = -negative_mtime_ns / 1e9
+                if (since is not None and mtime < since) or (until is not None and mtime >= until):
+                    continue
+                size = self._entries[path][1]
+                selected.append((path, os.path.join(self._root, *path.split("/")), -negative_mtime_ns, size))
+            return selected
+
+
+class ThumbnailCache:
+    """
+    On-disk WebP thumbnails keyed by image path, version and edge size.
+    """
+
+    def __init__(self, max_bytes: int = GALLERY_THUMBNAIL_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._directory: Optional[str] = None
+
+    def _get_directory(self) -> str:
+        if self._directory is None:
+            self._directory = get_cache_directory("thumbnails")
+        return self._directory
+
+    def get_path(self, image_path: str, mtime_ns: int, size: int, edge: int) -> str:
+        """
+        Return the thumbnail file of an image, rendering it on the first request.
+
+        Args:
+            image_path: Full path of the image
+            mtime_ns: Modification time of the image (part of the cache key)
+            size: Byte size of the image (part of the cache key)
+            edge: Maximum width and height of the thumbnail
+
+        Returns:
+            Full path of the cached thumbnail
+        """
+        key = hashlib.sha256(f"{image_path}|{mtime_ns}|{size}|{edge}".encode("utf-8")).hexdigest()
+        path = os.path.join(self._get_directory(), f"{key}.webp")
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+
+        with Image.open(image_path) as image:
+            # Lets the JPEG decoder downscale while decoding
+            image.draft("RGB", (edge, edge))
+            thumbnail = ImageOps.exif_transpose(image)
+            thumbnail.thumbnail((edge, edge))
+            if thumbnail.mode not in ("RGB", "RGBA"):
+                thumbnail = thumbnail.convert("RGBA" if "A" in thumbnail.getbands() else "RGB")
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            thumbnail.save(tmp_path, format="WEBP", quality=80)
+        os.replace(tmp_path, path)
+        evict_lru_files(self._get_directory(), self.max_bytes, suffix=".webp")
+        return path
+
+
+# Process-wide output index and thumbnail store
+GALLERY_INDEX = GalleryIndex()
+THUMBNAIL_CACHE = ThumbnailCache()
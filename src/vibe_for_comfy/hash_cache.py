@@ -0,0 +1,119 @@
+"""
+Persistent cache of model file hashes.
+
+Saving an image records the SHA-256 (AutoV2-style short form) of the
+checkpoint, LoRAs and embeddings it used. Hashes are stored keyed by path and
+size/mtime fingerprint, so every file is hashed at most once per version, and
+LoRAs are hashed from the bytes that are read while loading them.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+from .cache_utils import file_fingerprint, get_cache_directory, load_json, save_json
+from .metrics import HASH_LOOKUPS, HASH_SECONDS, HASHED_BYTES
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class HashCache:
+    """
+    Fingerprint-validated SHA-256 store persisted in the cache directory.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        self._cache_path = cache_path
+        self._entries: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+
+    def _get_cache_path(self) -> str:
+        if self._cache_path is None:
+            self._cache_path = os.path.join(get_cache_directory(), "file_hashes.json")
+        return self._cache_path
+
+    def _get_entries(self) -> Dict[str, Dict[str, str]]:
+        if self._entries is None:
+            self._entries = load_json(self._get_cache_path(), {})
+        return self._entries
+
+    def get(self, path: str) -> Optional[str]:
+        """
+        Return the cached SHA-256 of a file if the file has not changed since.
+
+        Args:
+            path: Full path of the file
+
+        Returns:
+            Hex digest, or None if unknown or stale
+        """
+        try:
+            fingerprint = file_fingerprint(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._get_entries().get(path)
+        if entry is not None and entry.get("fingerprint") == fingerprint:
+            HASH_LOOKUPS.inc(result="hit")
+            return entry["sha256"]
+        HASH_LOOKUPS.inc(result="miss")
+        return None
+
+    def put(self, path: str, sha256: str) -> None:
+        """
+        Store the SHA-256 of a file computed elsewhere (e.g. while loading it).
+
+        Args:
+            path: Full path of the file
+            sha256: Hex digest of the file's content
+        """
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            self._get_entries()[path] = {"fingerprint": fingerprint, "sha256": sha256}
+            save_json(self._get_cache_path(), self._entries)
+
+    def get_or_compute(self, path: str) -> str:
+        """
+        Return the SHA-256 of a file, reading it only if no valid entry exists.
+
+        Args:
+            path: Full path of the file
+
+        Returns:
+            Hex digest of the file's content
+        """
+        sha256 = self.get(path)
+        if sha256 is not None:
+            return sha256
+
+        hasher = hashlib.sha256()
+        hashed_bytes = 0
+        with HASH_SECONDS.time(), open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                hasher.update(chunk)
+                hashed_bytes += len(chunk)
+        HASHED_BYTES.inc(hashed_bytes)
+        sha256 = hasher.hexdigest()
+        self.put(path, sha256)
+        return sha256
+
+    def prune(self) -> int:
+        """
+        Drop entries of files that no longer exist.
+
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            entries = self._get_entries()
+            missing = [path for path in entries if not os.path.exists(path)]
+            for path in missing:
+                del entries[path]
+            if missing:
+                save_json(self._get_cache_path(), entries)
+        return len(missing)
+
+
+# Process-wide hash cache
+HASH_CACHE = HashCache()
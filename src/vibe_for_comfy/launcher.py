@@ -0,0 +1,111 @@
+"""
+Non-blocking launching of the system file explorer.
+
+The opener (Explorer, Finder or the first Linux file manager found on PATH) is
+resolved once and cached, so headless workers don't pay a failed exec per
+missing file manager on every call. The process is started detached on a
+daemon thread that also waits for it, reaping it and logging a non-zero exit
+without blocking the node execution thread or the aiohttp event loop.
+"""
+
+import asyncio
+import functools
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from typing import List, Optional
+
+LINUX_FILE_MANAGERS = ("xdg-open", "nautilus", "dolphin", "thunar", "pcmanfm")
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_opener() -> Optional[str]:
+    """
+    Find the program used to open folders on this system.
+
+    Returns:
+        "startfile" on Windows, "open" on macOS, the first available Linux file
+        manager, or None when there is none
+    """
+    if sys.platform.startswith("win"):
+        return "startfile"
+    if sys.platform == "darwin":
+        return "open"
+    for manager in LINUX_FILE_MANAGERS:
+        if shutil.which(manager):
+            return manager
+    return None
+
+
+def _build_command(opener: str, path: str, reveal: bool) -> List[str]:
+    if opener == "startfile":
+        return ["explorer", f"/select,{path}"]
+    if opener == "open":
+        return ["open", "-R", path] if reveal else ["open", path]
+    # Linux file managers cannot select a file portably; open its folder instead
+    return [opener, os.path.dirname(path) if reveal else path]
+
+
+def _run_detached(command: List[str]) -> None:
+    try:
+        popen_kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        if sys.platform.startswith("win"):
+            popen_kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            popen_kwargs["start_new_session"] = True
+        process = subprocess.Popen(command, **popen_kwargs)
+        returncode = process.wait()
+        # explorer.exe returns 1 even on success
+        if returncode != 0 and command[0] != "explorer":
+            print(f"Launcher: {command[0]} exited with code {returncode}")
+    except OSError as e:
+        print(f"Launcher: Failed to start {command[0]}: {e}")
+
+
+def _startfile(path: str) -> None:
+    try:
+        os.startfile(path)  # type: ignore[attr-defined]
+    except OSError as e:
+        print(f"Launcher: Failed to open {path}: {e}")
+
+
+def launch_explorer(path: str, reveal: bool = False) -> bool:
+    """
+    Open a folder, or reveal a file, in the system file explorer without waiting.
+
+    Args:
+        path: Folder to open, or file to reveal
+        reveal: Select the file in its folder instead of opening the path itself
+
+    Returns:
+        True if an opener was started, False if none is available
+    """
+    opener = resolve_opener()
+    if opener is None:
+        return False
+
+    if opener == "startfile" and not reveal:
+        thread = threading.Thread(target=_startfile, args=(path,), name="vibe_launcher", daemon=True)
+    else:
+        command = _build_command(opener, path, reveal)
+        thread = threading.Thread(target=_run_detached, args=(command,), name="vibe_launcher", daemon=True)
+    thread.start()
+    return True
+
+
+async def launch_explorer_async(path: str, reveal: bool = False) -> bool:
+    """
+    Event-loop friendly variant of launch_explorer for aiohttp handlers.
+
+    Args:
+        path: Folder to open, or file to reveal
+        reveal: Select the file in its folder instead of opening the path itself
+
+    Returns:
+        True if an opener was started, False if none is available
+    """
+    # The first call resolves the opener on PATH; keep that off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, launch_explorer, path, reveal)
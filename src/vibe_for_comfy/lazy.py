@@ -0,0 +1,88 @@
+"""
+Deferred loading of node classes and class attributes.
+
+ComfyUI imports every custom node package before the server starts, but only
+needs a node's class once it builds ``/object_info`` or runs the node. The
+package therefore registers lightweight stubs: a stub behaves like its node
+class for attribute access and instantiation, and imports the module that
+defines the node (with torch, PIL, comfy and so on) on first use.
+
+``LazyClassAttribute`` does the same for class attributes that used to be
+computed while the class body ran, such as output types holding model file
+lists, which otherwise scanned the model folders on import.
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Optional
+
+_resolve_lock = threading.RLock()
+
+
+class _LazyNodeMeta(type):
+    """Metaclass forwarding class attribute lookups and calls to the real node class."""
+
+    def _resolve(cls) -> type:
+        node_class = cls._node_class
+        if node_class is None:
+            with _resolve_lock:
+                node_class = cls._node_class
+                if node_class is None:
+                    module = importlib.import_module(f".{cls._module_name}", __package__)
+                    node_class = getattr(module, cls._class_name)
+                    # Attributes ComfyUI set on the stub (e.g. RELATIVE_PYTHON_MODULE) also apply to the node
+                    for name, value in cls._assigned.items():
+                        setattr(node_class, name, value)
+                    cls._node_class = node_class
+        return node_class
+
+    def __getattr__(cls, name: str) -> Any:
+        # Only reached for names the stub does not define; dunder probes must not trigger an import
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(cls._resolve(), name)
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        if not name.startswith("_"):
+            cls._assigned[name] = value
+            if cls._node_class is not None:
+                setattr(cls._node_class, name, value)
+        super().__setattr__(name, value)
+
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
+        return cls._resolve()(*args, **kwargs)
+
+
+def lazy_node(module_name: str, class_name: str) -> type:
+    """
+    Create a stub for a node class that is imported on first use.
+
+    Args:
+        module_name: Module of this package defining the node, e.g. "extended_ksampler"
+        class_name: Name of the node class in that module
+
+    Returns:
+        Stub class usable in NODE_CLASS_MAPPINGS
+    """
+    return _LazyNodeMeta(class_name, (), {
+        "_module_name": module_name,
+        "_class_name": class_name,
+        "_node_class": None,
+        "_assigned": {},
+    })
+
+
+class LazyClassAttribute:
+    """
+    Class attribute computed by a function whenever it is read.
+
+    Args:
+        compute: Called with the owner class, returns the attribute value
+    """
+
+    def __init__(self, compute: Callable[[type], Any]) -> None:
+        self._compute = compute
+        self.__doc__ = compute.__doc__
+
+    def __get__(self, instance: Optional[Any], owner: type) -> Any:
+        return self._compute(owner)
@@ -0,0 +1,77 @@
+"""
+Process-wide cache of LoRA state dicts.
+
+ComfyUI's ``LoraLoader`` only remembers the last file per node instance, and
+``ExtendedLoadLoRA`` used to create a fresh loader on every run. This cache is
+shared by every node, keyed by the file path and its size/mtime fingerprint,
+and bounded by the total tensor bytes it holds. Safetensors files are hashed
+from the same bytes while they are read, so image metadata never needs a
+second read of the file.
+"""
+
+from typing import Any, Dict
+
+import torch
+import comfy.utils
+
+from .cache_utils import LRUByteCache, file_fingerprint
+from .constants import LORA_CACHE_MAX_BYTES
+from .hash_cache import HASH_CACHE
+from .safetensors_utils import is_safetensors, load_safetensors_hashed
+
+
+def state_dict_nbytes(state_dict: Dict[str, Any]) -> int:
+    """
+    Total byte size of the tensors in a state dict.
+
+    Args:
+        state_dict: Mapping of names to tensors
+
+    Returns:
+        Number of bytes held by the tensors
+    """
+    return sum(t.numel() * t.element_size() for t in state_dict.values() if isinstance(t, torch.Tensor))
+
+
+class LoraCache:
+    """
+    LRU cache of LoRA state dicts bounded by a byte budget.
+    """
+
+    def __init__(self, max_bytes: int = LORA_CACHE_MAX_BYTES) -> None:
+        self._cache = LRUByteCache(max_bytes)
+
+    def load(self, lora_path: str) -> Dict[str, Any]:
+        """
+        Return the state dict of a LoRA file, reading it only on a cache miss.
+
+        Args:
+            lora_path: Full path of the LoRA file
+
+        Returns:
+            The LoRA state dict (shared; callers must not modify it)
+        """
+        key = (lora_path, file_fingerprint(lora_path))
+        lora = self._cache.get(key)
+        if lora is None:
+            if is_safetensors(lora_path):
+                lora, sha256 = load_safetensors_hashed(lora_path)
+                HASH_CACHE.put(lora_path, sha256)
+            else:
+                lora = comfy.utils.load_torch_file(lora_path, safe_load=True)
+            # Older versions of a rewritten file can never be hit again
+            self._cache.discard(lambda k: k[0] == lora_path)
+            self._cache.put(key, lora, state_dict_nbytes(lora))
+        return lora
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the cache statistics."""
+        return self._cache.get_stats()
+
+    def clear(self) -> None:
+        """Drop every cached LoRA."""
+        self._cache.clear()
+
+
+# Process-wide cache shared by all LoRA nodes
+LORA_CACHE = LoraCache()
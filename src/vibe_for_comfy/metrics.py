@@ -0,0 +1,289 @@
+"""
+Process-wide metrics served in the Prometheus text exposition format.
+
+Nodes update counters and histograms on their hot paths; an update is a dict
+lookup and an addition under a per-metric lock, so it stays far below the cost
+of the work being measured. Values that the caches already track (hits,
+misses, bytes) are not duplicated: collectors registered with the registry
+read them only when ``/vibe_for_comfy/metrics`` is scraped.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a fast cached lookup up to a slow checkpoint load from network storage
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (labels, value) pairs of one metric family
+Samples = List[Tuple[Dict[str, Any], float]]
+# (name, type, help, samples) of a metric family produced at scrape time
+Family = Tuple[str, str, str, Samples]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError:
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Tuple[str, Dict[str, Any], float]]:
+        """Return (sample name, labels, value) of every series."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing value, e.g. files saved or bytes hashed.
+    """
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """
+        Add to the counter.
+
+        Args:
+            amount: Non-negative increment
+            **labels: Value of every label name of the metric
+        """
+        if amount < 0:
+            raise ValueError(f"{self.name} can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Return the current value of a series (0 if never incremented)."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> List[Tuple[str, Dict[str, Any], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in values]
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values (latencies) in cumulative buckets.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value, e.g. seconds
+            **labels: Value of every label name of the metric
+        """
+        key = self._key(labels)
+        # Index of the first bucket whose upper bound holds the value; len(buckets) is +Inf
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall time of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        """Return the number of observations of a series."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            return sum(state[0]) if state is not None else 0
+
+    def samples(self) -> List[Tuple[str, Dict[str, Any], float]]:
+        with self._lock:
+            values = [(key, list(state[0]), state[1]) for key, state in self._values.items()]
+
+        samples = []
+        for key, counts, total in values:
+            labels = self._labels(key)
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(upper_bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Named metrics and scrape-time collectors, rendered together as Prometheus text.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """
+        Add a function called on every scrape to report values owned elsewhere.
+
+        Args:
+            collector: Returns (name, type, help, [(labels, value), ...]) families
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text, one family after another
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for sample_name, labels, value in metric.samples():
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                # A failing collector must not take the whole scrape down
+                print(f"MetricsRegistry: Collector failed: {e}")
+                continue
+            for name, type_name, documentation, samples in families:
+                lines.append(f"# HELP {name} {_escape(documentation)}")
+                lines.append(f"# TYPE {name} {type_name}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry scraped by the metrics route
+METRICS = MetricsRegistry()
+
+HASH_SECONDS = METRICS.histogram(
+    "vibe_hash_seconds", "Time spent computing SHA-256 hashes of model files"
+)
+HASHED_BYTES = METRICS.counter(
+    "vibe_hashed_bytes_total", "Bytes read to compute model file hashes"
+)
+HASH_LOOKUPS = METRICS.counter(
+    "vibe_hash_cache_lookups_total", "Hash cache lookups by result", ("result",)
+)
+SAVE_SECONDS = METRICS.histogram(
+    "vibe_save_image_seconds", "Time to save one image including hashing and metadata", ("format",)
+)
+ENCODE_SECONDS = METRICS.histogram(
+    "vibe_image_encode_seconds", "Time to encode and write one image file", ("format",)
+)
+SAVED_FILES = METRICS.counter(
+    "vibe_saved_files_total", "Image files written by ExtendedSaveImage", ("format",)
+)
+METADATA_READ_SECONDS = METRICS.histogram(
+    "vibe_metadata_read_seconds", "Time ImageMetadataReader takes to load an image and parse its metadata"
+)
+METADATA_READS = METRICS.counter(
+    "vibe_metadata_reads_total", "Images read by ImageMetadataReader by parse status", ("status",)
+)
+LORA_LOAD_SECONDS = METRICS.histogram(
+    "vibe_lora_load_seconds", "Time ExtendedLoadLoRA takes to load and apply a LoRA"
+)
+CHECKPOINT_LOAD_SECONDS = METRICS.histogram(
+    "vibe_checkpoint_load_seconds", "Time ExtendedLoadCheckpoint takes to load a checkpoint", ("load_mode",)
+)
+SAMPLER_PHASE_SECONDS = METRICS.histogram(
+    "vibe_sampler_phase_seconds", "Time ExtendedKSampler spends per phase", ("phase",)
+)
+SAMPLER_STEP_SECONDS = METRICS.histogram(
+    "vibe_sampler_step_seconds", "Duration of ExtendedKSampler sampler steps after the first"
+)
+SAMPLED_IMAGES = METRICS.counter(
+    "vibe_sampled_images_total", "Images produced by ExtendedKSampler, sampled or from the result cache", ("source",)
+)
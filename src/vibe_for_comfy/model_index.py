@@ -0,0 +1,282 @@
+"""
+Header-only index of checkpoint, LoRA and embedding files.
+
+Only the JSON header of each ``.safetensors`` file is parsed, which is enough
+to tell the architecture, dtype, parameter count and the training metadata
+(trigger words, base model) of a model. Results are persisted in the cache
+directory keyed by the file's size/mtime fingerprint, so each file is read
+once and browsing a model folder costs kilobytes per file.
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from math import prod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import folder_paths
+
+from .file_catalog import FILE_CATALOG
+from .cache_utils import file_fingerprint, get_cache_directory, load_json, save_json
+from .safetensors_utils import is_safetensors, read_safetensors_header
+
+INDEXED_FOLDERS: Tuple[str, ...] = ("checkpoints", "loras", "embeddings")
+
+# Training metadata keys worth surfacing; the full __metadata__ can be megabytes
+METADATA_KEYS: Tuple[str, ...] = (
+    "modelspec.title",
+    "modelspec.architecture",
+    "modelspec.trigger_phrase",
+    "ss_base_model_version",
+    "ss_sd_model_name",
+    "ss_output_name",
+    "ss_network_dim",
+    "ss_network_alpha",
+)
+
+MAX_TRIGGER_WORDS = 10
+
+
+def detect_architecture(keys: List[str], metadata: Dict[str, str]) -> Tuple[str, str]:
+    """
+    Guess the model kind and architecture from tensor names.
+
+    Args:
+        keys: Tensor names from the safetensors header
+        metadata: The header's __metadata__ section
+
+    Returns:
+        Tuple of (kind, architecture), e.g. ("lora", "SDXL")
+    """
+    def has(*fragments: str) -> bool:
+        return any(fragment in key for key in keys for fragment in fragments)
+
+    if has("lora_up", "lora_down", "lora_A", "lora_B", "lora_unet_", "lora_te"):
+        kind = "lora"
+    elif has("emb_params", "string_to_param") or (keys and all(key in ("clip_l", "clip_g") for key in keys)):
+        kind = "embedding"
+    else:
+        kind = "checkpoint"
+
+    if has("double_blocks", "single_blocks", "single_transformer_blocks"):
+        architecture = "Flux"
+    elif has("joint_blocks"):
+        architecture = "SD3"
+    elif has("conditioner.embedders.1", "lora_te2_", "clip_g"):
+        architecture = "SDXL"
+    elif has("cond_stage_model.model.", "lora_te_text_model_encoder_layers_22"):
+        architecture = "SD2"
+    elif has("cond_stage_model.transformer.", "lora_te_", "lora_unet_down_blocks"):
+        architecture = "SD1"
+    else:
+        architecture = metadata.get("modelspec.architecture") or metadata.get("ss_base_model_version") or "unknown"
+
+    return kind, architecture
+
+
+def extract_trigger_words(metadata: Dict[str, str]) -> List[str]:
+    """
+    Collect trigger words from LoRA training metadata.
+
+    Args:
+        metadata: The header's __metadata__ section
+
+    Returns:
+        Explicit trigger phrases followed by the most frequent training tags
+    """
+    words: List[str] = []
+    trigger_phrase = metadata.get("modelspec.trigger_phrase")
+    if trigger_phrase:
+        words.extend(word.strip() for word in trigger_phrase.split(",") if word.strip())
+
+    try:
+        tag_frequency = json.loads(metadata.get("ss_tag_frequency") or "{}")
+    except ValueError:
+        tag_frequency = {}
+
+    counts: Counter = Counter()
+    if isinstance(tag_frequency, dict):
+        for tags in tag_frequency.values():
+            if isinstance(tags, dict):
+                counts.update({str(tag).strip(): int(count) for tag, count in tags.items()})
+
+    for tag, _ in counts.most_common():
+        if len(words) >= MAX_TRIGGER_WORDS:
+            break
+        if tag and tag not in words:
+            words.append(tag)
+    return words
+
+
+def summarize_header(header: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the index entry for a parsed safetensors header.
+
+    Args:
+        header: Header dictionary from read_safetensors_header
+
+    Returns:
+        Dictionary with kind, architecture, dtype, parameter count, trigger words and metadata
+    """
+    metadata = header.get("__metadata__") or {}
+    keys = [key for key in header if key != "__metadata__"]
+
+    dtype_params: Counter = Counter()
+    for key in keys:
+        info = header[key]
+        dtype_params[info["dtype"]] += prod(info["shape"])
+
+    kind, architecture = detect_architecture(keys, metadata)
+    return {
+        "format": "safetensors",
+        "kind": kind,
+        "architecture": architecture,
+        "dtype": dtype_params.most_common(1)[0][0] if dtype_params else "",
+        "dtypes": dict(dtype_params),
+        "parameters": sum(dtype_params.values()),
+        "tensors": len(keys),
+        "trigger_words": extract_trigger_words(metadata),
+        "metadata": {key: metadata[key] for key in METADATA_KEYS if key in metadata},
+    }
+
+
+class ModelHeaderIndex:
+    """
+    Persistent, fingerprint-keyed index of safetensors header summaries.
+    """
+
+    def __init__(self, index_path: Optional[str] = None) -> None:
+        self._index_path = index_path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+
+    def _get_index_path(self) -> str:
+        if self._index_path is None:
+            self._index_path = os.path.join(get_cache_directory(), "model_index.json")
+        return self._index_path
+
+    def _get_entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = load_json(self._get_index_path(), {})
+        return self._entries
+
+    def _lookup(self, path: str) -> Tuple[Dict[str, Any], bool]:
+        fingerprint = file_fingerprint(path)
+        entries = self._get_entries()
+        entry = entries.get(path)
+        if entry is not None and entry.get("fingerprint") == fingerprint:
+            return entry["info"], False
+
+        if is_safetensors(path):
+            try:
+                info = summarize_header(read_safetensors_header(path)[0])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                info = {"format": "safetensors", "kind": "unknown", "architecture": "unknown", "error": str(e)}
+        else:
+            # Pickled checkpoints cannot be inspected without unpickling them
+            info = {"format": os.path.splitext(path)[1].lstrip(".") or "unknown", "kind": "unknown", "architecture": "unknown"}
+        info["size"] = os.path.getsize(path)
+
+        entries[path] = {"fingerprint": fingerprint, "info": info}
+        return info, True
+
+    def get_info(self, folder_name: str, file_name: str) -> Dict[str, Any]:
+        """
+        Return the header summary of one model file, parsing it if needed.
+
+        Args:
+            folder_name: ComfyUI model folder, e.g. "loras"
+            file_name: File name as listed by folder_paths
+
+        Returns:
+            Index entry, or an empty dictionary if the file does not exist
+        """
+        path = folder_paths.get_full_path(folder_name, file_name)
+        if path is None:
+            return {}
+        with self._lock:
+            info, changed = self._lookup(path)
+            if changed:
+                self.save()
+        return dict(info, name=file_name, folder=folder_name)
+
+    def scan(self, folder_names: Iterable[str] = INDEXED_FOLDERS) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Index every file of the given model folders.
+
+        Args:
+            folder_names: ComfyUI model folders to scan
+
+        Returns:
+            Dictionary mapping folder names to lists of index entries
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            changed = False
+            for folder_name in folder_names:
+                results[folder_name] = []
+                for file_name in FILE_CATALOG.get_filename_list(folder_name):
+                    path = folder_paths.get_full_path(folder_name, file_name)
+                    if path is None:
+                        continue
+                    try:
+                        info, entry_changed = self._lookup(path)
+                    except OSError:
+                        continue
+                    changed = changed or entry_changed
+                    results[folder_name].append(dict(info, name=file_name, folder=folder_name))
+            if changed:
+                self.save()
+        return results
+
+    def prune(self) -> int:
+        """
+        Drop entries of files that no longer exist.
+
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            entries = self._get_entries()
+            missing = [path for path in entries if not os.path.exists(path)]
+            for path in missing:
+                del entries[path]
+            if missing:
+                self.save()
+        return len(missing)
+
+    def save(self) -> None:
+        """Persist the index to the cache directory."""
+        with self._lock:
+            save_json(self._get_index_path(), self._get_entries())
+
+
+def format_model_info(info: Dict[str, Any]) -> str:
+    """
+    Render an index entry as a short human-readable string for node outputs.
+
+    Args:
+        info: Entry returned by ModelHeaderIndex.get_info
+
+    Returns:
+        Multi-line description
+    """
+    if not info:
+        return ""
+    lines = [
+        f"Name: {info.get('name', '')}",
+        f"Kind: {info.get('kind', 'unknown')}",
+        f"Architecture: {info.get('architecture', 'unknown')}",
+    ]
+    if info.get("dtype"):
+        lines.append(f"Dtype: {info['dtype']}")
+    if info.get("parameters"):
+        lines.append(f"Parameters: {info['parameters']:,}")
+    if info.get("trigger_words"):
+        lines.append(f"Trigger words: {', '.join(info['trigger_words'])}")
+    return "\n".join(lines)
+
+
+# Process-wide index shared by nodes and routes
+MODEL_INDEX = ModelHeaderIndex()
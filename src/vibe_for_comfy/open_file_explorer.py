@@ -6,12 +6,10 @@ file explorer (Windows Explorer, macOS Finder, or Linux file manager).
 """
 
 import os
-import platform
-import subprocess
-import sys
 from inspect import cleandoc
 from typing import Any, Dict
 from .constants import NODE_CATEGORY
+from .launcher import launch_explorer
 
 
 class OpenInFileExplorer:
@@ -78,64 +76,15 @@ class OpenInFileExplorer:
             print(f"OpenInFileExplorer: Path does not exist: {path}")
             return ()
         
-        try:
-            system = platform.system().lower()
-            
-            # Determine if path is a file or directory
-            if os.path.isfile(path):
-                # If it's a file, open the containing folder and select the file
-                folder_path = os.path.dirname(path)
-                if system == "windows":
-                    # Windows: use explorer with /select to highlight the file
-                    os.startfile(folder_path)
-                    # Also try to select the specific file
-                    try:
-                        subprocess.run(["explorer", "/select,", path], check=True)
-                    except:
-                        pass
-                elif system == "darwin":
-                    # macOS: use Finder to reveal the file
-                    subprocess.run(["open", "-R", path], check=True)
-                elif system == "linux":
-                    # Linux: try common file managers
-                    file_managers = ["xdg-open", "nautilus", "dolphin", "thunar", "pcmanfm"]
-                    for manager in file_managers:
-                        try:
-                            subprocess.run([manager, folder_path], check=True)
-                            break
-                        except (subprocess.CalledProcessError, FileNotFoundError):
-                            continue
-                    else:
-                        print(f"OpenInFileExplorer: No suitable file manager found on Linux")
-                        return ()
-                print(f"OpenInFileExplorer: Opened folder containing file: {path}")
-            else:
-                # If it's a directory, open it directly
-                if system == "windows":
-                    # Windows: use explorer
-                    os.startfile(path)
-                elif system == "darwin":
-                    # macOS: use Finder
-                    subprocess.run(["open", path], check=True)
-                elif system == "linux":
-                    # Linux: try common file managers
-                    file_managers = ["xdg-open", "nautilus", "dolphin", "thunar", "pcmanfm"]
-                    for manager in file_managers:
-                        try:
-                            subprocess.run([manager, path], check=True)
-                            break
-                        except (subprocess.CalledProcessError, FileNotFoundError):
-                            continue
-                    else:
-                        print(f"OpenInFileExplorer: No suitable file manager found on Linux")
-                        return ()
-                print(f"OpenInFileExplorer: Opened folder: {path}")
-            
-            if system not in ["windows", "darwin", "linux"]:
-                print(f"OpenInFileExplorer: Unsupported operating system: {system}")
-                return ()
-            
-        except Exception as e:
-            print(f"OpenInFileExplorer: Error opening path '{path}': {str(e)}")
+        # Files are revealed in their folder; the launch never waits for the file manager
+        is_file = os.path.isfile(path)
+        if not launch_explorer(path, reveal=is_file):
+            print("OpenInFileExplorer: No suitable file manager found")
+            return ()
+
+        if is_file:
+            print(f"OpenInFileExplorer: Opened folder containing file: {path}")
+        else:
+            print(f"OpenInFileExplorer: Opened folder: {path}")
         
         return ()
@@ -0,0 +1,192 @@
+"""
+Expansion and ordering of parameter sweeps.
+
+A sweep is an API-format prompt plus a list of axes, each naming a node input
+and the values it should take. The cartesian product of the axes gives one job
+per combination. ComfyUI only reuses a loader's output while its inputs stay
+the same from one prompt to the next, so the jobs are ordered with checkpoint
+axes varying slowest, then LoRA axes, then everything else. Each checkpoint
+and LoRA set is then loaded once for all the runs that use it.
+
+Load counts are reported for this order and for the naive nested-loop order
+of the axes as given (first axis slowest), to show how many loads the
+scheduling avoided.
+"""
+
+import copy
+import itertools
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .constants import GRID_MAX_JOBS
+from .prefetch import PREFETCH_NODE_INPUTS
+
+# Axis kinds by how expensive it is to change them between consecutive runs
+AXIS_CHECKPOINT = "checkpoint"
+AXIS_LORA = "lora"
+AXIS_OTHER = "other"
+
+_FOLDER_AXIS_KINDS = {"checkpoints": AXIS_CHECKPOINT, "loras": AXIS_LORA}
+
+# (node class, input) -> axis kind, beyond the file inputs known to the prefetcher
+SWITCH_INPUTS: Dict[Tuple[str, str], str] = {
+    ("ExtendedLoadCheckpoint", "load_mode"): AXIS_CHECKPOINT,
+    ("SDParameterGenerator", "vae_name"): AXIS_CHECKPOINT,
+    ("SDParameterGenerator", "config_name"): AXIS_CHECKPOINT,
+    ("CheckpointLoaderSimple", "ckpt_name"): AXIS_CHECKPOINT,
+    ("ExtendedLoadLoRA", "strength_model"): AXIS_LORA,
+    ("ExtendedLoRAStack", "lora_stack"): AXIS_LORA,
+    ("LoraLoader", "lora_name"): AXIS_LORA,
+    ("LoraLoader", "strength_model"): AXIS_LORA,
+    ("LoraLoader", "strength_clip"): AXIS_LORA,
+}
+for _class_type, _inputs in PREFETCH_NODE_INPUTS.items():
+    for _input_name, _folder_name in _inputs.items():
+        SWITCH_INPUTS[(_class_type, _input_name)] = _FOLDER_AXIS_KINDS[_folder_name]
+
+_AXIS_ORDER = {AXIS_CHECKPOINT: 0, AXIS_LORA: 1, AXIS_OTHER: 2}
+
+
+def parse_axes(prompt: Dict[str, Any], axes: Any) -> List[Dict[str, Any]]:
+    """
+    Validate sweep axes against a prompt and classify them.
+
+    Args:
+        prompt: API-format prompt used as the template
+        axes: List of {"node_id", "input", "values"} dictionaries
+
+    Returns:
+        Axes with an added "kind" (checkpoint, lora or other)
+
+    Raises:
+        ValueError: If an axis is malformed or does not match the prompt
+    """
+    if not isinstance(axes, list) or not axes:
+        raise ValueError("'axes' must be a non-empty list")
+
+    parsed = []
+    for axis in axes:
+        if not isinstance(axis, dict):
+            raise ValueError(f"Invalid axis: {axis}")
+        node_id = str(axis.get("node_id"))
+        input_name = axis.get("input")
+        values = axis.get("values")
+        node = prompt.get(node_id)
+        if not isinstance(node, dict):
+            raise ValueError(f"Node {node_id} not found in prompt")
+        if not isinstance(input_name, str) or not input_name:
+            raise ValueError(f"Missing input name for node {node_id}")
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Axis {node_id}.{input_name} needs a non-empty 'values' list")
+        kind = SWITCH_INPUTS.get((node.get("class_type", ""), input_name), AXIS_OTHER)
+        parsed.append({"node_id": node_id, "input": input_name, "values": values, "kind": kind})
+
+    job_count = 1
+    for axis in parsed:
+        job_count *= len(axis["values"])
+    if job_count > GRID_MAX_JOBS:
+        raise ValueError(f"Sweep expands to {job_count} jobs (at most {GRID_MAX_JOBS})")
+    return parsed
+
+
+def expand_jobs(axes: Sequence[Dict[str, Any]], order: Sequence[int]) -> List[Tuple[int, ...]]:
+    """
+    Enumerate every combination of axis value indices as a nested loop.
+
+    Args:
+        axes: Parsed axes
+        order: Axis indices from the outermost (slowest) loop to the innermost
+
+    Returns:
+        List of jobs, each a tuple with one value index per axis (in axis order)
+    """
+    jobs = []
+    for combination in itertools.product(*(range(len(axes[i]["values"])) for i in order)):
+        job = [0] * len(axes)
+        for axis_index, value_index in zip(order, combination):
+            job[axis_index] = value_index
+        jobs.append(tuple(job))
+    return jobs
+
+
+def scheduled_order(axes: Sequence[Dict[str, Any]]) -> List[int]:
+    """Axis loop order with checkpoint axes slowest, then LoRA axes, keeping the given order within a kind."""
+    return sorted(range(len(axes)), key=lambda i: _AXIS_ORDER[axes[i]["kind"]])
+
+
+def count_loads(axes: Sequence[Dict[str, Any]], jobs: Sequence[Tuple[int, ...]]) -> Dict[str, int]:
+    """
+    Count checkpoint and LoRA (re)loads when jobs run in the given order.
+
+    A checkpoint load happens whenever a checkpoint axis value changes from the
+    previous job; a LoRA load whenever the checkpoint or a LoRA axis value changes.
+
+    Args:
+        axes: Parsed axes
+        jobs: Jobs in execution order
+
+    Returns:
+        Dictionary with "checkpoint" and "lora" load counts
+    """
+    checkpoint_axes = [i for i, axis in enumerate(axes) if axis["kind"] == AXIS_CHECKPOINT]
+    lora_axes = checkpoint_axes + [i for i, axis in enumerate(axes) if axis["kind"] == AXIS_LORA]
+    loads = {"checkpoint": 0, "lora": 0}
+    previous = None
+    for job in jobs:
+        if previous is None or any(job[i] != previous[i] for i in checkpoint_axes):
+            loads["checkpoint"] += 1
+        if any(axis["kind"] == AXIS_LORA for axis in axes) and (
+            previous is None or any(job[i] != previous[i] for i in lora_axes)
+        ):
+            loads["lora"] += 1
+        previous = job
+    return loads
+
+
+def build_prompt(prompt: Dict[str, Any], axes: Sequence[Dict[str, Any]], job: Tuple[int, ...]) -> Dict[str, Any]:
+    """
+    Create the prompt of one job by setting every axis input to its value.
+
+    Args:
+        prompt: API-format template prompt
+        axes: Parsed axes
+        job: Value index per axis
+
+    Returns:
+        New API-format prompt
+    """
+    job_prompt = copy.deepcopy(prompt)
+    for axis, value_index in zip(axes, job):
+        job_prompt[axis["node_id"]].setdefault("inputs", {})[axis["input"]] = axis["values"][value_index]
+    return job_prompt
+
+
+def plan_sweep(prompt: Dict[str, Any], axes: Any) -> Dict[str, Any]:
+    """
+    Expand a sweep into ordered job prompts and compare load counts with naive ordering.
+
+    Args:
+        prompt: API-format template prompt
+        axes: List of {"node_id", "input", "values"} dictionaries
+
+    Returns:
+        Dictionary with "prompts" (in submission order), "jobs" (axis values per job)
+        and "loads" (naive, scheduled and avoided counts)
+    """
+    parsed = parse_axes(prompt, axes)
+    naive_jobs = expand_jobs(parsed, list(range(len(parsed))))
+    jobs = expand_jobs(parsed, scheduled_order(parsed))
+
+    naive_loads = count_loads(parsed, naive_jobs)
+    scheduled_loads = count_loads(parsed, jobs)
+    return {
+        "prompts": [build_prompt(prompt, parsed, job) for job in jobs],
+        "jobs": [
+            {f"{axis['node_id']}.{axis['input']}": axis["values"][i] for axis, i in zip(parsed, job)}
+            for job in jobs
+        ],
+        "loads": {
+            "naive": naive_loads,
+            "scheduled": scheduled_loads,
+            "avoided": sum(naive_loads.values()) - sum(scheduled_loads.values()),
+        },
+    }
@@ -0,0 +1,214 @@
+"""
+Background prefetching of model files referenced by queued prompts.
+
+While the current prompt samples, the prefetcher looks at the pending prompts in
+the PromptServer queue, collects the checkpoint and LoRA files that nodes from
+this package are going to load, and reads them once on a worker thread so the
+next load is served from the OS page cache instead of disk.
+"""
+
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import folder_paths
+
+from .constants import (
+    PREFETCH_MAX_FILES_PER_SCAN,
+    PREFETCH_MAX_WORKERS,
+    PREFETCH_MIN_FREE_MEMORY,
+    PREFETCH_WARMED_HISTORY_SIZE,
+)
+
+try:
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover
+    psutil = None  # type: ignore
+
+# Node class -> {input name: model folder} for nodes whose file loads can be predicted
+PREFETCH_NODE_INPUTS: Dict[str, Dict[str, str]] = {
+    "ExtendedLoadCheckpoint": {"ckpt_name": "checkpoints"},
+    "SDParameterGenerator": {"ckpt_name": "checkpoints"},
+    "ExtendedLoadLoRA": {"lora_name": "loras"},
+}
+
+READ_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def find_upcoming_models(queued_prompts: Iterable[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Collect model files referenced by queued prompts, in queue order.
+
+    Args:
+        queued_prompts: API-format prompts of pending queue items
+
+    Returns:
+        De-duplicated list of (folder name, file name) pairs
+    """
+    upcoming: List[Tuple[str, str]] = []
+    for prompt in queued_prompts:
+        if not isinstance(prompt, dict):
+            continue
+        for node in prompt.values():
+            if not isinstance(node, dict):
+                continue
+            inputs_to_folders = PREFETCH_NODE_INPUTS.get(node.get("class_type", ""))
+            if not inputs_to_folders:
+                continue
+            inputs = node.get("inputs", {})
+            for input_name, folder_name in inputs_to_folders.items():
+                value = inputs.get(input_name)
+                # Linked inputs are [node_id, slot] and cannot be resolved before execution
+                if isinstance(value, str) and (folder_name, value) not in upcoming:
+                    upcoming.append((folder_name, value))
+    return upcoming
+
+
+class ModelPrefetcher:
+    """
+    Warms upcoming model files into the page cache on background threads.
+
+    Concurrency is capped by the worker pool size, and a file is only read
+    when the system keeps at least ``min_free_memory`` bytes available after it.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PREFETCH_MAX_WORKERS,
+        max_files_per_scan: int = PREFETCH_MAX_FILES_PER_SCAN,
+        min_free_memory: int = PREFETCH_MIN_FREE_MEMORY,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_files_per_scan = max_files_per_scan
+        self.min_free_memory = min_free_memory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight: set = set()
+        self._warmed: "OrderedDict[str, int]" = OrderedDict()
+        self._recent_loads: Deque[str] = deque(maxlen=4)
+        self._stats: Dict[str, int] = {
+            "scans": 0,
+            "warmed_files": 0,
+            "warmed_bytes": 0,
+            "skipped_memory": 0,
+            "errors": 0,
+            "hits": 0,
+            "misses": 0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="vibe-prefetch")
+        return self._executor
+
+    def record_load(self, path: str) -> bool:
+        """
+        Record that a node is loading a model file and update hit statistics.
+
+        Args:
+            path: Full path of the file being loaded
+
+        Returns:
+            True if the file had been prefetched
+        """
+        with self._lock:
+            hit = self._warmed.pop(path, None) is not None
+            self._stats["hits" if hit else "misses"] += 1
+            self._recent_loads.append(path)
+        return hit
+
+    def schedule(self) -> None:
+        """Scan the prompt queue and warm upcoming files without blocking the caller."""
+        if self.max_workers <= 0:
+            return
+        self._get_executor().submit(self._scan_queue)
+
+    def _scan_queue(self) -> None:
+        queued_prompts = self._get_queued_prompts()
+        with self._lock:
+            self._stats["scans"] += 1
+
+        scheduled = 0
+        for folder_name, file_name in find_upcoming_models(queued_prompts):
+            if scheduled >= self.max_files_per_scan:
+                break
+            path = folder_paths.get_full_path(folder_name, file_name)
+            if path is None:
+                continue
+            with self._lock:
+                if path in self._in_flight or path in self._warmed or path in self._recent_loads:
+                    continue
+                self._in_flight.add(path)
+            scheduled += 1
+            self._get_executor().submit(self._warm_file, path)
+
+    @staticmethod
+    def _get_queued_prompts() -> List[Dict[str, Any]]:
+        try:
+            from server import PromptServer
+        except ImportError:
+            return []
+
+        prompt_queue = getattr(PromptServer.instance, "prompt_queue", None)
+        if prompt_queue is None:
+            return []
+        get_queue = getattr(prompt_queue, "get_current_queue_volatile", None) or prompt_queue.get_current_queue
+        _, queued = get_queue()
+        # Queue items are (number, prompt_id, prompt, extra_data, outputs_to_execute, ...)
+        return [item[2] for item in sorted(queued, key=lambda item: item[0])]
+
+    def _has_memory_for(self, size: int) -> bool:
+        if psutil is None:
+            return True
+        return psutil.virtual_memory().available - size >= self.min_free_memory
+
+    def _warm_file(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            if not self._has_memory_for(size):
+                with self._lock:
+                    self._stats["skipped_memory"] += 1
+                return
+
+            with open(path, "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                buffer = bytearray(READ_CHUNK_SIZE)
+                while f.readinto(buffer):
+                    pass
+
+            with self._lock:
+                self._warmed[path] = size
+                # Forget the oldest entries; the page cache will have evicted them anyway
+                while len(self._warmed) > PREFETCH_WARMED_HISTORY_SIZE:
+                    self._warmed.popitem(last=False)
+                self._stats["warmed_files"] += 1
+                self._stats["warmed_bytes"] += size
+        except OSError as e:
+            print(f"ModelPrefetcher: Failed to prefetch {path}: {e}")
+            with self._lock:
+                self._stats["errors"] += 1
+        finally:
+            with self._lock:
+                self._in_flight.discard(path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the prefetch statistics.
+
+        Returns:
+            Dictionary of counters plus the hit rate and the currently warmed files
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            loads = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / loads if loads else 0.0
+            stats["in_flight"] = sorted(self._in_flight)
+            stats["warmed"] = list(self._warmed)
+        return stats
+
+
+# Process-wide prefetcher shared by all nodes
+PREFETCHER = ModelPrefetcher()
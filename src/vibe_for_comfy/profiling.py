@@ -0,0 +1,190 @@
+"""
+Phase and per-step timing of ExtendedKSampler runs.
+
+Each run records the wall time of prompt encoding, sampling and VAE decoding
+plus the duration of every sampler step (taken from the sampler callback).
+Progress is pushed to the browser on the ``vibe-for-comfy-feedback`` event
+channel while sampling, and finished runs are kept in a ring buffer that the
+``/vibe_for_comfy/profile`` route returns.
+
+The first step interval also contains model loading and sampler setup, so
+it/s is computed from the remaining steps and the first interval is reported
+separately.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from .constants import PROFILE_FEEDBACK_INTERVAL, PROFILE_HISTORY_SIZE
+from .fused_lora_cache import CHECKPOINT_OPTION_KEY
+from .metrics import SAMPLER_PHASE_SECONDS, SAMPLER_STEP_SECONDS
+
+FEEDBACK_EVENT = "vibe-for-comfy-feedback"
+
+
+def send_feedback(node_id: Optional[str], payload: Dict[str, Any]) -> None:
+    """
+    Push a message to the frontend on the feedback event channel.
+
+    Args:
+        node_id: Id of the node the message belongs to
+        payload: Extra fields merged into the event data
+    """
+    if node_id is None:
+        return
+    try:
+        from server import PromptServer
+        PromptServer.instance.send_sync(FEEDBACK_EVENT, {"node_id": node_id, **payload})
+    except Exception:
+        # No server (tests, scripts) or the client went away; timing still gets recorded
+        pass
+
+
+class RunProfile:
+    """
+    Timing record of a single sampler run.
+    """
+
+    def __init__(self, node_id: Optional[str], info: Dict[str, Any]) -> None:
+        self.node_id = node_id
+        self.info = info
+        self.started_at = time.time()
+        self.phases: Dict[str, float] = {}
+        self.step_times: List[float] = []
+        self._start = time.perf_counter()
+        self._last_step: Optional[float] = None
+        self._last_feedback = 0.0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a named phase (encode, sample, decode)."""
+        start = time.perf_counter()
+        if name == "sample":
+            self._last_step = start
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def step(self, step: int, total_steps: int) -> None:
+        """
+        Record the end of a sampler step.
+
+        Args:
+            step: Index of the finished step
+            total_steps: Total number of steps
+        """
+        now = time.perf_counter()
+        if self._last_step is not None:
+            self.step_times.append(now - self._last_step)
+        self._last_step = now
+
+        if now - self._last_feedback >= PROFILE_FEEDBACK_INTERVAL or step + 1 >= total_steps:
+            self._last_feedback = now
+            send_feedback(self.node_id, {"profile": {
+                "step": step + 1,
+                "total_steps": total_steps,
+                "it_per_sec": self.it_per_sec(),
+            }})
+
+    def wrap_callback(self, callback: Optional[Callable[..., Any]]) -> Callable[..., Any]:
+        """
+        Wrap a sampler callback so every call also records a step.
+
+        Args:
+            callback: Original callback (step, x0, x, total_steps), e.g. the preview callback
+
+        Returns:
+            Callback with the same signature
+        """
+        def profiled_callback(step: int, x0: Any, x: Any, total_steps: int) -> None:
+            self.step(step, total_steps)
+            if callback is not None:
+                callback(step, x0, x, total_steps)
+
+        return profiled_callback
+
+    def it_per_sec(self) -> Optional[float]:
+        """Steady-state sampler speed, excluding the first (setup) step."""
+        steady = self.step_times[1:]
+        if not steady:
+            return None
+        return len(steady) / sum(steady) if sum(steady) > 0 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the run for the ring buffer and the route."""
+        return {
+            "node_id": self.node_id,
+            "started_at": self.started_at,
+            **self.info,
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "first_step": round(self.step_times[0], 4) if self.step_times else None,
+            "step_times": [round(seconds, 4) for seconds in self.step_times],
+            "it_per_sec": self.it_per_sec(),
+            "total": round(time.perf_counter() - self._start, 4),
+        }
+
+
+class SamplerProfiler:
+    """
+    Ring buffer of recent run profiles.
+    """
+
+    def __init__(self, history_size: int = PROFILE_HISTORY_SIZE) -> None:
+        self._runs: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def start_run(self, node_id: Optional[str], model: Any, **info: Any) -> RunProfile:
+        """
+        Begin profiling a run.
+
+        Args:
+            node_id: Id of the sampler node
+            model: MODEL being sampled (its checkpoint tag identifies it in the history)
+            **info: Run settings to store with the timings (sampler, steps, batch size, ...)
+
+        Returns:
+            RunProfile to time the phases with
+        """
+        model_options = getattr(model, "model_options", {})
+        info["model"] = model_options.get(CHECKPOINT_OPTION_KEY) or type(getattr(model, "model", model)).__name__
+        return RunProfile(node_id, info)
+
+    def finish_run(self, run: RunProfile) -> Dict[str, Any]:
+        """
+        Store a finished run and send its summary to the frontend.
+
+        Args:
+            run: Profile of the finished run
+
+        Returns:
+            The stored run record
+        """
+        record = run.to_dict()
+        with self._lock:
+            self._runs.append(record)
+        # Observed once per run rather than per step, keeping the sampler callback cheap
+        for name, seconds in run.phases.items():
+            SAMPLER_PHASE_SECONDS.observe(seconds, phase=name)
+        for seconds in run.step_times[1:]:
+            SAMPLER_STEP_SECONDS.observe(seconds)
+        send_feedback(run.node_id, {"profile": {
+            "done": True,
+            "phases": record["phases"],
+            "it_per_sec": record["it_per_sec"],
+            "total": record["total"],
+        }})
+        return record
+
+    def get_runs(self, limit: int = PROFILE_HISTORY_SIZE) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` most recent runs, newest first."""
+        with self._lock:
+            runs = list(self._runs)
+        return runs[::-1][:max(0, limit)]
+
+
+# Process-wide run history
+PROFILER = SamplerProfiler()
@@ -0,0 +1,103 @@
+"""
+Batched encoding of a positive/negative prompt pair.
+
+``CLIPTextEncode`` runs one text-encoder forward pass per prompt. When both
+prompts tokenize to a single, unweighted chunk of the same length, they can go
+through the encoder together as a batch of two and be split back afterwards,
+including the pooled outputs. This matches what ``encode_token_weights`` does
+for a single chunk, so the result equals two separate encodes.
+
+Only the SD1/SD2-style single text encoder and the SDXL dual (L + G) encoder
+are batched. Every other case returns None so the caller can fall back to
+the regular per-prompt encode. ExtendedKSampler only takes this path when
+``batch_prompt_encoding`` is switched on (it is off by default).
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import torch
+import comfy.model_management
+
+
+def _single_chunk_tokens(token_weight_pairs: List[List[Tuple[Any, ...]]]) -> Optional[List[Any]]:
+    # Multi-chunk prompts are concatenated along the sequence axis, and weighted
+    # prompts are interpolated against an empty encode; neither can be batched here
+    if len(token_weight_pairs) != 1:
+        return None
+    chunk = token_weight_pairs[0]
+    if any(pair[1] != 1.0 for pair in chunk):
+        return None
+    return [pair[0] for pair in chunk]
+
+
+def _batch_tokens(encoder: Any, positive_pairs: Any, negative_pairs: Any) -> Optional[List[List[Any]]]:
+    positive_tokens = _single_chunk_tokens(positive_pairs)
+    negative_tokens = _single_chunk_tokens(negative_pairs)
+    if positive_tokens is None or negative_tokens is None or len(positive_tokens) != len(negative_tokens):
+        return None
+    if getattr(encoder, "return_attention_masks", False):
+        return None
+    return [positive_tokens, negative_tokens]
+
+
+def _split(out: torch.Tensor, pooled: Optional[torch.Tensor], index: int) -> List[Any]:
+    device = comfy.model_management.intermediate_device()
+    cond = out[index:index + 1].to(device)
+    pooled_output = pooled[index:index + 1].to(device) if pooled is not None else None
+    return [[cond, {"pooled_output": pooled_output}]]
+
+
+def encode_prompt_pair(clip: Any, positive: str, negative: str) -> Optional[Tuple[List[Any], List[Any]]]:
+    """
+    Encode a positive and a negative prompt in a single text-encoder call.
+
+    Args:
+        clip: CLIP object
+        positive: Positive prompt text
+        negative: Negative prompt text
+
+    Returns:
+        Tuple of (positive CONDITIONING, negative CONDITIONING), or None if the
+        prompts or the text encoder do not allow batching
+    """
+    if getattr(clip, "use_clip_schedule", False) or getattr(clip, "apply_hooks_to_conds", None):
+        return None
+
+    model = clip.cond_stage_model
+    positive_tokens = clip.tokenize(positive)
+    negative_tokens = clip.tokenize(negative)
+
+    # Same preparation as CLIP.encode_from_tokens
+    model.reset_clip_options()
+    if clip.layer_idx is not None:
+        model.set_clip_options({"layer": clip.layer_idx})
+    clip.load_model()
+    # reset_clip_options cleared the device; with lowvram/partial loading the weights may live elsewhere
+    model.set_clip_options({"execution_device": clip.patcher.load_device})
+
+    encoder_name = getattr(model, "clip", None)
+    clip_name = getattr(model, "clip_name", None)
+    if isinstance(encoder_name, str) and clip_name in positive_tokens and len(positive_tokens) == 1:
+        # SD1ClipModel-style wrapper around a single text encoder
+        encoder = getattr(model, encoder_name)
+        batch = _batch_tokens(encoder, positive_tokens[clip_name], negative_tokens[clip_name])
+        if batch is None:
+            return None
+        out, pooled = encoder.encode(batch)[:2]
+
+    elif hasattr(model, "clip_l") and hasattr(model, "clip_g") and set(positive_tokens) == {"l", "g"}:
+        # SDXLClipModel: concatenated L and G hidden states, pooled output from G
+        batch_l = _batch_tokens(model.clip_l, positive_tokens["l"], negative_tokens["l"])
+        batch_g = _batch_tokens(model.clip_g, positive_tokens["g"], negative_tokens["g"])
+        if batch_l is None or batch_g is None:
+            return None
+        out_l = model.clip_l.encode(batch_l)[0]
+        out_g, pooled = model.clip_g.encode(batch_g)[:2]
+        cut_to = min(out_l.shape[1], out_g.shape[1])
+        out = torch.cat([out_l[:, :cut_to], out_g[:, :cut_to]], dim=-1)
+
+    else:
+        return None
+
+    return _split(out, pooled, 0), _split(out, pooled, 1)
+
@@ -0,0 +1,131 @@
+"""
+Background rebuild of the package's file catalogs and caches.
+
+The Refresh button in the ComfyUI menu triggers an incremental rebuild:
+
+- the file catalog re-checks the model folders and the input directory,
+  rescanning only directories whose mtime changed, and reports added/removed files
+- the safetensors header index re-parses only files whose size/mtime fingerprint changed
+- newly added model files are hashed into the hash cache
+- index and hash entries of deleted files are dropped
+
+The work runs on a single background thread; clicks while a rebuild is running
+join the running job instead of starting another. Completion is pushed to the
+browser with a ``vibe-for-comfy-refresh`` event.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import folder_paths
+
+from .constants import REFRESH_JOB_HISTORY_SIZE
+from .file_catalog import FILE_CATALOG
+from .hash_cache import HASH_CACHE
+from .model_index import INDEXED_FOLDERS, MODEL_INDEX
+
+REFRESH_EVENT = "vibe-for-comfy-refresh"
+
+
+def rebuild_catalogs(hash_new_files: bool = True) -> Dict[str, Any]:
+    """
+    Incrementally refresh the file catalog, header index and hash cache.
+
+    Args:
+        hash_new_files: Compute hashes of newly added model files
+
+    Returns:
+        Summary with the added/removed files per folder and cache counters
+    """
+    changes: Dict[str, Dict[str, Any]] = {}
+    for folder_name, (added, removed) in FILE_CATALOG.refresh(INDEXED_FOLDERS).items():
+        changes[folder_name] = {"added": added, "removed": removed}
+    added_inputs, removed_inputs = FILE_CATALOG.refresh_input_files()
+    changes["input"] = {"added": added_inputs, "removed": removed_inputs}
+
+    # Unchanged fingerprints are served from the index, so only new or modified files are parsed
+    indexed = MODEL_INDEX.scan(INDEXED_FOLDERS)
+
+    hashed = 0
+    if hash_new_files:
+        for folder_name in INDEXED_FOLDERS:
+            for file_name in changes[folder_name]["added"]:
+                path = folder_paths.get_full_path(folder_name, file_name)
+                if path is not None:
+                    HASH_CACHE.get_or_compute(path)
+                    hashed += 1
+
+    return {
+        "changes": changes,
+        "indexed": {folder_name: len(entries) for folder_name, entries in indexed.items()},
+        "hashed": hashed,
+        "pruned": {"index": MODEL_INDEX.prune(), "hashes": HASH_CACHE.prune()},
+    }
+
+
+class RefreshJobs:
+    """
+    Runs catalog rebuilds on a background thread and tracks their status by job id.
+    """
+
+    def __init__(self, history_size: int = REFRESH_JOB_HISTORY_SIZE) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vibe_refresh")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._running: Optional[str] = None
+        self._history_size = history_size
+        self._lock = threading.Lock()
+
+    def start(self, hash_new_files: bool = True) -> str:
+        """
+        Start a rebuild, or join the one already running.
+
+        Args:
+            hash_new_files: Compute hashes of newly added model files
+
+        Returns:
+            Job id
+        """
+        with self._lock:
+            if self._running is not None:
+                return self._running
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {"job_id": job_id, "status": "running", "started_at": time.time()}
+            self._running = job_id
+            # Keep only the most recent jobs
+            for old_id in list(self._jobs)[:-self._history_size]:
+                del self._jobs[old_id]
+        self._executor.submit(self._run, job_id, hash_new_files)
+        return job_id
+
+    def _run(self, job_id: str, hash_new_files: bool) -> None:
+        try:
+            update: Dict[str, Any] = {"status": "done", "result": rebuild_catalogs(hash_new_files)}
+        except Exception as e:
+            print(f"RefreshJobs: Rebuild failed: {e}")
+            update = {"status": "error", "error": str(e)}
+        update["finished_at"] = time.time()
+
+        with self._lock:
+            job = self._jobs.setdefault(job_id, {"job_id": job_id})
+            job.update(update)
+            self._running = None
+            event = dict(job)
+
+        try:
+            from server import PromptServer
+            PromptServer.instance.send_sync(REFRESH_EVENT, event)
+        except Exception:
+            pass
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the status record of a job, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+
+# Process-wide refresh job runner
+REFRESH_JOBS = RefreshJobs()
@@ -0,0 +1,248 @@
+"""
+Disk cache of ExtendedKSampler results keyed by the full generation recipe.
+
+Retries, shared presets and overlapping grids requeue generations that were
+already computed. The recipe of a run (checkpoint, LoRA set and strengths,
+CLIP identity, prompts, seeds, sampler settings, execution profile and a
+fingerprint of the input latent) is canonicalized to JSON and hashed. The
+sampled latent, and optionally the decoded images, are stored under that hash
+as a safetensors file in a size-capped LRU directory, so an exact match is
+returned without sampling.
+
+Only models loaded by ExtendedLoadCheckpoint whose patches all come from the
+package's LoRA nodes can be keyed; anything else (weight or object patches or
+model options added by other nodes) is never cached.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+import safetensors.torch
+
+from .cache_utils import evict_lru_files, get_cache_directory
+from .constants import RESULT_CACHE_MAX_BYTES
+from .fused_lora_cache import CHECKPOINT_OPTION_KEY, LORA_SET_OPTION_KEY, PATCH_COUNT_OPTION_KEY, has_foreign_patches
+from .safetensors_utils import load_safetensors_mmap
+
+RESULT_CACHE_MODES = ["off", "latent", "latent+image"]
+
+# model_options entries that don't change what the model computes
+_NEUTRAL_OPTION_KEYS = {CHECKPOINT_OPTION_KEY, LORA_SET_OPTION_KEY, PATCH_COUNT_OPTION_KEY, "transformer_options"}
+
+
+def _model_identity(model: Any) -> Optional[Dict[str, Any]]:
+    options = model.model_options
+    checkpoint = options.get(CHECKPOINT_OPTION_KEY)
+    lora_set = options.get(LORA_SET_OPTION_KEY, [])
+    # Object patches (e.g. a shifted model_sampling) and unrecorded weight patches change the output
+    if not checkpoint or model.object_patches or has_foreign_patches(model):
+        return None
+    if any(options[key] for key in options if key not in _NEUTRAL_OPTION_KEYS) or options.get("transformer_options"):
+        return None
+    return {"checkpoint": checkpoint, "loras": lora_set}
+
+
+def _patcher_identity(patcher: Any) -> Optional[str]:
+    if patcher is None or patcher.patches or patcher.object_patches:
+        return None
+    return patcher.model_options.get(CHECKPOINT_OPTION_KEY)
+
+
+def tensor_fingerprint(tensor: torch.Tensor) -> str:
+    """
+    Hash the shape, dtype and contents of a tensor.
+
+    Args:
+        tensor: Tensor to fingerprint
+
+    Returns:
+        SHA-256 hex digest
+    """
+    data = tensor.detach().to("cpu").contiguous()
+    sha256 = hashlib.sha256(f"{data.dtype}{list(data.shape)}".encode("utf-8"))
+    sha256.update(data.view(torch.uint8).numpy().tobytes() if data.numel() else b"")
+    return sha256.hexdigest()
+
+
+def latent_fingerprint(latent: Dict[str, Any]) -> str:
+    """
+    Fingerprint a LATENT dictionary (samples, noise mask and batch indices).
+
+    Args:
+        latent: LATENT dictionary
+
+    Returns:
+        SHA-256 hex digest
+    """
+    parts = [tensor_fingerprint(latent["samples"])]
+    if latent.get("noise_mask") is not None:
+        parts.append(tensor_fingerprint(latent["noise_mask"]))
+    if latent.get("batch_index") is not None:
+        parts.append(json.dumps(list(latent["batch_index"])))
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def build_recipe(
+    model: Any,
+    clip: Any,
+    positive_prompt: str,
+    negative_prompt: str,
+    seeds: List[int],
+    steps: int,
+    cfg: float,
+    sampler_name: str,
+    scheduler: str,
+    denoise: float,
+    latent: Dict[str, Any],
+    execution_mode: str = "default",
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the canonical recipe of a sampler run.
+
+    Args:
+        model: MODEL to sample with
+        clip: CLIP used to encode the prompts
+        positive_prompt: Positive prompt text
+        negative_prompt: Negative prompt text
+        seeds: Seeds of the run
+        steps: Sampling steps
+        cfg: CFG scale
+        sampler_name: Sampler name
+        scheduler: Scheduler name
+        denoise: Denoise strength
+        latent: Input LATENT dictionary
+        execution_mode: Execution profile the model runs with (bf16 autocast changes the result)
+
+    Returns:
+        Recipe dictionary, or None if the model or CLIP cannot be identified
+    """
+    model_identity = _model_identity(model)
+    clip_identity = _patcher_identity(getattr(clip, "patcher", None))
+    if model_identity is None or clip_identity is None or getattr(clip, "use_clip_schedule", False):
+        return None
+    return {
+        "model": model_identity,
+        "clip": [clip_identity, getattr(clip, "layer_idx", None)],
+        "positive": positive_prompt,
+        "negative": negative_prompt,
+        "seeds": list(seeds),
+        "steps": steps,
+        "cfg": float(cfg),
+        "sampler_name": sampler_name,
+        "scheduler": scheduler,
+        "denoise": float(denoise),
+        "latent": latent_fingerprint(latent),
+        "execution_mode": execution_mode,
+    }
+
+
+def recipe_key(recipe: Dict[str, Any]) -> str:
+    """Hash a recipe's canonical JSON form."""
+    return hashlib.sha256(json.dumps(recipe, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def image_variant(vae: Any, decode_mode: str) -> Optional[str]:
+    """
+    Identify how images were decoded, so cached images are only reused for the same VAE and mode.
+
+    Args:
+        vae: VAE object
+        decode_mode: ExtendedKSampler decode mode
+
+    Returns:
+        Variant string, or None when decoded images should not be cached
+    """
+    if decode_mode == "none":
+        return None
+    if decode_mode == "preview":
+        return "preview"
+    vae_identity = _patcher_identity(getattr(vae, "patcher", None))
+    return f"full:{vae_identity}" if vae_identity else None
+
+
+class ResultCache:
+    """
+    Size-capped on-disk LRU of sampled latents and decoded images.
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(get_cache_directory("results"), f"{key}.safetensors")
+
+    def get(self, key: str, variant: Optional[str]) -> Optional[Tuple[torch.Tensor, Optional[torch.Tensor]]]:
+        """
+        Look up a stored result.
+
+        Args:
+            key: Recipe key
+            variant: Image variant the caller would decode, or None
+
+        Returns:
+            Tuple of (latent samples, images or None when not stored for this variant), or None on a miss
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        with safetensors.safe_open(path, framework="pt") as f:
+            metadata = f.metadata() or {}
+        # Copy-on-write mapping: pages are read on first access and never written back
+        tensors = load_safetensors_mmap(path)
+        images = tensors.get("images") if variant and metadata.get("image_variant") == variant else None
+        self.hits += 1
+        return tensors["samples"], images
+
+    def put(
+        self,
+        key: str,
+        recipe: Dict[str, Any],
+        samples: torch.Tensor,
+        images: Optional[torch.Tensor] = None,
+        variant: Optional[str] = None,
+    ) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Recipe key
+            recipe: Recipe, stored as metadata for inspection
+            samples: Sampled latent tensor
+            images: Decoded images to store along with the latent
+            variant: Image variant of the images
+        """
+        tensors = {"samples": samples.detach().to("cpu").contiguous()}
+        metadata = {"recipe": json.dumps(recipe, sort_keys=True)}
+        if images is not None and variant:
+            tensors["images"] = images.detach().to("cpu").contiguous()
+            metadata["image_variant"] = variant
+
+        path = self._path(key)
+        with self._lock:
+            tmp_path = f"{path}.tmp"
+            safetensors.torch.save_file(tensors, tmp_path, metadata=metadata)
+            os.replace(tmp_path, path)
+            evict_lru_files(os.path.dirname(path), self.max_bytes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Process-wide result cache
+RESULT_CACHE = ResultCache()
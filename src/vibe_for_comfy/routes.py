@@ -1,32 +1,30 @@
 """
 Backend routes for the vibe_for_comfy package.
+
+Routes are registered while ComfyUI imports the package, so this module only
+imports lightweight helpers at the top. Handlers import the caches, indexes
+and loaders they serve (which pull in torch, PIL and comfy) on first request.
 """
 
+import asyncio
 import os
-import sys
-import subprocess
-from typing import Dict, Any
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
 from aiohttp import web
 
-from .constants import FOLDER_MAP, API_ENDPOINTS
-
-
-def open_folder_in_explorer(path: str) -> None:
-    """
-    Open a folder in the system's default file explorer.
-    
-    Args:
-        path: The path to the folder to open
-        
-    Raises:
-        OSError: If the folder cannot be opened
-    """
-    if sys.platform.startswith("win"):
-        os.startfile(path)  # type: ignore[attr-defined]
-    elif sys.platform == "darwin":
-        subprocess.Popen(["open", path])
-    else:
-        subprocess.Popen(["xdg-open", path])
+from .constants import (
+    API_ENDPOINTS,
+    FOLDER_MAP,
+    GALLERY_MAX_PAGE_SIZE,
+    GALLERY_PAGE_SIZE,
+    GALLERY_THUMBNAIL_MAX_SIZE,
+    GALLERY_THUMBNAIL_SIZE,
+)
+from .launcher import launch_explorer_async
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, METRICS
 
 
 async def open_folder_handler(request: web.Request) -> web.Response:
@@ -56,7 +54,11 @@ async def open_folder_handler(request: web.Request) -> web.Response:
                 status=400
             )
             
-        open_folder_in_explorer(path)
+        if not await launch_explorer_async(path):
+            return web.json_response(
+                {"success": False, "error": "No file manager available"},
+                status=500
+            )
         return web.json_response({"success": True})
         
     except Exception as e:
@@ -66,6 +68,504 @@ async def open_folder_handler(request: web.Request) -> web.Response:
         )
 
 
+async def prefetch_stats_handler(request: web.Request) -> web.Response:
+    """
+    Report hit-rate statistics of the background model prefetcher.
+    
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with the prefetch counters
+    """
+    from .prefetch import PREFETCHER
+
+    return web.json_response({"success": True, "stats": PREFETCHER.get_stats()})
+
+
+def _cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Collect the statistics of the in-process caches."""
+    from .conditioning_cache import CONDITIONING_CACHE
+    from .fused_lora_cache import FUSED_LORA_CACHE
+    from .lora_cache import LORA_CACHE
+    from .result_cache import RESULT_CACHE
+
+    return {
+        "lora": LORA_CACHE.get_stats(),
+        "fused_lora": FUSED_LORA_CACHE.get_stats(),
+        "conditioning": CONDITIONING_CACHE.get_stats(),
+        "results": RESULT_CACHE.get_stats(),
+    }
+
+
+async def cache_stats_handler(request: web.Request) -> web.Response:
+    """
+    Report memory usage and hit/miss counters of the in-process caches.
+    
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with per-cache statistics
+    """
+    return web.json_response({"success": True, "caches": _cache_stats()})
+
+
+def collect_cache_metrics() -> List[Tuple[str, str, str, List[Tuple[Dict[str, Any], float]]]]:
+    """
+    Report the hit/miss counters and memory usage of the in-process caches at scrape time.
+    
+    Returns:
+        Metric families in the form expected by MetricsRegistry.register_collector
+    """
+    caches = _cache_stats()
+    families = [
+        ("vibe_cache_hits_total", "counter", "Cache lookups served from the cache", "hits"),
+        ("vibe_cache_misses_total", "counter", "Cache lookups that missed", "misses"),
+        ("vibe_cache_bytes", "gauge", "Bytes held in memory by the cache", "bytes"),
+        ("vibe_cache_entries", "gauge", "Entries held in memory by the cache", "entries"),
+    ]
+    return [
+        (name, type_name, documentation, [
+            ({"cache": cache}, stats[field]) for cache, stats in caches.items() if field in stats
+        ])
+        for name, type_name, documentation, field in families
+    ]
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    """
+    Serve the package metrics in the Prometheus text exposition format.
+    
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        Plain text response for a Prometheus scraper
+    """
+    return web.Response(body=METRICS.render().encode("utf-8"), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
+
+async def profile_handler(request: web.Request) -> web.Response:
+    """
+    Return timing profiles of recent ExtendedKSampler runs, newest first.
+    
+    Query parameters:
+        limit: Maximum number of runs to return
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with the run profiles
+    """
+    try:
+        limit = int(request.query.get("limit", 20))
+    except ValueError:
+        return web.json_response(
+            {"success": False, "error": "Invalid 'limit' parameter"},
+            status=400
+        )
+    from .profiling import PROFILER
+
+    return web.json_response({"success": True, "runs": PROFILER.get_runs(limit)})
+
+
+async def model_info_handler(request: web.Request) -> web.Response:
+    """
+    Return safetensors header info for one model file or for whole model folders.
+    
+    Query parameters:
+        folder: Model folder ("checkpoints", "loras" or "embeddings"); all when omitted
+        name: File name inside the folder; the whole folder is indexed when omitted
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with the index entries
+    """
+    from .model_index import INDEXED_FOLDERS, MODEL_INDEX
+
+    folder = request.query.get("folder")
+    name = request.query.get("name")
+    if folder is not None and folder not in INDEXED_FOLDERS:
+        return web.json_response(
+            {"success": False, "error": f"Invalid folder: {folder}"},
+            status=400
+        )
+
+    loop = asyncio.get_running_loop()
+    try:
+        # Header parsing touches the disk; keep it off the event loop
+        if name:
+            if folder is None:
+                return web.json_response(
+                    {"success": False, "error": "Missing 'folder' parameter"},
+                    status=400
+                )
+            info = await loop.run_in_executor(None, MODEL_INDEX.get_info, folder, name)
+            if not info:
+                return web.json_response(
+                    {"success": False, "error": f"File not found: {name}"},
+                    status=404
+                )
+            return web.json_response({"success": True, "info": info})
+
+        folders = (folder,) if folder else INDEXED_FOLDERS
+        models = await loop.run_in_executor(None, MODEL_INDEX.scan, folders)
+        return web.json_response({"success": True, "models": models})
+
+    except Exception as e:
+        return web.json_response(
+            {"success": False, "error": str(e)},
+            status=500
+        )
+
+
+async def refresh_handler(request: web.Request) -> web.Response:
+    """
+    Start an incremental rebuild of the file catalogs, header index and hash cache.
+    
+    Returns immediately; completion is pushed as a "vibe-for-comfy-refresh" event.
+    
+    JSON body (optional):
+        hash_new_files: Hash newly added model files (default true)
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with the job id
+    """
+    try:
+        from .refresh import REFRESH_JOBS
+
+        data = await request.json() if request.can_read_body else {}
+        job_id = REFRESH_JOBS.start(bool(data.get("hash_new_files", True)))
+        return web.json_response({"success": True, "job_id": job_id})
+    except Exception as e:
+        return web.json_response(
+            {"success": False, "error": str(e)},
+            status=500
+        )
+
+
+async def refresh_status_handler(request: web.Request) -> web.Response:
+    """
+    Report the status of a refresh job.
+    
+    Query parameters:
+        job_id: Id returned by the refresh POST
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with the job status and, once done, its result
+    """
+    from .refresh import REFRESH_JOBS
+
+    job = REFRESH_JOBS.get(request.query.get("job_id", ""))
+    if job is None:
+        return web.json_response(
+            {"success": False, "error": "Unknown job id"},
+            status=404
+        )
+    return web.json_response({"success": True, "job": job})
+
+
+def file_response(request: web.Request, path: str) -> web.StreamResponse:
+    """
+    Serve a file with ETag revalidation, range requests and sendfile.
+    
+    Args:
+        request: The HTTP request (its If-None-Match header is honoured)
+        path: Full path of the file
+        
+    Returns:
+        304 response if the client's copy is current, otherwise a FileResponse
+    """
+    stat = os.stat(path)
+    # Same validator as aiohttp's own FileResponse, so both agree on every version
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("If-None-Match", "")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return web.Response(status=304, headers=headers)
+    # FileResponse handles Range/If-Range and uses sendfile where available
+    return web.FileResponse(path, headers=headers)
+
+
+async def gallery_handler(request: web.Request) -> web.Response:
+    """
+    List output images newest first, one page at a time.
+    
+    Query parameters:
+        cursor: next_cursor of the previous page (omit for the first page)
+        limit: Page size
+        subfolder: Only list images below this output subfolder
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with the page items, next_cursor and the total count
+    """
+    from .gallery import GALLERY_INDEX
+
+    try:
+        limit = min(int(request.query.get("limit", GALLERY_PAGE_SIZE)), GALLERY_MAX_PAGE_SIZE)
+    except ValueError:
+        return web.json_response(
+            {"success": False, "error": "Invalid 'limit' parameter"},
+            status=400
+        )
+    cursor = request.query.get("cursor") or None
+    subfolder = request.query.get("subfolder", "")
+
+    try:
+        # A refresh stats the output directories; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        page = await loop.run_in_executor(None, GALLERY_INDEX.get_page, cursor, limit, subfolder)
+    except ValueError as e:
+        return web.json_response({"success": False, "error": str(e)}, status=400)
+
+    for item in page["items"]:
+        query = urlencode({"path": item["path"]})
+        item["image_url"] = f"{API_ENDPOINTS['gallery_image']}?{query}"
+        item["thumbnail_url"] = f"{API_ENDPOINTS['gallery_thumbnail']}?{query}"
+    return web.json_response({"success": True, **page})
+
+
+async def gallery_image_handler(request: web.Request) -> web.StreamResponse:
+    """
+    Serve a full output image.
+    
+    Query parameters:
+        path: Image path relative to the output directory, as listed by the gallery
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        The image file, a 304 revalidation response or a 404 JSON error
+    """
+    from .gallery import GALLERY_INDEX
+
+    loop = asyncio.get_running_loop()
+    entry = await loop.run_in_executor(None, GALLERY_INDEX.get, request.query.get("path", ""))
+    if entry is None:
+        return web.json_response(
+            {"success": False, "error": "Image not found"},
+            status=404
+        )
+    try:
+        return file_response(request, entry[0])
+    except OSError:
+        return web.json_response(
+            {"success": False, "error": "Image not found"},
+            status=404
+        )
+
+
+async def gallery_thumbnail_handler(request: web.Request) -> web.StreamResponse:
+    """
+    Serve a cached thumbnail of an output image, rendering it on first use.
+    
+    Query parameters:
+        path: Image path relative to the output directory, as listed by the gallery
+        size: Maximum thumbnail edge in pixels
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        The WebP thumbnail, a 304 revalidation response or a JSON error
+    """
+    from .gallery import GALLERY_INDEX, THUMBNAIL_CACHE
+
+    try:
+        edge = int(request.query.get("size", GALLERY_THUMBNAIL_SIZE))
+    except ValueError:
+        return web.json_response(
+            {"success": False, "error": "Invalid 'size' parameter"},
+            status=400
+        )
+    edge = max(16, min(edge, GALLERY_THUMBNAIL_MAX_SIZE))
+
+    loop = asyncio.get_running_loop()
+    entry = await loop.run_in_executor(None, GALLERY_INDEX.get, request.query.get("path", ""))
+    if entry is None:
+        return web.json_response(
+            {"success": False, "error": "Image not found"},
+            status=404
+        )
+    try:
+        thumbnail_path = await loop.run_in_executor(None, THUMBNAIL_CACHE.get_path, *entry, edge)
+        return file_response(request, thumbnail_path)
+    except Exception as e:
+        return web.json_response(
+            {"success": False, "error": f"Cannot create thumbnail: {e}"},
+            status=500
+        )
+
+
+async def gallery_export_handler(request: web.Request) -> web.StreamResponse:
+    """
+    Stream a zip of output images with their metadata sidecars and a manifest.
+    
+    Query parameters:
+        subfolder: Output subfolder to export, e.g. a date folder
+        since: Only images modified at or after this Unix time
+        until: Only images modified before this Unix time
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        Chunked zip download, or a JSON error before streaming starts
+    """
+    from .gallery import GALLERY_INDEX
+    from .zip_export import ChunkedSink, write_archive
+
+    subfolder = request.query.get("subfolder", "").strip("/")
+    try:
+        since = float(request.query["since"]) if request.query.get("since") else None
+        until = float(request.query["until"]) if request.query.get("until") else None
+    except ValueError:
+        return web.json_response(
+            {"success": False, "error": "Invalid 'since' or 'until' parameter"},
+            status=400
+        )
+
+    loop = asyncio.get_running_loop()
+    entries = await loop.run_in_executor(None, GALLERY_INDEX.select, subfolder, since, until)
+    if not entries:
+        return web.json_response(
+            {"success": False, "error": "No images match the export query"},
+            status=404
+        )
+
+    archive_name = re.sub(r"[^\w.-]", "_", subfolder) or "outputs"
+    response = web.StreamResponse(headers={
+        "Content-Type": "application/zip",
+        "Content-Disposition": f'attachment; filename="{archive_name}.zip"',
+    })
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    def write_chunk(chunk: bytes) -> None:
+        # Blocks the archive thread until the event loop has sent the chunk, which bounds memory
+        asyncio.run_coroutine_threadsafe(response.write(chunk), loop).result()
+
+    query = {"subfolder": subfolder, "since": since, "until": until}
+    try:
+        await loop.run_in_executor(None, write_archive, ChunkedSink(write_chunk), entries, query)
+    except Exception as e:
+        # Headers are already sent; the client sees a truncated download
+        print(f"Gallery export: Aborted after a write error: {e}")
+        return response
+    await response.write_eof()
+    return response
+
+
+async def queue_prompt(prompt: Dict[str, Any], client_id: Any, extra_data: Any) -> Tuple[Optional[str], Any]:
+    """
+    Validate a prompt and put it on the ComfyUI queue in-process, like the core /prompt route.
+
+    Args:
+        prompt: API-format prompt
+        client_id: Client id to report progress to, or None
+        extra_data: extra_data of the queue item, or None
+
+    Returns:
+        Tuple of (prompt id, None) when queued, or (None, error details) when validation failed
+    """
+    import execution
+    from server import PromptServer
+
+    server = PromptServer.instance
+    # Lets other extensions' on_prompt handlers see (and rewrite) the job, as for /prompt
+    json_data = server.trigger_on_prompt({"prompt": prompt, "client_id": client_id, "extra_data": extra_data or {}})
+    prompt = json_data["prompt"]
+    extra_data = dict(json_data.get("extra_data") or {})
+    if json_data.get("client_id") is not None:
+        extra_data["client_id"] = json_data["client_id"]
+
+    prompt_id = str(uuid.uuid4())
+    valid = await execution.validate_prompt(prompt_id, prompt, None)
+    if not valid[0]:
+        return None, {"error": valid[1], "node_errors": valid[3]}
+
+    sensitive = {}
+    for key in getattr(execution, "SENSITIVE_EXTRA_DATA_KEYS", ()):
+        if key in extra_data:
+            sensitive[key] = extra_data.pop(key)
+    extra_data["create_time"] = int(time.time() * 1000)
+    number = server.number
+    server.number += 1
+    server.prompt_queue.put((number, prompt_id, prompt, extra_data, valid[2], sensitive))
+    return prompt_id, None
+
+
+async def grid_handler(request: web.Request) -> web.Response:
+    """
+    Expand a parameter sweep, order it to minimise model/LoRA switches and queue it.
+    
+    JSON body:
+        prompt: API-format prompt used as the template
+        axes: List of {"node_id", "input", "values"} to sweep
+        client_id: Optional client id passed on to the queued prompts
+        extra_data: Optional extra_data passed on to the queued prompts
+        dry_run: Only plan the sweep, don't queue anything
+        
+    Args:
+        request: The HTTP request
+        
+    Returns:
+        JSON response with the job list, queued prompt ids and load counts
+    """
+    from .parameter_grid import plan_sweep
+
+    try:
+        data = await request.json()
+        prompt = data.get("prompt")
+        if not isinstance(prompt, dict):
+            return web.json_response(
+                {"success": False, "error": "Missing 'prompt' parameter"},
+                status=400
+            )
+        try:
+            plan = plan_sweep(prompt, data.get("axes"))
+        except ValueError as e:
+            return web.json_response({"success": False, "error": str(e)}, status=400)
+
+        result: Dict[str, Any] = {"success": True, "jobs": plan["jobs"], "loads": plan["loads"]}
+        if data.get("dry_run"):
+            return web.json_response(result)
+
+        prompt_ids = []
+        errors = []
+        for index, job_prompt in enumerate(plan["prompts"]):
+            prompt_id, error = await queue_prompt(job_prompt, data.get("client_id"), data.get("extra_data"))
+            if prompt_id is not None:
+                prompt_ids.append(prompt_id)
+            else:
+                errors.append({"job": index, "error": error})
+
+        result.update({"prompt_ids": prompt_ids, "errors": errors})
+        return web.json_response(result)
+
+    except Exception as e:
+        return web.json_response(
+            {"success": False, "error": str(e)},
+            status=500
+        )
+
+
 def register_routes() -> None:
     """
     Register all backend routes with the ComfyUI server.
@@ -76,6 +576,19 @@ def register_routes() -> None:
         from server import PromptServer
         
         PromptServer.instance.routes.post(API_ENDPOINTS["open_folder"])(open_folder_handler)
+        PromptServer.instance.routes.post(API_ENDPOINTS["refresh"])(refresh_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["refresh"])(refresh_status_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["prefetch_stats"])(prefetch_stats_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["model_info"])(model_info_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["cache_stats"])(cache_stats_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["profile"])(profile_handler)
+        PromptServer.instance.routes.post(API_ENDPOINTS["grid"])(grid_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["metrics"])(metrics_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["gallery"])(gallery_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["gallery_image"])(gallery_image_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["gallery_thumbnail"])(gallery_thumbnail_handler)
+        PromptServer.instance.routes.get(API_ENDPOINTS["gallery_export"])(gallery_export_handler)
+        METRICS.register_collector(collect_cache_metrics)
         
     except ImportError:
         # In test or non-server contexts, importing PromptServer may fail
@@ -0,0 +1,189 @@
+"""
+Low-level helpers for reading ``.safetensors`` files without loading them eagerly.
+
+A safetensors file is an 8-byte little-endian header length, a JSON header that
+maps tensor names to dtype/shape/byte offsets, and the raw tensor data. The
+helpers here parse only the header, memory-map the data section so tensors
+are backed by the OS page cache and materialized page by page on first access,
+or read the file once while hashing it.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import torch
+
+# Refuse absurd header sizes instead of allocating them (the format caps it at 100MB)
+MAX_HEADER_SIZE = 100 * 1024 * 1024
+
+SAFETENSORS_DTYPES: Dict[str, torch.dtype] = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+if hasattr(torch, "float8_e4m3fn"):
+    SAFETENSORS_DTYPES["F8_E4M3"] = torch.float8_e4m3fn
+    SAFETENSORS_DTYPES["F8_E5M2"] = torch.float8_e5m2
+
+# State dict key prefixes of the text encoder and VAE inside full checkpoints
+CLIP_KEY_PREFIXES: Tuple[str, ...] = ("cond_stage_model.", "conditioner.", "text_encoders.")
+VAE_KEY_PREFIXES: Tuple[str, ...] = ("first_stage_model.", "vae.")
+
+
+def is_safetensors(path: str) -> bool:
+    """Return True if the path has a safetensors extension."""
+    return path.lower().endswith((".safetensors", ".sft"))
+
+
+def read_safetensors_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Parse only the JSON header of a safetensors file.
+
+    Args:
+        path: Path to the safetensors file
+
+    Returns:
+        Tuple of (header dictionary, byte offset where tensor data starts)
+
+    Raises:
+        ValueError: If the file does not look like a safetensors file
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(8)
+        if len(prefix) != 8:
+            raise ValueError(f"Not a safetensors file: {path}")
+        header_size = struct.unpack("<Q", prefix)[0]
+        if header_size > MAX_HEADER_SIZE:
+            raise ValueError(f"Safetensors header too large ({header_size} bytes): {path}")
+        header = json.loads(f.read(header_size))
+    if not isinstance(header, dict):
+        raise ValueError(f"Invalid safetensors header: {path}")
+    return header, 8 + header_size
+
+
+def tensors_from_buffer(
+    header: Dict[str, Any],
+    data_offset: int,
+    buffer: Any,
+    key_filter: Optional[Callable[[str], bool]] = None,
+) -> Dict[str, torch.Tensor]:
+    """
+    Create tensors that share memory with a buffer holding a safetensors file.
+
+    Args:
+        header: Parsed safetensors header
+        data_offset: Byte offset of the tensor data inside the buffer
+        buffer: Writable buffer (bytearray or copy-on-write mmap) with the whole file
+        key_filter: Optional predicate selecting which tensor names to include
+
+    Returns:
+        Dictionary mapping tensor names to CPU tensors backed by the buffer
+    """
+    state_dict: Dict[str, torch.Tensor] = {}
+    for key, info in header.items():
+        if key == "__metadata__":
+            continue
+        if key_filter is not None and not key_filter(key):
+            continue
+
+        dtype = SAFETENSORS_DTYPES.get(info["dtype"])
+        if dtype is None:
+            raise ValueError(f"Unsupported safetensors dtype {info['dtype']} for {key}")
+
+        shape = info["shape"]
+        begin, end = info["data_offsets"]
+        if end == begin:
+            state_dict[key] = torch.empty(shape, dtype=dtype)
+            continue
+
+        count = (end - begin) // torch.empty((), dtype=dtype).element_size()
+        tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=data_offset + begin)
+        state_dict[key] = tensor.reshape(shape)
+    return state_dict
+
+
+def load_safetensors_mmap(path: str, key_filter: Optional[Callable[[str], bool]] = None) -> Dict[str, torch.Tensor]:
+    """
+    Build a state dict whose tensors are views into a memory-mapped file.
+
+    The mapping is copy-on-write, so unmodified pages stay shared with other
+    processes through the page cache, and nothing is read from disk until a
+    tensor is actually touched. Tensors rejected by ``key_filter`` are never read.
+
+    Args:
+        path: Path to the safetensors file
+        key_filter: Optional predicate selecting which tensor names to include
+
+    Returns:
+        Dictionary mapping tensor names to CPU tensors backed by the mapping
+    """
+    header, data_offset = read_safetensors_header(path)
+    with open(path, "rb") as f:
+        # The mapping stays valid after the file is closed; tensors keep it alive
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    return tensors_from_buffer(header, data_offset, mapping, key_filter)
+
+
+def load_safetensors_hashed(path: str, chunk_size: int = 8 * 1024 * 1024) -> Tuple[Dict[str, torch.Tensor], str]:
+    """
+    Read a safetensors file once, hashing the bytes while they stream in.
+
+    Args:
+        path: Path to the safetensors file
+        chunk_size: Read size in bytes
+
+    Returns:
+        Tuple of (state dict backed by the read buffer, SHA-256 hex digest of the file)
+    """
+    buffer = bytearray(os.path.getsize(path))
+    view = memoryview(buffer)
+    sha256 = hashlib.sha256()
+    position = 0
+    with open(path, "rb", buffering=0) as f:
+        while position < len(buffer):
+            read = f.readinto(view[position:position + chunk_size])
+            if not read:
+                raise ValueError(f"Unexpected end of file: {path}")
+            sha256.update(view[position:position + read])
+            position += read
+    view.release()
+
+    if len(buffer) < 8:
+        raise ValueError(f"Not a safetensors file: {path}")
+    header_size = struct.unpack("<Q", buffer[:8])[0]
+    if header_size > MAX_HEADER_SIZE or 8 + header_size > len(buffer):
+        raise ValueError(f"Invalid safetensors header: {path}")
+    header = json.loads(buffer[8:8 + header_size])
+    return tensors_from_buffer(header, 8 + header_size, buffer), sha256.hexdigest()
+
+
+def checkpoint_key_filter(load_clip: bool, load_vae: bool) -> Optional[Callable[[str], bool]]:
+    """
+    Create a key filter that drops text encoder and/or VAE weights of a checkpoint.
+
+    Args:
+        load_clip: Keep text encoder weights
+        load_vae: Keep VAE weights
+
+    Returns:
+        Predicate for load_safetensors_mmap, or None when every key is kept
+    """
+    skipped: Tuple[str, ...] = ()
+    if not load_clip:
+        skipped += CLIP_KEY_PREFIXES
+    if not load_vae:
+        skipped += VAE_KEY_PREFIXES
+    if not skipped:
+        return None
+    return lambda key: not key.startswith(skipped)
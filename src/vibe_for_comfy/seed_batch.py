@@ -0,0 +1,149 @@
+"""
+Sampling several seeds as one latent batch.
+
+Comparing N seeds by queueing N prompts repeats prompt encoding, model load
+checks and the sampler setup N times. Instead, the input latent is repeated
+once per seed and each copy gets exactly the noise ``common_ksampler`` would
+have generated for that seed on its own, so the whole set is sampled in a single
+``comfy.sample.sample`` call.
+
+With deterministic samplers (euler, dpmpp_2m, ...) every image matches its
+single-seed run up to batched kernel numerics. Ancestral and SDE samplers also
+draw noise during sampling from one generator for the whole batch, so their
+results differ from single-seed runs.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import torch
+import comfy.sample
+import comfy.utils
+import latent_preview
+
+from .constants import MAX_SEED_LIST_SIZE
+from .profiling import RunProfile
+
+SEED_MAX = 0xffffffffffffffff
+
+
+def parse_seed_list(seeds: str) -> List[int]:
+    """
+    Parse a comma separated list of seeds and inclusive "start-end" ranges.
+
+    Args:
+        seeds: Text such as "1, 5, 10-13"
+
+    Returns:
+        Seeds in the given order (duplicates are kept)
+
+    Raises:
+        ValueError: If an entry is not a seed or range, or the list is too long
+    """
+    result: List[int] = []
+    for part in seeds.replace("\n", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = int(start_text), int(end_text)
+                step = 1 if end >= start else -1
+                values = range(start, end + step, step)
+            else:
+                values = range(int(part), int(part) + 1)
+        except ValueError:
+            raise ValueError(f"Invalid seed entry: {part}")
+
+        if len(result) + len(values) > MAX_SEED_LIST_SIZE:
+            raise ValueError(f"Too many seeds (at most {MAX_SEED_LIST_SIZE} per run)")
+        for seed in values:
+            if not 0 <= seed <= SEED_MAX:
+                raise ValueError(f"Seed out of range: {seed}")
+            result.append(seed)
+    return result
+
+
+def format_seed_list(seeds: List[int]) -> str:
+    """Join seeds into the comma separated form read by ExtendedSaveImage."""
+    return ", ".join(str(seed) for seed in seeds)
+
+
+def seed_batch_index(latent: Dict[str, Any], seed_count: int) -> Optional[List[int]]:
+    """
+    Build the batch_index of a seed batch: every per-seed slice keeps the input latent's indices.
+
+    Args:
+        latent: Input LATENT dictionary
+        seed_count: Number of seeds sampled
+
+    Returns:
+        Batch indices for the whole output batch, or None if the input latent has none
+    """
+    batch_index = latent.get("batch_index")
+    if batch_index is None:
+        return None
+    return list(batch_index) * seed_count
+
+
+def sample_seed_batch(
+    model: Any,
+    seeds: List[int],
+    steps: int,
+    cfg: float,
+    sampler_name: str,
+    scheduler: str,
+    positive: Any,
+    negative: Any,
+    latent: Dict[str, Any],
+    denoise: float = 1.0,
+    profile: Optional[RunProfile] = None,
+) -> Dict[str, Any]:
+    """
+    Sample one copy of the latent per seed in a single batched sampler call.
+
+    Mirrors ``nodes.common_ksampler``, except that the noise is built per seed
+    and concatenated along the batch dimension.
+
+    Args:
+        model: MODEL to sample with
+        seeds: Seeds, one latent copy each
+        steps: Sampling steps
+        cfg: CFG scale
+        sampler_name: Sampler name
+        scheduler: Scheduler name
+        positive: Positive CONDITIONING
+        negative: Negative CONDITIONING
+        latent: Input LATENT dictionary
+        denoise: Denoise strength
+        profile: Optional run profile that records every sampler step
+
+    Returns:
+        LATENT dictionary whose batch is ordered seed by seed
+    """
+    latent_image = latent["samples"]
+    latent_image = comfy.sample.fix_empty_latent_channels(model, latent_image)
+    batch_inds = latent.get("batch_index")
+
+    # Same noise as a single-seed run, generated seed by seed
+    noise = torch.cat([comfy.sample.prepare_noise(latent_image, seed, batch_inds) for seed in seeds])
+    latent_batch = latent_image.repeat((len(seeds),) + (1,) * (latent_image.dim() - 1))
+
+    # A mask is tiled to the latent batch size by the sampler, matching the repeated latents
+    noise_mask = latent.get("noise_mask")
+    callback = latent_preview.prepare_callback(model, steps)
+    if profile is not None:
+        callback = profile.wrap_callback(callback)
+    disable_pbar = not comfy.utils.PROGRESS_BAR_ENABLED
+    samples = comfy.sample.sample(
+        model, noise, steps, cfg, sampler_name, scheduler, positive, negative, latent_batch,
+        denoise=denoise, noise_mask=noise_mask, callback=callback, disable_pbar=disable_pbar, seed=seeds[0],
+    )
+
+    out = latent.copy()
+    out.pop("batch_index", None)
+    out["samples"] = samples
+    batch_index = seed_batch_index(latent, len(seeds))
+    if batch_index is not None:
+        out["batch_index"] = batch_index
+    return out
@@ -0,0 +1,177 @@
+"""
+VAE decoding of latent batches under a memory budget.
+
+``VAEDecode`` decodes a whole latent batch at once and only falls back to
+tiling after running out of device memory; on CPU-only or low-memory machines
+it swaps instead. Here the decode plan is chosen up front from the VAE's own
+memory estimate (``memory_used_decode``) and a budget:
+
+- the batch is decoded a chunk of latents at a time when one latent fits
+- otherwise each latent is decoded in overlapping tiles, which ComfyUI blends
+  with feathered masks, using the largest tile size that fits
+
+Decoded chunks are written into a preallocated output tensor, so peak memory
+holds one chunk of decoder activations rather than the whole batch. Callers
+that consume images as they come (streamed saving) can iterate the chunks
+instead and never hold the whole batch.
+
+For quick iteration, ``preview_decode`` skips the VAE entirely and projects the
+latent channels to RGB with the model's ``latent_rgb_factors`` (the same linear
+map ComfyUI uses for sampler previews), at latent resolution.
+"""
+
+from typing import Any, Iterator, Optional, Tuple
+
+import torch
+import torch.nn.functional
+import comfy.model_management
+
+from .constants import VAE_DECODE_FREE_MEMORY_FRACTION, VAE_DECODE_MIN_TILE
+
+
+def _decode(vae: Any, samples: torch.Tensor) -> torch.Tensor:
+    images = vae.decode(samples)
+    # Video VAEs return (batch, frames, height, width, channels); flatten like VAEDecode does
+    if images.dim() == 5:
+        images = images.reshape(-1, images.shape[-3], images.shape[-2], images.shape[-1])
+    return images
+
+
+def _decode_tiled(vae: Any, samples: torch.Tensor, tile: int) -> torch.Tensor:
+    return vae.decode_tiled(samples, tile_x=tile, tile_y=tile, overlap=max(1, tile // 4))
+
+
+def _stream_into_output(chunks: Iterator[Tuple[int, torch.Tensor]], count: int) -> torch.Tensor:
+    output: Optional[torch.Tensor] = None
+    position = 0
+    for latent_count, images in chunks:
+        if output is None:
+            # Size the output from the first chunk (a latent may decode to several frames)
+            per_latent = images.shape[0] // latent_count
+            output = torch.empty((count * per_latent,) + tuple(images.shape[1:]), dtype=images.dtype, device=images.device)
+        output[position:position + images.shape[0]] = images
+        position += images.shape[0]
+        del images
+    return output[:position]
+
+
+def get_decode_budget(vae: Any, budget_mb: int = 0) -> int:
+    """
+    Resolve the memory budget for decoding.
+
+    Args:
+        vae: VAE object
+        budget_mb: Explicit budget in MiB, or 0 to use a fraction of the free memory of the VAE's device
+
+    Returns:
+        Budget in bytes
+    """
+    if budget_mb > 0:
+        return budget_mb * 1024 ** 2
+    return int(comfy.model_management.get_free_memory(vae.device) * VAE_DECODE_FREE_MEMORY_FRACTION)
+
+
+def pick_tile_size(vae: Any, samples: torch.Tensor, budget: int) -> int:
+    """
+    Find the largest square tile (in latent pixels) whose decode fits the budget.
+
+    Args:
+        vae: VAE object
+        samples: Latent tensor (batch, channels, height, width)
+        budget: Memory budget in bytes
+
+    Returns:
+        Tile size, never below VAE_DECODE_MIN_TILE
+    """
+    tile = max(samples.shape[-1], samples.shape[-2])
+    while tile > VAE_DECODE_MIN_TILE:
+        shape = (1, samples.shape[1], min(tile, samples.shape[-2]), min(tile, samples.shape[-1]))
+        if vae.memory_used_decode(shape, vae.vae_dtype) <= budget:
+            break
+        tile //= 2
+    return max(tile, VAE_DECODE_MIN_TILE)
+
+
+def _iter_chunks(vae: Any, samples: torch.Tensor, budget_mb: int, max_chunk_size: Optional[int]) -> Iterator[Tuple[int, torch.Tensor]]:
+    chunk_size = 1
+    decode = lambda chunk: _decode(vae, chunk)  # noqa: E731
+    if hasattr(vae, "memory_used_decode"):
+        budget = get_decode_budget(vae, budget_mb)
+        per_latent = vae.memory_used_decode((1,) + tuple(samples.shape[1:]), vae.vae_dtype)
+        if per_latent <= budget:
+            chunk_size = int(budget // max(per_latent, 1))
+        elif samples.dim() == 4:
+            # Only image latents are tiled here; video latents go one at a time
+            tile = pick_tile_size(vae, samples, budget)
+            print(f"VAEDecode: Latent does not fit the {budget // 1024 ** 2} MiB budget, decoding in {tile}px tiles")
+            decode = lambda chunk: _decode_tiled(vae, chunk, tile)  # noqa: E731
+
+    if max_chunk_size is not None:
+        chunk_size = min(chunk_size, max_chunk_size)
+    chunk_size = max(1, chunk_size)
+    for start in range(0, samples.shape[0], chunk_size):
+        chunk = samples[start:start + chunk_size]
+        yield chunk.shape[0], decode(chunk)
+
+
+def iter_decoded_chunks(
+    vae: Any,
+    samples: torch.Tensor,
+    budget_mb: int = 0,
+    max_chunk_size: Optional[int] = None,
+) -> Iterator[torch.Tensor]:
+    """
+    Decode a latent batch chunk by chunk, with chunking or tiling chosen to fit a memory budget.
+
+    Args:
+        vae: VAE object
+        samples: Latent tensor, batch first
+        budget_mb: Memory budget in MiB (0 = derived from free device memory)
+        max_chunk_size: Optional cap on the number of latents decoded per call
+
+    Yields:
+        IMAGE tensors of consecutive latent chunks, in batch order
+    """
+    for _, images in _iter_chunks(vae, samples, budget_mb, max_chunk_size):
+        yield images
+
+
+def decode_with_budget(vae: Any, samples: torch.Tensor, budget_mb: int = 0) -> torch.Tensor:
+    """
+    Decode a latent batch with chunking or tiling chosen to fit a memory budget.
+
+    Args:
+        vae: VAE object
+        samples: Latent tensor, batch first
+        budget_mb: Memory budget in MiB (0 = derived from free device memory)
+
+    Returns:
+        IMAGE tensor with the decoded images of every latent in batch order
+    """
+    return _stream_into_output(_iter_chunks(vae, samples, budget_mb, None), samples.shape[0])
+
+
+def preview_decode(model: Any, samples: torch.Tensor) -> Optional[torch.Tensor]:
+    """
+    Approximate decode by projecting latent channels to RGB.
+
+    Args:
+        model: MODEL the latents were sampled with (provides the latent format)
+        samples: Latent tensor (batch, channels, height, width)
+
+    Returns:
+        IMAGE tensor at latent resolution, or None if the latent format has no RGB factors
+    """
+    latent_format = model.get_model_object("latent_format")
+    factors = getattr(latent_format, "latent_rgb_factors", None)
+    if factors is None or samples.dim() != 4:
+        return None
+
+    weight = torch.tensor(factors, dtype=torch.float32).transpose(0, 1)
+    bias = getattr(latent_format, "latent_rgb_factors_bias", None)
+    if bias is not None:
+        bias = torch.tensor(bias, dtype=torch.float32)
+    # Sampler outputs are in VAE space; the factors apply to the model's scaled latent space
+    latents = latent_format.process_in(samples.to(device="cpu", dtype=torch.float32)).movedim(1, -1)
+    images = torch.nn.functional.linear(latents, weight, bias=bias)
+    return ((images + 1.0) / 2.0).clamp(0, 1).to(comfy.model_management.intermediate_device())
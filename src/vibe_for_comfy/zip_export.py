@@ -0,0 +1,125 @@
+"""
+Streaming zip export of output images.
+
+PNG and WebP data is already compressed, so entries are stored as-is: the
+archive costs one read of every file and no CPU spent recompressing. The zip
+is written by ``zipfile`` to an unseekable sink (sizes and CRCs go into data
+descriptors after each entry) that hands fixed-size chunks to the HTTP
+response as they fill up. Memory use is bounded by the chunk size and no
+temporary archive is created.
+
+Next to every image, its ``.txt`` metadata sidecar (written by
+ExtendedSaveImage with ``save_metadata_file``) is included when present. A
+``manifest.json`` listing every exported file closes the archive.
+"""
+
+import json
+import os
+import time
+import zipfile
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .constants import ZIP_EXPORT_CHUNK_SIZE
+
+MANIFEST_NAME = "manifest.json"
+
+
+class ChunkedSink:
+    """
+    Write-only, unseekable file object that passes data on in fixed-size chunks.
+
+    ``zipfile`` detects the missing ``tell``/``seek`` and switches to data
+    descriptors, so nothing already written is ever rewritten.
+    """
+
+    def __init__(self, write_chunk: Callable[[bytes], None], chunk_size: int = ZIP_EXPORT_CHUNK_SIZE) -> None:
+        self._write_chunk = write_chunk
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self.bytes_written = 0
+        self.failed = False
+
+    def write(self, data: Any) -> int:
+        if self.failed:
+            # The client went away; let zipfile finish without producing more output
+            return len(data)
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if not self._buffer or self.failed:
+            return
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        try:
+            self._write_chunk(chunk)
+        except Exception:
+            self.failed = True
+            raise
+        self.bytes_written += len(chunk)
+
+
+def _copy_into_archive(archive: zipfile.ZipFile, source_path: str, arcname: str, mtime_ns: int) -> int:
+    """Copy one file into a stored entry in chunks; return its size."""
+    size = os.path.getsize(source_path)
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime(mtime_ns / 1e9)[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    info.file_size = size
+    with open(source_path, "rb") as source, archive.open(info, "w", force_zip64=size >= zipfile.ZIP64_LIMIT) as entry:
+        for chunk in iter(lambda: source.read(ZIP_EXPORT_CHUNK_SIZE), b""):
+            entry.write(chunk)
+    return size
+
+
+def write_archive(
+    sink: ChunkedSink,
+    entries: Sequence[Tuple[str, str, int, int]],
+    query: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Write a stored zip of output images, their sidecars and a manifest to a sink.
+
+    Args:
+        sink: Destination of the archive bytes
+        entries: (relative path, full path, mtime_ns, size) of every image, in archive order
+        query: Selection that produced the entries, recorded in the manifest
+
+    Returns:
+        The manifest written into the archive
+    """
+    files: List[Dict[str, Any]] = []
+    skipped: List[str] = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for path, full_path, mtime_ns, _ in entries:
+            try:
+                size = _copy_into_archive(archive, full_path, path, mtime_ns)
+            except FileNotFoundError:
+                # Deleted after the selection was made
+                skipped.append(path)
+                continue
+            record: Dict[str, Any] = {"path": path, "size": size, "mtime": mtime_ns / 1e9, "sidecar": None}
+
+            sidecar_path = os.path.splitext(full_path)[0] + ".txt"
+            if os.path.isfile(sidecar_path):
+                sidecar_name = os.path.splitext(path)[0] + ".txt"
+                try:
+                    _copy_into_archive(archive, sidecar_path, sidecar_name, os.stat(sidecar_path).st_mtime_ns)
+                    record["sidecar"] = sidecar_name
+                except FileNotFoundError:
+                    # Deleted after the check; the image is still exported
+                    pass
+            files.append(record)
+
+        manifest = {
+            "created_at": time.time(),
+            "query": query or {},
+            "file_count": len(files),
+            "total_bytes": sum(record["size"] for record in files),
+            "files": files,
+            "skipped": skipped,
+        }
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    sink.flush()
+    return manifest
@@ -0,0 +1,75 @@
+"""Tests for the byte-bounded LRU cache shared by the LoRA and fused weight caches."""
+
+import pytest
+
+pytest.importorskip("folder_paths")
+
+from src.vibe_for_comfy.cache_utils import LRUByteCache  # noqa: E402
+
+
+@pytest.fixture
+def cache():
+    return LRUByteCache(max_bytes=100)
+
+
+def test_least_recently_used_entry_is_evicted_first(cache):
+    cache.put("a", "A", 40)
+    cache.put("b", "B", 40)
+    assert cache.get("a") == "A"  # b is now the least recently used
+    cache.put("c", "C", 40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.get_stats()["bytes"] == 80
+
+
+def test_eviction_frees_enough_bytes_for_a_large_entry(cache):
+    for key in "abcd":
+        cache.put(key, key.upper(), 25)
+    cache.put("big", "BIG", 90)
+
+    assert [key for key in "abcd" if cache.get(key) is not None] == []
+    assert cache.get("big") == "BIG"
+    assert cache.get_stats()["entries"] == 1
+
+
+def test_oversize_item_is_not_cached(cache):
+    cache.put("a", "A", 50)
+    cache.put("huge", "HUGE", 101)
+
+    assert cache.get("huge") is None
+    assert cache.get("a") == "A"
+    assert cache.get_stats()["bytes"] == 50
+
+
+def test_oversize_replacement_drops_the_old_value(cache):
+    cache.put("a", "old", 50)
+    cache.put("a", "new", 200)
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_replacing_a_key_updates_its_size(cache):
+    cache.put("a", "A", 60)
+    cache.put("a", "A2", 30)
+    cache.put("b", "B", 70)
+
+    assert cache.get("a") == "A2"
+    assert cache.get_stats()["bytes"] == 100
+
+
+def test_discard_and_stats(cache):
+    cache.put(("lora", "x"), 1, 10)
+    cache.put(("lora", "y"), 2, 10)
+    cache.put(("fused", "x"), 3, 10)
+    cache.discard(lambda key: key[0] == "lora")
+    assert cache.get(("lora", "x")) is None
+    assert cache.get(("fused", "x")) == 3
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 10
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
@@ -0,0 +1,101 @@
+"""CPU benchmark of the ExtendedKSampler execution profiles on a small stub model."""
+
+import time
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.vibe_for_comfy.execution_profile import (  # noqa: E402
+    EXECUTION_PROFILES,
+    cpu_supports_bf16,
+    execution_profile,
+)
+
+
+class StubUNet(torch.nn.Module):
+    """A few conv blocks standing in for a diffusion model."""
+
+    def __init__(self, channels=64):
+        super().__init__()
+        self.layers = torch.nn.Sequential(
+            torch.nn.Conv2d(4, channels, 3, padding=1),
+            torch.nn.SiLU(),
+            torch.nn.Conv2d(channels, channels, 3, padding=1),
+            torch.nn.SiLU(),
+            torch.nn.Conv2d(channels, channels, 3, padding=1),
+            torch.nn.SiLU(),
+            torch.nn.Conv2d(channels, 4, 3, padding=1),
+        )
+
+    def forward(self, x):
+        return self.layers(x)
+
+
+def run_steps(model, latent, steps):
+    x = latent
+    for _ in range(steps):
+        x = x - 0.1 * model(x)
+    return x
+
+
+@pytest.fixture
+def stub():
+    torch.manual_seed(0)
+    return StubUNet().eval(), torch.randn(2, 4, 64, 64)
+
+
+def test_profiles_match_default_output(stub):
+    model, latent = stub
+    reference = run_steps(model, latent, 2).detach()
+
+    for name, options in EXECUTION_PROFILES.items():
+        profiled_model = StubUNet().eval()
+        profiled_model.load_state_dict(model.state_dict())
+        with execution_profile(name, modules=(profiled_model,)) as active:
+            output = run_steps(profiled_model, latent, 2).float()
+        tolerance = 5e-2 if active.get("bf16_autocast") else 1e-4
+        assert torch.allclose(output, reference, atol=tolerance), name
+
+
+def test_channels_last_layout_is_restored(stub):
+    model, latent = stub
+    with execution_profile("cpu_channels_last", modules=(model,)):
+        assert model.layers[0].weight.is_contiguous(memory_format=torch.channels_last)
+        run_steps(model, latent, 1)
+    assert all(parameter.is_contiguous() for parameter in model.parameters())
+
+
+def test_threads_are_restored():
+    before = torch.get_num_threads()
+    with execution_profile("inference", threads=1):
+        assert torch.get_num_threads() == 1
+    assert torch.get_num_threads() == before
+
+
+def test_inference_mode_only_when_enabled():
+    with execution_profile("default"):
+        assert not torch.is_inference_mode_enabled()
+    with execution_profile("inference"):
+        assert torch.is_inference_mode_enabled()
+
+
+def test_cpu_benchmark(stub, capsys):
+    model, latent = stub
+    steps = 5
+    timings = {}
+    for name in EXECUTION_PROFILES:
+        profiled_model = StubUNet().eval()
+        profiled_model.load_state_dict(model.state_dict())
+        with execution_profile(name, modules=(profiled_model,)):
+            run_steps(profiled_model, latent, 1)  # warm-up
+            start = time.perf_counter()
+            run_steps(profiled_model, latent, steps)
+            timings[name] = (time.perf_counter() - start) / steps
+
+    with capsys.disabled():
+        print(f"\nExecution profile CPU benchmark (bf16 supported: {cpu_supports_bf16()})")
+        for name, seconds in timings.items():
+            print(f"  {name:<18} {seconds * 1000:8.2f} ms/step  ({timings['default'] / seconds:.2f}x)")
+
+    assert all(seconds > 0 for seconds in timings.values())
@@ -0,0 +1,101 @@
+"""Tests for the cached model file catalog: mtime-gated rescans and refresh diffs."""
+
+import os
+
+import pytest
+
+pytest.importorskip("folder_paths")
+
+from src.vibe_for_comfy import file_catalog  # noqa: E402
+from src.vibe_for_comfy.file_catalog import FileCatalog  # noqa: E402
+
+
+@pytest.fixture
+def loras(tmp_path, monkeypatch):
+    root = tmp_path / "loras"
+    (root / "styles").mkdir(parents=True)
+    for name in ("a.safetensors", "notes.txt", "styles/b.safetensors", "styles/c.SAFETENSORS"):
+        (root / name).write_bytes(b"lora")
+    monkeypatch.setattr(
+        file_catalog.folder_paths, "folder_names_and_paths", {"loras": ([str(root)], {".safetensors"})}
+    )
+    return root
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Record the directories rescanned by the catalog."""
+    scanned = []
+    scan_directory = file_catalog._scan_directory
+
+    def recording_scan(path):
+        scanned.append(os.path.basename(path))
+        return scan_directory(path)
+
+    monkeypatch.setattr(file_catalog, "_scan_directory", recording_scan)
+    return scanned
+
+
+def touch_directory(path):
+    # Filesystem timestamps can be coarse; move the mtime explicitly so the change is always visible
+    mtime_ns = os.stat(path).st_mtime_ns + 10 ** 9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_lists_matching_files_recursively(loras):
+    names = FileCatalog().get_filename_list("loras")
+    assert names == ["a.safetensors", os.path.join("styles", "b.safetensors"), os.path.join("styles", "c.SAFETENSORS")]
+
+
+def test_unchanged_directories_are_not_rescanned(loras, scans):
+    catalog = FileCatalog(refresh_interval=0)
+    first = catalog.get_filename_list("loras")
+    assert sorted(scans) == ["loras", "styles"]
+
+    scans.clear()
+    assert catalog.get_filename_list("loras") == first
+    assert scans == []
+
+
+def test_only_changed_directory_is_rescanned(loras, scans):
+    catalog = FileCatalog(refresh_interval=0)
+    catalog.get_filename_list("loras")
+    scans.clear()
+
+    (loras / "styles" / "d.safetensors").write_bytes(b"lora")
+    touch_directory(loras / "styles")
+    assert os.path.join("styles", "d.safetensors") in catalog.get_filename_list("loras")
+    assert scans == ["styles"]
+
+
+def test_lookups_within_interval_skip_the_disk(loras, scans):
+    catalog = FileCatalog(refresh_interval=3600)
+    catalog.get_filename_list("loras")
+    scans.clear()
+
+    (loras / "new.safetensors").write_bytes(b"lora")
+    touch_directory(loras)
+    assert "new.safetensors" not in catalog.get_filename_list("loras")
+    assert scans == []
+
+
+def test_refresh_reports_added_and_removed(loras):
+    catalog = FileCatalog(refresh_interval=3600)
+    catalog.get_filename_list("loras")
+
+    (loras / "new.safetensors").write_bytes(b"lora")
+    os.remove(loras / "a.safetensors")
+    touch_directory(loras)
+    assert catalog.refresh(["loras"]) == {"loras": (["new.safetensors"], ["a.safetensors"])}
+    assert catalog.refresh() == {"loras": ([], [])}
+
+
+def test_removed_subdirectory_drops_its_files(loras):
+    catalog = FileCatalog(refresh_interval=0)
+    catalog.get_filename_list("loras")
+
+    for name in os.listdir(loras / "styles"):
+        os.remove(loras / "styles" / name)
+    os.rmdir(loras / "styles")
+    touch_directory(loras)
+    assert catalog.get_filename_list("loras") == ["a.safetensors"]
@@ -0,0 +1,135 @@
+"""Tests for the output gallery index: cursor paging, path resolution and conditional file responses."""
+
+import base64
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("folder_paths")
+pytest.importorskip("PIL")
+
+from src.vibe_for_comfy import gallery  # noqa: E402
+from src.vibe_for_comfy.gallery import GalleryIndex, decode_cursor, encode_cursor  # noqa: E402
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    output = tmp_path / "output"
+    output.mkdir()
+    monkeypatch.setattr(gallery.folder_paths, "get_output_directory", lambda: str(output))
+    return output
+
+
+def save(directory, name, mtime):
+    path = directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"image")
+    os.utime(path, ns=(mtime * 10 ** 9, mtime * 10 ** 9))
+    # A new file bumps the directory mtime; make sure the index sees a different value
+    os.utime(path.parent, ns=(os.stat(path.parent).st_mtime_ns + 10 ** 9,) * 2)
+    return path
+
+
+def test_cursor_pages_stay_stable_while_images_are_saved(output_dir):
+    for i in range(5):
+        save(output_dir, f"image_{i}.png", 1000 + i)
+    index = GalleryIndex(refresh_interval=0)
+
+    first = index.get_page(limit=2)
+    assert [item["filename"] for item in first["items"]] == ["image_4.png", "image_3.png"]
+
+    save(output_dir, "image_new.png", 2000)
+    save(output_dir, "dated/image_sub.png", 3000)
+    second = index.get_page(first["next_cursor"], limit=2)
+    assert [item["filename"] for item in second["items"]] == ["image_2.png", "image_1.png"]
+    assert second["total"] == 7
+
+    third = index.get_page(second["next_cursor"], limit=2)
+    assert [item["filename"] for item in third["items"]] == ["image_0.png"]
+    assert third["next_cursor"] is None
+
+    assert [item["path"] for item in index.get_page(limit=2)["items"]] == ["dated/image_sub.png", "image_new.png"]
+
+
+def test_subfolder_filter(output_dir):
+    save(output_dir, "top.png", 1000)
+    save(output_dir, "dated/inside.png", 1001)
+    page = GalleryIndex(refresh_interval=0).get_page(subfolder="dated")
+    assert [item["path"] for item in page["items"]] == ["dated/inside.png"]
+    assert page["items"][0]["subfolder"] == "dated"
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(123, "dated/a.png")) == (123, "dated/a.png")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    base64.urlsafe_b64encode(b"not json").decode("ascii"),
+    base64.urlsafe_b64encode(json.dumps(["a.png", 1]).encode()).decode("ascii"),
+    base64.urlsafe_b64encode(json.dumps({"mtime": 1}).encode()).decode("ascii"),
+    base64.urlsafe_b64encode(json.dumps([1, 2, 3]).encode()).decode("ascii"),
+])
+def test_decode_cursor_rejects_bad_input(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_get_page_rejects_bad_cursor(output_dir):
+    with pytest.raises(ValueError):
+        GalleryIndex().get_page("garbage!")
+
+
+def test_get_serves_only_indexed_images(output_dir, tmp_path):
+    path = save(output_dir, "dated/a.png", 1000)
+    (output_dir / "notes.txt").write_text("not an image")
+    (tmp_path / "secret.png").write_bytes(b"outside")
+    index = GalleryIndex()
+
+    assert index.get("dated/a.png") == (str(path), 1000 * 10 ** 9, 5)
+    for bad_path in ("missing.png", "notes.txt", "../secret.png", "dated/../../secret.png",
+                     str(tmp_path / "secret.png"), "", "dated"):
+        assert index.get(bad_path) is None, bad_path
+
+
+def test_get_picks_up_a_new_image(output_dir):
+    index = GalleryIndex(refresh_interval=3600, miss_refresh_interval=0)
+    index.get_page()
+    save(output_dir, "fresh.png", 1000)
+    assert index.get("fresh.png") is not None
+
+
+def test_forced_refresh_on_miss_is_rate_limited(output_dir, monkeypatch):
+    index = GalleryIndex(refresh_interval=3600, miss_refresh_interval=3600)
+    index.get_page()
+    forced = []
+    original_refresh = index._refresh
+
+    def counting_refresh(force=False):
+        forced.append(force)
+        original_refresh(force)
+
+    monkeypatch.setattr(index, "_refresh", counting_refresh)
+    for _ in range(10):
+        assert index.get("missing.png") is None
+    assert forced.count(True) == 1
+
+
+def test_file_response_revalidates_with_etag(tmp_path):
+    pytest.importorskip("aiohttp")
+    from src.vibe_for_comfy.routes import file_response
+
+    path = tmp_path / "image.png"
+    path.write_bytes(b"image")
+    first = file_response(SimpleNamespace(headers={}), str(path))
+    assert first.status == 200
+    etag = first.headers["ETag"]
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        assert file_response(SimpleNamespace(headers={"If-None-Match": header}), str(path)).status == 304
+
+    assert file_response(SimpleNamespace(headers={"If-None-Match": '"stale"'}), str(path)).status == 200
+    os.utime(path, ns=(1, 1))
+    assert file_response(SimpleNamespace(headers={"If-None-Match": etag}), str(path)).status == 200
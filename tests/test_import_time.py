@@ -0,0 +1,145 @@
+"""Import-time regression checks: loading the package must stay cheap and free of heavy imports."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Generous for slow CI machines; an eager torch/comfy import alone takes several times longer
+IMPORT_TIME_BUDGET_SECONDS = 0.5
+
+HEAVY_MODULES = ("torch", "numpy", "PIL", "piexif", "comfy", "folder_paths", "aiohttp")
+
+# No server module: the package is imported outside ComfyUI
+NO_SERVER = """
+sys.modules["server"] = None
+"""
+
+# Minimal stand-in for ComfyUI's server module, so route registration runs as on startup.
+# aiohttp is imported up front because the real server has already loaded it at that point.
+STUB_SERVER = """
+import types
+import aiohttp.web
+
+class Routes:
+    def __init__(self):
+        self.registered = []
+
+    def route(self, method, path):
+        def decorator(handler):
+            self.registered.append((method, path))
+            return handler
+        return decorator
+
+    def get(self, path):
+        return self.route("GET", path)
+
+    def post(self, path):
+        return self.route("POST", path)
+
+server = types.ModuleType("server")
+server.PromptServer = types.SimpleNamespace(instance=types.SimpleNamespace(routes=Routes()))
+sys.modules["server"] = server
+"""
+
+# Imports the top-level package (as ComfyUI's loader would, by file location) after the server setup
+IMPORT_SCRIPT = f"""
+import importlib.util, json, sys, time
+{{server_setup}}
+spec = importlib.util.spec_from_file_location(
+    "vibe_for_comfy_startup", {os.path.join(ROOT, "__init__.py")!r}, submodule_search_locations=[{ROOT!r}]
+)
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+start = time.perf_counter()
+spec.loader.exec_module(module)
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "nodes": sorted(module.NODE_CLASS_MAPPINGS),
+    "loaded": sorted(name for name in {HEAVY_MODULES!r} if name in sys.modules),
+    "node_modules": sorted(name for name in sys.modules if name.startswith(spec.name + ".src.vibe_for_comfy.")),
+    "routes": len(sys.modules["server"].PromptServer.instance.routes.registered) if sys.modules["server"] else 0,
+}}))
+"""
+
+
+def run_startup(server_setup):
+    # -X importtime prints the per-module breakdown to stderr, shown when an assertion fails
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT.replace("{server_setup}", server_setup)],
+        capture_output=True, text=True, cwd=ROOT, check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["importtime"] = result.stderr
+    return report
+
+
+@pytest.fixture(scope="module")
+def startup():
+    return run_startup(NO_SERVER)
+
+
+@pytest.fixture(scope="module")
+def server_startup():
+    pytest.importorskip("aiohttp")
+    return run_startup(STUB_SERVER)
+
+
+def test_heavy_dependencies_are_not_imported(startup):
+    assert startup["loaded"] == [], startup["importtime"]
+
+
+def test_only_lightweight_modules_are_imported(startup):
+    modules = {name.rsplit(".", 1)[1] for name in startup["node_modules"]}
+    assert modules <= {"constants", "lazy"}, sorted(modules)
+
+
+def test_routes_register_without_heavy_imports(server_startup):
+    from src.vibe_for_comfy.constants import API_ENDPOINTS
+
+    # aiohttp is loaded by the server before any custom node
+    assert [name for name in server_startup["loaded"] if name != "aiohttp"] == [], server_startup["importtime"]
+    modules = {name.rsplit(".", 1)[1] for name in server_startup["node_modules"]}
+    assert modules <= {"constants", "lazy", "routes", "launcher", "metrics"}, sorted(modules)
+    assert server_startup["routes"] >= len(API_ENDPOINTS)
+
+
+def test_server_import_time_budget(server_startup):
+    assert server_startup["seconds"] < IMPORT_TIME_BUDGET_SECONDS, server_startup["importtime"]
+
+
+def test_import_time_budget(startup):
+    assert startup["seconds"] < IMPORT_TIME_BUDGET_SECONDS, startup["importtime"]
+
+
+def test_all_nodes_are_registered(startup):
+    assert len(startup["nodes"]) == 12
+
+
+def test_stub_resolves_on_first_use():
+    from src.vibe_for_comfy.lazy import lazy_node
+    from src.vibe_for_comfy.nodes import StringListJoiner
+
+    stub = lazy_node("nodes", "StringListJoiner")
+    stub.RELATIVE_PYTHON_MODULE = "custom_nodes.vibe_for_comfy"
+    assert stub._node_class is None
+
+    assert stub.RETURN_TYPES == StringListJoiner.RETURN_TYPES
+    assert stub.INPUT_TYPES() == StringListJoiner.INPUT_TYPES()
+    assert isinstance(stub(), StringListJoiner)
+    assert StringListJoiner.RELATIVE_PYTHON_MODULE == "custom_nodes.vibe_for_comfy"
+    del StringListJoiner.RELATIVE_PYTHON_MODULE
+
+
+def test_parameter_generator_lists_models_when_read():
+    pytest.importorskip("folder_paths")
+    from src.vibe_for_comfy.extended_save_image import SDParameterGenerator
+    from src.vibe_for_comfy.file_catalog import FILE_CATALOG
+
+    assert SDParameterGenerator.RETURN_TYPES[0] == FILE_CATALOG.get_filename_list("checkpoints")
+    assert len(SDParameterGenerator.RETURN_TYPES) == len(SDParameterGenerator.RETURN_NAMES)
@@ -0,0 +1,151 @@
+"""Tests for the Prometheus metrics registry, scraped over HTTP by a minimal stand-in scraper."""
+
+import http.server
+import threading
+import urllib.request
+
+import pytest
+
+from src.vibe_for_comfy.metrics import CONTENT_TYPE, MetricsRegistry
+
+
+def parse_exposition(text):
+    """Parse Prometheus text into ({sample line key: value}, {family: type}) like a scraper would."""
+    samples = {}
+    types = {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, type_name = line.split(" ")
+            types[name] = type_name
+        elif line and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            samples[key] = float(value)
+    return samples, types
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def scrape(registry):
+    """Serve the registry over HTTP and return a function that scrapes it."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def fetch():
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            return parse_exposition(response.read().decode("utf-8"))
+
+    yield fetch
+    server.shutdown()
+    server.server_close()
+
+
+def test_counter_with_labels(registry, scrape):
+    saved = registry.counter("vibe_saved_files_total", "Files", ("format",))
+    saved.inc(format="png")
+    saved.inc(2, format="png")
+    saved.inc(format="webp")
+
+    samples, types = scrape()
+    assert types["vibe_saved_files_total"] == "counter"
+    assert samples['vibe_saved_files_total{format="png"}'] == 3
+    assert samples['vibe_saved_files_total{format="webp"}'] == 1
+
+
+def test_counter_rejects_decrease_and_wrong_labels(registry):
+    counter = registry.counter("vibe_test_total", "Test", ("result",))
+    with pytest.raises(ValueError):
+        counter.inc(-1, result="hit")
+    with pytest.raises(ValueError):
+        counter.inc(kind="hit")
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_histogram_buckets_are_cumulative(registry, scrape):
+    latency = registry.histogram("vibe_hash_seconds", "Hash time", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    samples, types = scrape()
+    assert types["vibe_hash_seconds"] == "histogram"
+    assert samples['vibe_hash_seconds_bucket{le="0.1"}'] == 2
+    assert samples['vibe_hash_seconds_bucket{le="1"}'] == 3
+    assert samples['vibe_hash_seconds_bucket{le="+Inf"}'] == 4
+    assert samples["vibe_hash_seconds_count"] == 4
+    assert samples["vibe_hash_seconds_sum"] == pytest.approx(3.65)
+
+
+def test_histogram_timer(registry):
+    latency = registry.histogram("vibe_load_seconds", "Load time", ("load_mode",))
+    with latency.time(load_mode="mmap"):
+        pass
+    with pytest.raises(RuntimeError):
+        with latency.time(load_mode="mmap"):
+            raise RuntimeError("failed load")
+    assert latency.count(load_mode="mmap") == 2
+    assert latency.count(load_mode="standard") == 0
+
+
+def test_duplicate_names_are_rejected(registry):
+    registry.counter("vibe_dup_total", "First")
+    with pytest.raises(ValueError):
+        registry.histogram("vibe_dup_total", "Second")
+
+
+def test_collectors_run_at_scrape_time(registry, scrape):
+    stats = {"hits": 1}
+    registry.register_collector(lambda: [
+        ("vibe_cache_hits_total", "counter", "Hits", [({"cache": "lora"}, stats["hits"])]),
+    ])
+
+    samples, _ = scrape()
+    assert samples['vibe_cache_hits_total{cache="lora"}'] == 1
+    stats["hits"] = 5
+    samples, _ = scrape()
+    assert samples['vibe_cache_hits_total{cache="lora"}'] == 5
+
+
+def test_failing_collector_does_not_break_scrape(registry, scrape, capsys):
+    registry.counter("vibe_ok_total", "Still served").inc()
+
+    def broken():
+        raise RuntimeError("cache unavailable")
+
+    registry.register_collector(broken)
+    samples, _ = scrape()
+    assert samples["vibe_ok_total"] == 1
+    assert "Collector failed" in capsys.readouterr().out
+
+
+def test_label_values_are_escaped(registry):
+    registry.counter("vibe_reads_total", "Reads", ("status",)).inc(status='bad "name"\n')
+    assert 'vibe_reads_total{status="bad \\"name\\"\\n"} 1' in registry.render()
+
+
+def test_concurrent_updates_are_not_lost(registry):
+    counter = registry.counter("vibe_concurrent_total", "Concurrent")
+    threads = [threading.Thread(target=lambda: [counter.inc() for _ in range(1000)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value() == 8000
@@ -0,0 +1,72 @@
+"""Tests for parameter sweep expansion: job order, load counts and the job limit."""
+
+import pytest
+
+pytest.importorskip("folder_paths")
+
+from src.vibe_for_comfy.constants import GRID_MAX_JOBS  # noqa: E402
+from src.vibe_for_comfy.parameter_grid import plan_sweep  # noqa: E402
+
+PROMPT = {
+    "1": {"class_type": "ExtendedLoadCheckpoint", "inputs": {"ckpt_name": "a.safetensors"}},
+    "2": {"class_type": "ExtendedLoadLoRA", "inputs": {"lora_name": "x.safetensors", "strength_model": 1.0}},
+    "3": {"class_type": "ExtendedKSampler", "inputs": {"cfg": 7.0, "steps": 20}},
+}
+
+# Given with the cheapest axis first, i.e. the worst nested-loop order
+AXES = [
+    {"node_id": "3", "input": "cfg", "values": [5.0, 7.0, 9.0]},
+    {"node_id": "2", "input": "lora_name", "values": ["x.safetensors", "y.safetensors"]},
+    {"node_id": "1", "input": "ckpt_name", "values": ["a.safetensors", "b.safetensors"]},
+]
+
+
+def test_checkpoints_vary_slowest_then_loras():
+    plan = plan_sweep(PROMPT, AXES)
+    assert len(plan["prompts"]) == 12
+    order = [(job["1.ckpt_name"], job["2.lora_name"], job["3.cfg"]) for job in plan["jobs"]]
+    assert order == sorted(order, key=lambda job: (job[0], job[1]))
+    assert [job[2] for job in order[:3]] == [5.0, 7.0, 9.0]
+
+
+def test_prompts_match_jobs_and_leave_template_untouched():
+    plan = plan_sweep(PROMPT, AXES)
+    for job_prompt, job in zip(plan["prompts"], plan["jobs"]):
+        assert job_prompt["1"]["inputs"]["ckpt_name"] == job["1.ckpt_name"]
+        assert job_prompt["2"]["inputs"]["lora_name"] == job["2.lora_name"]
+        assert job_prompt["3"]["inputs"]["cfg"] == job["3.cfg"]
+        assert job_prompt["3"]["inputs"]["steps"] == 20
+    assert PROMPT["1"]["inputs"]["ckpt_name"] == "a.safetensors"
+
+
+def test_load_counts():
+    loads = plan_sweep(PROMPT, AXES)["loads"]
+    # Naive: cfg slowest, so every job switches checkpoint and LoRA
+    assert loads["naive"] == {"checkpoint": 12, "lora": 12}
+    assert loads["scheduled"] == {"checkpoint": 2, "lora": 4}
+    assert loads["avoided"] == 18
+
+
+def test_sweep_without_lora_axes_counts_no_lora_loads():
+    loads = plan_sweep(PROMPT, [AXES[0], AXES[2]])["loads"]
+    assert loads["scheduled"] == {"checkpoint": 2, "lora": 0}
+
+
+def test_too_many_jobs_are_rejected():
+    axes = [
+        {"node_id": "3", "input": "cfg", "values": list(range(GRID_MAX_JOBS))},
+        {"node_id": "3", "input": "steps", "values": [10, 20]},
+    ]
+    with pytest.raises(ValueError, match="at most"):
+        plan_sweep(PROMPT, axes)
+
+
+@pytest.mark.parametrize("axes", [
+    [],
+    [{"node_id": "9", "input": "cfg", "values": [1]}],
+    [{"node_id": "3", "input": "cfg", "values": []}],
+    [{"node_id": "3", "values": [1]}],
+])
+def test_invalid_axes_are_rejected(axes):
+    with pytest.raises(ValueError):
+        plan_sweep(PROMPT, axes)
@@ -0,0 +1,102 @@
+"""Tests for the result cache recipe: only models whose every patch is recorded may be keyed."""
+
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("comfy")
+
+from src.vibe_for_comfy.fused_lora_cache import count_patches, fused_cache_key, record_lora, tag_checkpoint
+from src.vibe_for_comfy.result_cache import build_recipe
+
+
+class FakePatcher:
+    """Stand-in for ModelPatcher with just the attributes the recipe reads."""
+
+    def __init__(self):
+        self.patches = {}
+        self.object_patches = {}
+        self.model_options = {"transformer_options": {}}
+
+    def clone(self):
+        clone = FakePatcher()
+        clone.patches = {key: list(value) for key, value in self.patches.items()}
+        clone.object_patches = dict(self.object_patches)
+        clone.model_options = {key: value for key, value in self.model_options.items()}
+        return clone
+
+    def add_patches(self, patches, strength=1.0):
+        for key, patch in patches.items():
+            self.patches.setdefault(key, []).append((strength, patch))
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = {}
+    for name in ("base.safetensors", "style.safetensors"):
+        paths[name] = tmp_path / name
+        paths[name].write_bytes(name.encode("utf-8"))
+    return paths
+
+
+@pytest.fixture
+def models(files):
+    base = FakePatcher()
+    tag_checkpoint(base, "base.safetensors", str(files["base.safetensors"]))
+    clip = SimpleNamespace(patcher=FakePatcher(), layer_idx=None)
+    tag_checkpoint(clip.patcher, "base.safetensors", str(files["base.safetensors"]))
+    return base, clip
+
+
+def add_recorded_lora(model, files):
+    patched = model.clone()
+    base_patch_count = count_patches(patched)
+    patched.add_patches({"a.weight": "lora_a", "b.weight": "lora_b"}, 0.8)
+    record_lora(patched, "style.safetensors", str(files["style.safetensors"]), 0.8, base_patch_count)
+    return patched
+
+
+def recipe(model, clip, execution_mode="default"):
+    latent = {"samples": torch.zeros(1, 4, 8, 8)}
+    return build_recipe(model, clip, "a cat", "", [1], 20, 7.0, "euler", "normal", 1.0, latent, execution_mode)
+
+
+def test_recorded_loras_are_keyed(models, files):
+    base, clip = models
+    assert recipe(base, clip)["model"]["loras"] == []
+    assert recipe(add_recorded_lora(base, files), clip)["model"]["loras"][0][1] == 0.8
+
+
+def test_extra_patches_after_recorded_lora_miss(models, files):
+    base, clip = models
+    patched = add_recorded_lora(base, files)
+    patched.add_patches({"a.weight": "core_lora"}, 1.0)
+    assert recipe(patched, clip) is None
+
+
+def test_foreign_patches_before_recorded_lora_miss(models, files):
+    base, clip = models
+    foreign = base.clone()
+    foreign.add_patches({"c.weight": "core_lora"}, 1.0)
+    assert recipe(add_recorded_lora(foreign, files), clip) is None
+
+
+def test_object_patched_model_misses(models):
+    base, clip = models
+    shifted = base.clone()
+    shifted.object_patches["model_sampling"] = object()
+    assert recipe(shifted, clip) is None
+
+
+def test_execution_mode_is_part_of_recipe(models):
+    base, clip = models
+    assert recipe(base, clip, "cpu_bf16") != recipe(base, clip, "default")
+
+
+def test_fused_cache_key_refuses_foreign_patches(models, files):
+    base, _ = models
+    patched = add_recorded_lora(base, files)
+    assert fused_cache_key(patched) is not None
+    patched.add_patches({"c.weight": "core_lora"}, 1.0)
+    assert fused_cache_key(patched) is None
@@ -0,0 +1,61 @@
+"""Tests for seed batches: seed list parsing and the batch layout of the sampled latent."""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("comfy")
+
+from src.vibe_for_comfy.constants import MAX_SEED_LIST_SIZE  # noqa: E402
+from src.vibe_for_comfy.seed_batch import (  # noqa: E402
+    SEED_MAX,
+    format_seed_list,
+    parse_seed_list,
+    seed_batch_index,
+)
+
+
+@pytest.mark.parametrize("text, seeds", [
+    ("42", [42]),
+    ("1, 5, 10-13", [1, 5, 10, 11, 12, 13]),
+    ("1,2\n3\n\n4", [1, 2, 3, 4]),
+    (" 7 ,, 8 , ", [7, 8]),
+    ("13-10", [13, 12, 11, 10]),
+    ("5-5", [5]),
+    ("3, 3, 1-2", [3, 3, 1, 2]),
+    (f"{SEED_MAX}", [SEED_MAX]),
+    ("", []),
+])
+def test_parse_seed_list(text, seeds):
+    assert parse_seed_list(text) == seeds
+
+
+@pytest.mark.parametrize("text", [
+    "abc",
+    "1.5",
+    "-3",
+    "4-",
+    "1-2-3",
+    "1; 2",
+    "0x10",
+    f"{SEED_MAX + 1}",
+    f"{SEED_MAX - 1}-{SEED_MAX + 1}",
+    f"0-{MAX_SEED_LIST_SIZE}",
+    ", ".join(["1"] * (MAX_SEED_LIST_SIZE + 1)),
+])
+def test_parse_seed_list_rejects_invalid_entries(text):
+    with pytest.raises(ValueError):
+        parse_seed_list(text)
+
+
+def test_seed_list_round_trip():
+    seeds = [0, 17, SEED_MAX]
+    assert parse_seed_list(format_seed_list(seeds)) == seeds
+
+
+def test_batch_index_repeats_per_seed():
+    latent = {"samples": torch.zeros(2, 4, 8, 8), "batch_index": [3, 4]}
+    assert seed_batch_index(latent, 3) == [3, 4, 3, 4, 3, 4]
+
+
+def test_no_batch_index_stays_absent():
+    assert seed_batch_index({"samples": torch.zeros(2, 4, 8, 8)}, 3) is None
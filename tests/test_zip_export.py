@@ -0,0 +1,93 @@
+"""Tests for the streaming zip export: archives written through ChunkedSink must open as regular zips."""
+
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+from src.vibe_for_comfy import zip_export
+from src.vibe_for_comfy.zip_export import MANIFEST_NAME, ChunkedSink, write_archive
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    """Two images (one with a metadata sidecar) and the entries GalleryIndex.select would return."""
+    files = {
+        "a.png": b"\x89PNG first image" * 100,
+        "dated/b.webp": b"RIFF second image" * 100,
+    }
+    entries = []
+    for path, data in files.items():
+        full_path = tmp_path / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(data)
+        entries.append((path, str(full_path), os.stat(full_path).st_mtime_ns, len(data)))
+    (tmp_path / "a.txt").write_text("Steps: 20, Seed: 1")
+    return files, entries
+
+
+def export(entries, chunk_size=64):
+    chunks = []
+    sink = ChunkedSink(chunks.append, chunk_size=chunk_size)
+    manifest = write_archive(sink, entries, {"subfolder": ""})
+    assert all(len(chunk) >= chunk_size for chunk in chunks[:-1])
+    assert sink.bytes_written == sum(len(chunk) for chunk in chunks)
+    return zipfile.ZipFile(io.BytesIO(b"".join(chunks))), manifest
+
+
+def test_archive_holds_stored_images_sidecars_and_manifest(outputs):
+    files, entries = outputs
+    archive, manifest = export(entries)
+
+    assert archive.testzip() is None
+    assert archive.namelist() == ["a.png", "a.txt", "dated/b.webp", MANIFEST_NAME]
+    for path, data in files.items():
+        assert archive.getinfo(path).compress_type == zipfile.ZIP_STORED
+        assert archive.read(path) == data
+    assert archive.read("a.txt") == b"Steps: 20, Seed: 1"
+
+    stored_manifest = json.loads(archive.read(MANIFEST_NAME))
+    assert stored_manifest == json.loads(json.dumps(manifest))
+    assert stored_manifest["file_count"] == 2
+    assert stored_manifest["total_bytes"] == sum(len(data) for data in files.values())
+    assert [(f["path"], f["sidecar"]) for f in stored_manifest["files"]] == [("a.png", "a.txt"), ("dated/b.webp", None)]
+    assert stored_manifest["skipped"] == []
+
+
+def test_deleted_image_is_skipped(outputs, tmp_path):
+    _, entries = outputs
+    os.remove(tmp_path / "a.png")
+    archive, manifest = export(entries)
+
+    assert archive.namelist() == ["dated/b.webp", MANIFEST_NAME]
+    assert manifest["skipped"] == ["a.png"]
+    assert manifest["file_count"] == 1
+
+
+def test_sidecar_deleted_during_export_is_left_out(outputs, tmp_path, monkeypatch):
+    _, entries = outputs
+    os.remove(tmp_path / "a.txt")
+    # The sidecar still existed when it was checked
+    monkeypatch.setattr(zip_export.os.path, "isfile", lambda path: True)
+    archive, manifest = export(entries)
+
+    assert archive.namelist() == ["a.png", "dated/b.webp", MANIFEST_NAME]
+    assert [f["sidecar"] for f in manifest["files"]] == [None, None]
+
+
+def test_failed_write_stops_output(outputs):
+    _, entries = outputs
+    written = []
+
+    def write_chunk(chunk):
+        if written:
+            raise ConnectionResetError("client went away")
+        written.append(chunk)
+
+    sink = ChunkedSink(write_chunk, chunk_size=64)
+    with pytest.raises(ConnectionResetError):
+        write_archive(sink, entries)
+    assert sink.failed
+    assert len(written) == 1